@@ -0,0 +1,18 @@
+"""
+Gripped Python SDK and performance tooling
+Run from int_tests/ so the package is importable, e.g.
+    python -m gripped_sdk.latency --emulator --workload search
+
+Command-line tools (emulator, latency, ...) are imported from their own
+modules so `python -m` can run them without double imports.
+"""
+
+from .client import GrippedClient, status_class, token_claims
+from .hdr import Histogram
+
+__all__ = [
+    'GrippedClient',
+    'Histogram',
+    'status_class',
+    'token_claims',
+]
@@ -0,0 +1,120 @@
+"""
+asyncio client for the Gripped REST API
+AsyncGrippedClient gives async code the same endpoint methods as
+GrippedClient (await client.get_trainer_profile(trainer_id), ...). Each
+request runs on the wrapped GrippedClient in a bounded thread pool, so
+hooks, codecs and the pooled requests.Session behave exactly as in sync
+code, and no async HTTP library is needed.
+
+With an AsyncSingleFlight, identical concurrent GETs are coalesced on
+the event loop before a thread is used, so a hundred tasks waiting on
+one trainer profile occupy one worker thread.
+
+Usage:
+    async with AsyncGrippedClient(token, single_flight=AsyncSingleFlight()) as client:
+        profile, rating = await asyncio.gather(client.get_trainer_profile(trainer_id),
+                                               client.get_trainer_rating(trainer_id))
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import GrippedClient
+from .config import API_BASE
+from .prefetch import widen_connection_pool
+
+DEFAULT_WORKERS = 16
+
+
+class _RequestCapture:
+    """Stands in for a GrippedClient to record the request() call an endpoint method makes"""
+
+    call = None
+
+    def request(self, *args, **kwargs):
+        self.call = (args, kwargs)
+
+
+class AsyncGrippedClient:
+    """Async facade over a GrippedClient; endpoint methods return coroutines"""
+
+    def __init__(self, id_token=None, base_url=API_BASE, max_workers=DEFAULT_WORKERS, single_flight=None,
+                 client=None, **client_kwargs):
+        self.client = client or GrippedClient(id_token, base_url, **client_kwargs)
+        self.single_flight = single_flight
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gripped-async')
+        widen_connection_pool(self.client.session, max_workers, self.client.base_url.split('//')[0] + '//')
+
+    @property
+    def user_id(self):
+        return self.client.user_id
+
+    def add_hook(self, hook):
+        return self.client.add_hook(hook)
+
+    def remove_hook(self, hook):
+        self.client.remove_hook(hook)
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, method, endpoint, path_params=None, params=None, json_body=None,
+                      data=None, headers=None, url=None):
+        """GrippedClient.request() on a worker thread, coalesced by the single-flight group if any"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.client.request, method, endpoint, path_params, params, json_body,
+                                 data, headers, url)
+        coalesce = (self.single_flight is not None and method == 'GET' and url is None and headers is None
+                    and json_body is None and data is None)
+        if not coalesce:
+            return await loop.run_in_executor(self.executor, call)
+
+        path = endpoint.format(**path_params) if path_params else endpoint
+        key = self.single_flight.key(self.client.user_id, endpoint, path, params)
+        sent = []
+
+        def send():
+            sent.append(True)
+            return loop.run_in_executor(self.executor, call)
+
+        started = time.perf_counter()
+        event = self.client._event(method, endpoint, path, path_params, params)
+        try:
+            response, shared = await self.single_flight.do(key, send)
+        except requests.RequestException as e:
+            # The leader's request already fired its event; a follower reports the shared failure itself
+            if not sent:
+                event.update(elapsed=time.perf_counter() - started, error=str(e), coalesced=True)
+                self.client._fire(event)
+            raise
+        if shared:
+            event.update(elapsed=time.perf_counter() - started, status=response.status_code,
+                         response=response, coalesced=True)
+            self.client._fire(event)
+        return response
+
+    def __getattr__(self, name):
+        method = getattr(GrippedClient, name, None)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        @functools.wraps(method)
+        async def endpoint(*args, **kwargs):
+            # Endpoint methods only build a request() call; replay it through the async request()
+            capture = _RequestCapture()
+            method(capture, *args, **kwargs)
+            call_args, call_kwargs = capture.call
+            return await self.request(*call_args, **call_kwargs)
+
+        return endpoint
@@ -0,0 +1,35 @@
+"""
+Cognito authentication helpers for live (non-emulator) runs
+Uses the same ADMIN_NO_SRP_AUTH flow as the e2e scripts.
+"""
+
+from .client import token_claims
+from .config import CLIENT_ID, REGION, USER_POOL_ID
+
+
+def authenticate(email, password, client_id=CLIENT_ID, user_pool_id=USER_POOL_ID, cognito_client=None):
+    """Authenticate a user with Cognito and return (id_token, user_sub)"""
+    if cognito_client is None:
+        import boto3
+        cognito_client = boto3.client('cognito-idp', region_name=REGION)
+
+    response = cognito_client.admin_initiate_auth(
+        UserPoolId=user_pool_id,
+        ClientId=client_id,
+        AuthFlow='ADMIN_NO_SRP_AUTH',
+        AuthParameters={
+            'USERNAME': email,
+            'PASSWORD': password
+        }
+    )
+    id_token = response['AuthenticationResult']['IdToken']
+    return id_token, token_claims(id_token).get('sub')
+
+
+def authenticate_users(emails, password, **kwargs):
+    """Authenticate several users and return their ID tokens in order"""
+    tokens = []
+    for email in emails:
+        id_token, _ = authenticate(email, password, **kwargs)
+        tokens.append(id_token)
+    return tokens
@@ -0,0 +1,252 @@
+"""
+Adaptive closed-loop capacity search
+Ramps the number of concurrent virtual users running a flow back-to-back
+(for example enroll followed by unenroll, or /classes/search at a chosen
+radius) and adapts the ramp step from the observed p99 and error rate.
+The search stops at the knee: the first step that breaks the latency SLO or
+error budget, or that no longer adds throughput. The report gives the
+maximum sustainable throughput and the latency curve up to that point.
+
+Usage:
+    python -m gripped_sdk.capacity --emulator --flow enroll-cycle --slo-p99 250
+    python -m gripped_sdk.capacity --emulator --flow search --radius 10 --step-duration 5
+    python -m gripped_sdk.capacity --flow enroll-cycle --token $TOKEN_1 --token $TOKEN_2 ... --session-ids S1,S2,S3
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from .client import GrippedClient
+from .latency import LOCAL, LatencyRecorder, run_operation, worst_status
+from .workloads import STATEFUL_WORKLOADS, WORKLOADS
+
+
+def run_closed_loop(client_factory, operation, concurrency, duration, context=None, label=None):
+    """Run `concurrency` virtual users back-to-back for `duration` seconds
+
+    Returns a step result dict with throughput, latency percentiles (ms) and
+    the error rate (share of operations that did not end in a 2xx).
+    Operations that sent no request put no load on the service, so they are
+    only counted in 'localOperations'.
+    """
+    context = context if context is not None else {}
+    recorder = LatencyRecorder()
+    outcomes = {'ok': 0, 'failed': 0, 'local': 0}
+    outcome_lock = threading.Lock()
+    reported = set()
+    deadline = time.perf_counter() + duration
+
+    def user(index):
+        client = client_factory(index)
+        events = []
+        client.add_hook(events.append)
+        try:
+            while time.perf_counter() < deadline:
+                events.clear()
+                sent = time.perf_counter()
+                error = run_operation(operation, client, context, reported)
+                finished = time.perf_counter()
+                status = worst_status(events, error is not None)
+                recorder.record(label or 'flow', status, sent, sent, finished)
+                with outcome_lock:
+                    if status == LOCAL:
+                        outcomes['local'] += 1
+                    else:
+                        outcomes['ok' if status and 200 <= status < 300 else 'failed'] += 1
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = None
+    for (_, klass), histogram in recorder.service.items():
+        if klass == LOCAL:
+            continue
+        merged = histogram.copy() if merged is None else merged.merge(histogram)
+    total = outcomes['ok'] + outcomes['failed']
+    return {
+        'concurrency': concurrency,
+        'operations': total,
+        'throughput': round(outcomes['ok'] / elapsed, 2) if elapsed else 0.0,
+        'errorRate': round(outcomes['failed'] / total, 4) if total else 1.0,
+        'localOperations': outcomes['local'],
+        'p50': merged.value_at_percentile(50) / 1000.0 if merged else None,
+        'p90': merged.value_at_percentile(90) / 1000.0 if merged else None,
+        'p99': merged.value_at_percentile(99) / 1000.0 if merged else None,
+        'max': merged.max_value / 1000.0 if merged else None,
+    }
+
+
+def find_knee(run_step, slo_p99_ms, max_error_rate=0.01, start=1, max_concurrency=512,
+              min_gain=0.05, refine_steps=3, log=print):
+    """Adaptively ramp concurrency with run_step(concurrency) until the knee
+
+    The step grows with the remaining headroom, the smaller of the latency
+    headroom (p99 against the SLO) and the error headroom (error rate
+    against the budget): with more than half left concurrency doubles,
+    closer to either limit it grows by a half and then a quarter. Once a step fails (SLO or error budget) the gap to
+    the last good step is bisected `refine_steps` times. A step that adds
+    less than `min_gain` throughput over the best so far also ends the ramp,
+    since more users would only queue.
+    """
+    curve = []
+    best = None
+    failed_at = None
+    concurrency = start
+
+    def passes(result):
+        return result['p99'] is not None and result['p99'] <= slo_p99_ms and result['errorRate'] <= max_error_rate
+
+    def run(c):
+        result = run_step(c)
+        result['withinSlo'] = passes(result)
+        curve.append(result)
+        if log:
+            log(f"  c={c:<4} {result['throughput']:>9.1f} ops/s  p50={_ms(result['p50'])}ms  "
+                f"p99={_ms(result['p99'])}ms  errors={result['errorRate']:.2%}  "
+                f"{'✅' if result['withinSlo'] else '❌'}")
+        return result
+
+    while concurrency <= max_concurrency:
+        result = run(concurrency)
+        if not result['withinSlo']:
+            failed_at = concurrency
+            break
+        if best and result['throughput'] < best['throughput'] * (1 + min_gain):
+            if result['throughput'] > best['throughput']:
+                best = result
+            break
+        best = result
+        headroom = 1.0 - result['p99'] / slo_p99_ms
+        if max_error_rate > 0:
+            headroom = min(headroom, 1.0 - result['errorRate'] / max_error_rate)
+        if headroom > 0.5:
+            step = concurrency
+        elif headroom > 0.2:
+            step = max(1, concurrency // 2)
+        else:
+            step = max(1, concurrency // 4)
+        concurrency += step
+
+    if best and failed_at:
+        low, high = best['concurrency'], failed_at
+        for _ in range(refine_steps):
+            if high - low <= 1:
+                break
+            middle = (low + high) // 2
+            result = run(middle)
+            if result['withinSlo']:
+                low = middle
+                if result['throughput'] > best['throughput']:
+                    best = result
+            else:
+                high = middle
+
+    curve.sort(key=lambda r: r['concurrency'])
+    return {
+        'sloP99Ms': slo_p99_ms,
+        'maxErrorRate': max_error_rate,
+        'maxSustainableThroughput': best['throughput'] if best else 0.0,
+        'kneeConcurrency': best['concurrency'] if best else None,
+        'firstFailingConcurrency': failed_at,
+        'curve': curve,
+    }
+
+
+def _ms(value):
+    return f'{value:.1f}' if value is not None else '-'
+
+
+def format_report(result, flow):
+    lines = [
+        f"📈 Capacity search for '{flow}' (SLO p99 <= {result['sloP99Ms']:g} ms, errors <= {result['maxErrorRate']:.1%})",
+        f"{'users':>6} {'ops/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}",
+    ]
+    for step in result['curve']:
+        marker = ' ' if step['withinSlo'] else '✗'
+        lines.append(f"{step['concurrency']:>6} {step['throughput']:>9.1f} {_ms(step['p50']):>8} {_ms(step['p90']):>8} "
+                     f"{_ms(step['p99']):>8} {_ms(step['max']):>8} {step['errorRate']:>7.2%} {marker}")
+    lines.append(f"🏁 Max sustainable throughput: {result['maxSustainableThroughput']:.1f} ops/s "
+                 f"at {result['kneeConcurrency']} concurrent users")
+    return '\n'.join(lines)
+
+
+def main():
+    from .emulator import Emulator
+    from .workloads import add_context_arguments, emulator_context, emulator_token, live_context
+
+    parser = argparse.ArgumentParser(description='Find the throughput knee of a flow by adaptive concurrency ramp')
+    parser.add_argument('--flow', choices=sorted(WORKLOADS), default='enroll-cycle')
+    parser.add_argument('--radius', default='30', help='radiusMiles for the search flow')
+    parser.add_argument('--zip', default='75454')
+    parser.add_argument('--slo-p99', type=float, default=250.0, help='p99 latency SLO in ms')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--step-duration', type=float, default=3.0, help='seconds per ramp step')
+    parser.add_argument('--start', type=int, default=1)
+    parser.add_argument('--max-concurrency', type=int, default=256)
+    parser.add_argument('--emulator', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.0, help='emulator service time in seconds')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token', action='append', default=[],
+                        help='ID token for live runs (repeatable; virtual users take them round-robin)')
+    parser.add_argument('--users', help='comma-separated Cognito users to authenticate for live runs')
+    parser.add_argument('--password')
+    add_context_arguments(parser)
+    parser.add_argument('--json-out')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(latency=args.latency).start()
+        # Large capacities so the ramp measures the service, not sold-out sessions
+        context = emulator_context(emulator, zip_code=args.zip, capacity=100000)
+        base_url = emulator.base_url
+
+        def client_factory(index):
+            return GrippedClient(emulator_token(index, prefix='capacity-user'), base_url=base_url)
+    else:
+        tokens = list(args.token)
+        if args.users:
+            from .auth import authenticate_users
+            tokens.extend(authenticate_users(args.users.split(','), args.password))
+        if not tokens:
+            parser.error('live runs need --token or --users/--password')
+        context = live_context(parser, args, args.flow)
+        if args.flow in STATEFUL_WORKLOADS and args.max_concurrency > len(tokens):
+            # Users sharing a token would enroll and unenroll each other, so cap the ramp at one user per token
+            print(f"⚠️  '{args.flow}' needs one token per virtual user: ramping to at most {len(tokens)} users")
+            args.max_concurrency = len(tokens)
+
+        def client_factory(index):
+            kwargs = {'base_url': args.base_url} if args.base_url else {}
+            return GrippedClient(tokens[index % len(tokens)], **kwargs)
+    context['radiusMiles'] = args.radius
+
+    operation = WORKLOADS[args.flow]
+    print(f"🔎 Ramping '{args.flow}' ({args.step_duration:g}s per step)...")
+    try:
+        result = find_knee(
+            lambda c: run_closed_loop(client_factory, operation, c, args.step_duration, context, label=args.flow),
+            args.slo_p99, args.max_error_rate, start=args.start, max_concurrency=args.max_concurrency,
+        )
+    finally:
+        if emulator:
+            emulator.stop()
+
+    print(format_report(result, args.flow))
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+"""
+Python client for the Gripped REST API
+Wraps the same endpoints the e2e scripts and the Flutter services call,
+using one pooled requests.Session per client
+"""
+
+import base64
+import json
+import os
+import time
+
+import requests
+
+from .codec import get_codec
+from .config import API_BASE, REQUEST_TIMEOUT
+
+
+def token_claims(id_token):
+    """Decode the (unverified) claims of a Cognito ID token"""
+    payload = id_token.split('.')[1]
+    # Add padding if needed
+    payload += '=' * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))
+
+
+def status_class(status):
+    """Map an HTTP status code to its class ('2xx', '4xx', ...) or 'error'"""
+    if not status:
+        return 'error'
+    return f"{status // 100}xx"
+
+
+class GrippedClient:
+    """Gripped API client bound to one user's ID token
+
+    Every call goes through request(), which fires the registered hooks with
+    an event dict describing the call (method, endpoint template, status,
+    timings, sizes). Hooks are how measurement and recording layers attach.
+    Setting GRIPPED_TRAFFIC_LOG=<path> records every client's traffic there.
+
+    JSON bodies are encoded, and response.json() decoded, with `codec` (a
+    gripped_sdk.codec codec or name; default: the fastest one installed).
+
+    With a gripped_sdk.singleflight.SingleFlight (which several clients may
+    share), identical concurrent GETs wait for one in-flight request and
+    share its response; their hook events carry coalesced=True.
+    """
+
+    def __init__(self, id_token=None, base_url=API_BASE, session=None, timeout=REQUEST_TIMEOUT, codec='auto',
+                 single_flight=None):
+        self.base_url = base_url.rstrip('/')
+        self.id_token = id_token
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.codec = get_codec(codec) if isinstance(codec, str) else codec
+        self.single_flight = single_flight
+        self.hooks = []
+        traffic_log = os.environ.get('GRIPPED_TRAFFIC_LOG')
+        if traffic_log:
+            from .traffic import TrafficRecorder
+            self.add_hook(TrafficRecorder.shared(traffic_log))
+
+    @property
+    def user_id(self):
+        """The Cognito sub of the bound token"""
+        if not self.id_token:
+            return None
+        if getattr(self, '_claims_token', None) != self.id_token:
+            self._user_id = token_claims(self.id_token).get('sub')
+            self._claims_token = self.id_token
+        return self._user_id
+
+    def add_hook(self, hook):
+        """Register hook(event) to be called after every request"""
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        """Unregister a previously added hook"""
+        self.hooks.remove(hook)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _headers(self, extra=None):
+        headers = {'Content-Type': 'application/json'}
+        if self.id_token:
+            headers['Authorization'] = f'Bearer {self.id_token}'
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def request(self, method, endpoint, path_params=None, params=None, json_body=None,
+                data=None, headers=None, url=None):
+        """Send one request and fire hooks
+
+        `endpoint` is the path template (e.g. '/classes/{sessionId}/enroll')
+        and is used as the stable label for the call; `path_params` fill it in.
+        Pass `url` to target an absolute URL (presigned S3 URLs) while still
+        labelling the call with `endpoint`.
+        """
+        path = endpoint.format(**path_params) if path_params else endpoint
+        # Only plain API GETs are coalesced; extra headers (Range, If-None-Match) make a call distinct
+        coalesce = (self.single_flight is not None and method == 'GET' and url is None and headers is None
+                    and json_body is None and data is None)
+        if url is None:
+            url = self.base_url + path
+            headers = self._headers(headers)
+
+        event = self._event(method, endpoint, path, path_params, params)
+        if json_body is not None:
+            data = self.codec.dumps(json_body)
+        if not coalesce:
+            return self._send(method, url, headers, params, data, event)
+
+        key = self.single_flight.key(self.user_id, endpoint, path, params)
+        started = time.perf_counter()
+        try:
+            response, shared = self.single_flight.do(
+                key, lambda: self._send(method, url, headers, params, data, event))
+        except requests.RequestException as e:
+            # The leader's _send already fired its event; a follower reports the shared failure itself
+            if event['elapsed'] is None:
+                event.update(elapsed=time.perf_counter() - started, error=str(e), coalesced=True)
+                self._fire(event)
+            raise
+        if shared:
+            event.update(elapsed=time.perf_counter() - started, status=response.status_code,
+                         response=response, coalesced=True)
+            self._fire(event)
+        return response
+
+    def _event(self, method, endpoint, path, path_params=None, params=None):
+        return {
+            'method': method,
+            'endpoint': endpoint,
+            'path': path,
+            'pathParams': path_params,
+            'params': params,
+            'user': self.user_id,
+            'status': None,
+            'start': time.time(),
+            'elapsed': None,
+            'requestBytes': 0,
+            'responseBytes': 0,
+            'error': None,
+            'response': None,
+            'coalesced': False,
+        }
+
+    def _send(self, method, url, headers, params, data, event):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, headers=headers, params=params,
+                data=data, timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            event['elapsed'] = time.perf_counter() - started
+            event['error'] = str(e)
+            self._fire(event)
+            raise
+
+        event['elapsed'] = time.perf_counter() - started
+        event['status'] = response.status_code
+        body = response.request.body
+        event['requestBytes'] = len(body) if isinstance(body, (bytes, str)) else 0
+        event['responseBytes'] = len(response.content)
+        event['response'] = response
+        # Parse the raw body bytes with the client's codec instead of requests' text + json.loads
+        response.json = self._json_decoder(response)
+        self._fire(event)
+        return response
+
+    def _json_decoder(self, response):
+        loads = self.codec.loads
+
+        def decode(**kwargs):
+            try:
+                return loads(response.content)
+            except ValueError as e:
+                # What requests raises, so `except requests.RequestException` still covers bad bodies
+                raise requests.exceptions.JSONDecodeError(
+                    getattr(e, 'msg', str(e)), getattr(e, 'doc', None) or response.text, getattr(e, 'pos', 0)) from e
+
+        return decode
+
+    def _fire(self, event):
+        for hook in self.hooks:
+            hook(event)
+
+    # Profile endpoints
+    def get_profile(self):
+        return self.request('GET', '/profile/me')
+
+    def update_profile(self, profile):
+        return self.request('PUT', '/profile/me', json_body=profile)
+
+    def delete_profile(self):
+        return self.request('DELETE', '/profile/me')
+
+    def get_presigned_urls(self, image_count=1, content_type='image/jpeg'):
+        payload = {'imageCount': image_count, 'contentType': content_type}
+        return self.request('POST', '/profile/presigned-url', json_body=payload)
+
+    def get_download_url(self, key):
+        return self.request('GET', '/profile/download-url', params={'key': key})
+
+    def delete_image(self, image_id):
+        return self.request('DELETE', '/profile/images/{imageId}', {'imageId': image_id})
+
+    def put_object(self, upload_url, data, content_type='image/jpeg'):
+        """PUT bytes (or a file object) to a presigned S3 upload URL"""
+        return self.request('PUT', 's3:PutObject', url=upload_url, data=data,
+                            headers={'Content-Type': content_type})
+
+    # Multipart uploads (served by the emulator; see gripped_sdk.multipart)
+    def start_multipart_upload(self, size, content_type='image/jpeg', part_size=None):
+        payload = {'size': size, 'contentType': content_type}
+        if part_size:
+            payload['partSize'] = part_size
+        return self.request('POST', '/profile/multipart-upload', json_body=payload)
+
+    def presign_upload_parts(self, upload_id, part_numbers):
+        payload = {'uploadId': upload_id, 'partNumbers': list(part_numbers)}
+        return self.request('POST', '/profile/multipart-upload/parts', json_body=payload)
+
+    def complete_multipart_upload(self, upload_id, parts):
+        """parts: [{'partNumber': n, 'etag': etag}, ...] in ascending order"""
+        payload = {'uploadId': upload_id, 'parts': parts}
+        return self.request('POST', '/profile/multipart-upload/complete', json_body=payload)
+
+    def abort_multipart_upload(self, upload_id):
+        return self.request('DELETE', '/profile/multipart-upload', params={'uploadId': upload_id})
+
+    def upload_part(self, upload_url, data):
+        """PUT one part (bytes or a file-like object with a length) to a presigned part URL"""
+        return self.request('PUT', 's3:UploadPart', url=upload_url, data=data)
+
+    # Class endpoints
+    def create_class(self, payload):
+        return self.request('POST', '/classes', json_body=payload)
+
+    def list_classes(self, zip_code=None, trainer_id=None):
+        params = {}
+        if zip_code:
+            params['zip'] = zip_code
+        if trainer_id:
+            params['trainerId'] = trainer_id
+        return self.request('GET', '/classes', params=params)
+
+    def search_classes(self, zip_code, radius_miles="30", query=None, date=None, timezone=None):
+        params = {'zipCode': zip_code, 'radiusMiles': str(radius_miles)}
+        if query:
+            params['query'] = query
+        if date:
+            params['date'] = date
+            if timezone:
+                params['timezone'] = timezone
+        return self.request('GET', '/classes/search', params=params)
+
+    def cancel_session(self, session_id):
+        return self.request('DELETE', '/classes/{sessionId}', {'sessionId': session_id})
+
+    def enroll(self, session_id):
+        return self.request('POST', '/classes/{sessionId}/enroll', {'sessionId': session_id})
+
+    def unenroll(self, session_id):
+        return self.request('DELETE', '/classes/{sessionId}/enroll', {'sessionId': session_id})
+
+    def batch_enroll(self, session_ids):
+        return self.request('POST', '/classes/batch-enroll', json_body={'sessionIds': list(session_ids)})
+
+    def send_message(self, session_id, message_text):
+        return self.request('POST', '/classes/{sessionId}/messages', {'sessionId': session_id},
+                            json_body={'messageText': message_text})
+
+    def get_student_classes(self, from_date=None, to_date=None):
+        params = {}
+        if from_date:
+            params['fromDate'] = from_date
+        if to_date:
+            params['toDate'] = to_date
+        return self.request('GET', '/students/me/classes', params=params or None)
+
+    # Trainer and rating endpoints
+    def get_trainer_profile(self, trainer_id):
+        return self.request('GET', '/trainers/{trainerId}/profile', {'trainerId': trainer_id})
+
+    def get_trainer_classes(self, trainer_id, days_ahead=90):
+        return self.request('GET', '/trainers/{trainerId}/classes', {'trainerId': trainer_id},
+                            params={'daysAhead': str(days_ahead)})
+
+    def get_trainer_rating(self, trainer_id):
+        return self.request('GET', '/ratings', params={'trainerId': trainer_id, 'summary': 'true'})
+
+    def get_ratings(self, trainer_id=None):
+        params = {'trainerId': trainer_id} if trainer_id else None
+        return self.request('GET', '/ratings', params=params)
+
+    def submit_rating(self, trainer_id, rating, feedback=None, is_anonymous=False):
+        payload = {
+            'trainerId': trainer_id,
+            'rating': rating,
+            'feedback': feedback,
+            'isAnonymous': is_anonymous,
+        }
+        return self.request('POST', '/ratings', json_body=payload)
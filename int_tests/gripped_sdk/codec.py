@@ -0,0 +1,113 @@
+"""
+Pluggable JSON codecs for request and response bodies
+A codec turns objects into UTF-8 JSON bytes and parses bytes back without
+an intermediate str. GrippedClient, the emulator and the response models
+take one; get_codec('auto') (the default) picks orjson, then msgspec, then
+the stdlib json module, depending on what is installed.
+GRIPPED_JSON_CODEC=<name> forces one. gripped_sdk.jsonbench compares them.
+"""
+
+import json
+import os
+
+PREFERENCE = ('orjson', 'msgspec', 'stdlib')
+
+
+class StdlibCodec:
+    """The json module; compact separators, ASCII output (the C encoder's fast path), bytes in and out"""
+
+    name = 'stdlib'
+
+    def __init__(self, default=None):
+        self._encoder = json.JSONEncoder(separators=(',', ':'), default=default)
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj).encode('utf-8')
+
+    def loads(self, data):
+        # json.loads accepts bytes directly (and detects UTF-8 itself)
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """orjson: encodes straight to bytes, parses bytes without decoding to str"""
+
+    name = 'orjson'
+
+    def __init__(self, default=None):
+        import orjson
+        self._orjson = orjson
+        self._default = default
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj, default=self._default, option=self._option)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec:
+    """msgspec.json with reusable encoder and decoder instances"""
+
+    name = 'msgspec'
+
+    def __init__(self, default=None):
+        import msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=default)
+        self._decoder = msgspec.json.Decoder()
+        self._error = msgspec.DecodeError
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data)
+        except self._error as e:
+            # Callers catch ValueError, as with json and orjson
+            raise ValueError(str(e)) from None
+
+
+CODECS = {'orjson': OrjsonCodec, 'msgspec': MsgspecCodec, 'stdlib': StdlibCodec}
+_default_codec = None
+
+
+def available_codecs():
+    """Names of the codecs that can be constructed here, fastest first"""
+    names = []
+    for name in PREFERENCE:
+        try:
+            CODECS[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(name='auto', default=None):
+    """A codec instance by name ('auto', 'orjson', 'msgspec', 'stdlib')
+
+    `default` is called for objects the codec cannot serialize (like
+    json.dumps' default=). 'auto' honours GRIPPED_JSON_CODEC, then falls
+    back through orjson and msgspec to the stdlib.
+    """
+    if name == 'auto':
+        name = os.environ.get('GRIPPED_JSON_CODEC', 'auto')
+    if name != 'auto':
+        if name not in CODECS:
+            raise ValueError(f"Unknown JSON codec '{name}' (choose from {', '.join(CODECS)})")
+        return CODECS[name](default)
+    for candidate in PREFERENCE:
+        try:
+            return CODECS[candidate](default)
+        except ImportError:
+            continue
+
+
+def default_codec():
+    """The shared 'auto' codec"""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = get_codec()
+    return _default_codec
@@ -0,0 +1,202 @@
+"""
+Cold-start vs warm latency profiler for the Lambda-backed endpoints
+For each endpoint, sends probe sequences separated by controlled idle gaps:
+one probe after the gap (possibly landing on a reclaimed container) followed
+by a few back-to-back warm probes. Responses are classified as cold or warm
+from timing against the endpoint's warm baseline plus any x-amzn-* header
+that reports an init phase. The report gives cold-start rate, penalty and
+the smallest idle gap that produced a cold start, per endpoint.
+
+Usage:
+    python -m gripped_sdk.coldstart --emulator --cold-start 0.4 --idle-timeout 2 --gaps 0,1,3,1,3
+    python -m gripped_sdk.coldstart --token $ID_TOKEN --gaps 0,60,300,600,900
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+
+from .client import GrippedClient
+
+DEFAULT_GAPS = (0, 60, 300, 600, 900)
+
+PROBES = {
+    '/classes/search': lambda client, context: client.search_classes(context.get('zipCode', '75454'),
+                                                                     context.get('radiusMiles', '30')),
+    '/profile/presigned-url': lambda client, context: client.get_presigned_urls(1),
+    '/profile/me': lambda client, context: client.get_profile(),
+}
+
+
+def amzn_headers(response):
+    """The x-amzn-* / x-amz-* headers of a response, lower-cased"""
+    return {name.lower(): value for name, value in response.headers.items()
+            if name.lower().startswith(('x-amzn-', 'x-amz-'))}
+
+
+def _timed(client, probe, context):
+    events = []
+    client.add_hook(events.append)
+    try:
+        response = probe(client, context)
+    finally:
+        client.remove_hook(events.append)
+    return {
+        'status': response.status_code,
+        'ms': round(events[-1]['elapsed'] * 1000.0, 3),
+        'headers': amzn_headers(response),
+    }
+
+
+def probe_endpoint(client_factory, probe, gaps, followups=3, context=None, sleep=time.sleep):
+    """Run one probe sequence per idle gap and return the raw samples"""
+    context = context if context is not None else {}
+    client = client_factory()
+    samples = []
+    try:
+        for sequence, gap in enumerate(gaps):
+            if gap:
+                sleep(gap)
+            sample = _timed(client, probe, context)
+            sample.update({'sequence': sequence, 'gap': gap, 'kind': 'after-idle'})
+            samples.append(sample)
+            for _ in range(followups):
+                sample = _timed(client, probe, context)
+                sample.update({'sequence': sequence, 'gap': gap, 'kind': 'warm'})
+                samples.append(sample)
+    finally:
+        client.close()
+    return samples
+
+
+def classify(samples, ratio=2.0, min_penalty_ms=50.0):
+    """Mark each sample cold or warm and return the warm baseline in ms
+
+    A sample is cold when an x-amzn header reports an init phase, or when it
+    is slower than both ratio x baseline and baseline + min_penalty_ms,
+    where the baseline is the median of the back-to-back warm probes.
+    """
+    warm = [s['ms'] for s in samples if s['kind'] == 'warm']
+    baseline = statistics.median(warm) if warm else min(s['ms'] for s in samples)
+    threshold = max(baseline * ratio, baseline + min_penalty_ms)
+    for sample in samples:
+        by_header = any('init' in name or 'cold' in name for name in sample['headers'])
+        by_timing = sample['ms'] > threshold
+        sample['cold'] = by_header or by_timing
+        sample['evidence'] = 'header+timing' if by_header and by_timing else (
+            'header' if by_header else ('timing' if by_timing else None))
+    return baseline
+
+
+def summarize(endpoint, samples, baseline):
+    after_idle = [s for s in samples if s['kind'] == 'after-idle']
+    cold = [s for s in samples if s['cold']]
+    warm = [s['ms'] for s in samples if not s['cold']]
+    cold_ms = [s['ms'] for s in cold]
+    # The very first probe of a run is cold for reasons unrelated to idling
+    idled = [s for s in after_idle if s['sequence'] > 0]
+    idle_cold_gaps = [s['gap'] for s in idled if s['cold']]
+    header_names = sorted({name for s in samples for name in s['headers']})
+    return {
+        'endpoint': endpoint,
+        'probes': len(samples),
+        'afterIdleProbes': len(after_idle),
+        'coldStarts': len(cold),
+        'coldStartRate': round(sum(s['cold'] for s in idled) / len(idled), 3) if idled else 0.0,
+        'warmBaselineMs': round(baseline, 3),
+        'warmMedianMs': round(statistics.median(warm), 3) if warm else None,
+        'coldMedianMs': round(statistics.median(cold_ms), 3) if cold_ms else None,
+        'penaltyMs': round(statistics.median(cold_ms) - statistics.median(warm), 3) if cold_ms and warm else None,
+        'smallestColdGap': min(idle_cold_gaps) if idle_cold_gaps else None,
+        'byGap': [{'gap': s['gap'], 'ms': s['ms'], 'cold': s['cold'], 'evidence': s['evidence']} for s in after_idle],
+        'amznHeaders': header_names,
+    }
+
+
+def profile(client_factory, endpoints, gaps=DEFAULT_GAPS, followups=3, context=None, ratio=2.0, min_penalty_ms=50.0):
+    """Profile several endpoints concurrently (each on its own idle schedule)"""
+    results = {}
+
+    def run(endpoint):
+        samples = probe_endpoint(client_factory, PROBES[endpoint], gaps, followups, context)
+        baseline = classify(samples, ratio, min_penalty_ms)
+        results[endpoint] = summarize(endpoint, samples, baseline)
+
+    threads = [threading.Thread(target=run, args=(endpoint,), daemon=True) for endpoint in endpoints]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [results[endpoint] for endpoint in endpoints if endpoint in results]
+
+
+def format_report(summaries):
+    lines = [f"{'endpoint':<24} {'cold rate':>9} {'warm ms':>9} {'cold ms':>9} {'penalty ms':>11} {'min cold gap':>13}"]
+    for s in summaries:
+        def show(value, fmt='{:.1f}'):
+            return fmt.format(value) if value is not None else '-'
+        lines.append(f"{s['endpoint']:<24} {s['coldStartRate']:>9.0%} {show(s['warmMedianMs']):>9} "
+                     f"{show(s['coldMedianMs']):>9} {show(s['penaltyMs']):>11} {show(s['smallestColdGap'], '{:g}s'):>13}")
+    for s in summaries:
+        timeline = ' '.join(f"{g['gap']:g}s:{'❄️ ' if g['cold'] else '🔥'}" for g in s['byGap'])
+        lines.append(f"  {s['endpoint']}: {timeline}")
+        if s['amznHeaders']:
+            lines.append(f"    headers seen: {', '.join(s['amznHeaders'])}")
+    return '\n'.join(lines)
+
+
+def main():
+    from .emulator import Emulator, make_token
+
+    parser = argparse.ArgumentParser(description='Cold-start vs warm latency profiler')
+    parser.add_argument('--endpoints', default=','.join(PROBES), help='comma-separated endpoints to probe')
+    parser.add_argument('--gaps', default=','.join(str(g) for g in DEFAULT_GAPS), help='idle gaps in seconds')
+    parser.add_argument('--followups', type=int, default=3, help='warm probes after each idle probe')
+    parser.add_argument('--ratio', type=float, default=2.0)
+    parser.add_argument('--min-penalty-ms', type=float, default=50.0)
+    parser.add_argument('--emulator', action='store_true')
+    parser.add_argument('--cold-start', type=float, default=0.4, help='emulator cold start in seconds')
+    parser.add_argument('--idle-timeout', type=float, default=2.0, help='emulator container idle timeout')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    parser.add_argument('--zip', default='75454')
+    parser.add_argument('--json-out')
+    args = parser.parse_args()
+
+    endpoints = [e for e in args.endpoints.split(',') if e]
+    unknown = set(endpoints) - set(PROBES)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    gaps = [float(g) for g in args.gaps.split(',')]
+
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(cold_start=args.cold_start, idle_timeout=args.idle_timeout).start()
+        emulator.state.seed()
+        base_url, token = emulator.base_url, make_token('coldstart-profiler')
+        GrippedClient(token, base_url=base_url).update_profile({'role': 'student', 'firstName': 'Probe'})
+        emulator.reclaim_containers()
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    print(f"🧊 Probing {len(endpoints)} endpoint(s) with idle gaps {gaps} (~{sum(gaps):g}s)")
+    try:
+        summaries = profile(lambda: GrippedClient(token, base_url=base_url), endpoints, gaps,
+                            args.followups, {'zipCode': args.zip}, args.ratio, args.min_penalty_ms)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    print(format_report(summaries))
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
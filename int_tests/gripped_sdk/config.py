@@ -0,0 +1,27 @@
+"""
+Shared configuration for the Gripped Python SDK and performance tooling
+Values mirror the constants used by the e2e scripts in int_tests/
+"""
+
+# API / Cognito configuration (nonProd account)
+API_BASE = "https://xsmi514ucd.execute-api.us-east-1.amazonaws.com/prod"
+CLIENT_ID = "5or7m2e6ovvr8jmk9pj07j7pjj"
+USER_POOL_ID = "us-east-1_aUtqQtNcJ"
+REGION = "us-east-1"
+
+# BETA environment
+BETA_API_BASE = "https://5957u6zvu3.execute-api.us-east-1.amazonaws.com/prod"
+BETA_CLIENT_ID = "7l0ec3fthfc4nam0dopqa80dlt"
+BETA_USER_POOL_ID = "us-east-1_Dj5vTsxK6"
+
+# DynamoDB table names - actual deployment values
+CLASS_TABLE = "GrippedStack-ClassTable13721077-JMFTGOIYQ82L"
+STUDENTS_TABLE = "GrippedStack-StudentsTableDAB56938-1DBFEPTCPBZAO"
+MESSAGES_TABLE = "GrippedStack-MessagesTable05B58A27-1BEL97AJ0F86G"
+USER_PROFILES_TABLE = "GrippedStack-UserProfilesTableF49D814C-11MT1TM05XSRE"
+
+# S3 bucket for profile and ID images
+PHOTOS_BUCKET = "grippedstack-userphotosbucket4d5de39b-gvc8qfaefzit"
+
+# Default request timeout in seconds
+REQUEST_TIMEOUT = 30
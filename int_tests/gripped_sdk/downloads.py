@@ -0,0 +1,298 @@
+"""
+Image download client with a size-bounded LRU disk cache
+Student flows render the same trainer photos over and over, each through
+/profile/download-url and a presigned S3 GET. ImageDownloader keeps the
+bytes in an on-disk LRU cache keyed by S3 key and ETag, asks the API for a
+presigned URL only when it has none or the one it has is about to expire,
+and collapses concurrent fetches of the same key into one download
+(single flight). The stats give the cache hit ratio and what was saved.
+
+Image keys are immutable (every upload gets a new UUID key), so cached
+files are served without revalidation by default; revalidate=True sends a
+conditional GET (If-None-Match) instead.
+
+Usage:
+    python -m gripped_sdk.downloads --emulator --images 200 --views 5000 --cache-mb 8 --browsers 16
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlsplit
+
+from .client import GrippedClient
+
+# Ask for a new presigned URL this many seconds before the old one expires
+URL_REFRESH_MARGIN = 30
+
+
+class DiskLRUCache:
+    """Files under `directory`, evicted least-recently-used beyond max_bytes
+
+    File names are '<sha256(key)>-<etag>', so the cache survives restarts
+    without an index file; recency is the file mtime, bumped on every hit.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for name in os.listdir(directory):
+            digest, _, etag = name.partition('-')
+            if not etag or name.endswith('.tmp'):
+                continue
+            stat = os.stat(os.path.join(directory, name))
+            found.append((stat.st_mtime, digest, etag, stat.st_size))
+        for _, digest, etag, size in sorted(found):
+            self.entries[digest] = {'etag': etag, 'size': size}
+            self.total_bytes += size
+        with self.lock:
+            self._evict()
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _path(self, digest, etag):
+        return os.path.join(self.directory, f'{digest}-{etag}')
+
+    def lookup(self, key):
+        """(data, etag) of the cached object for `key`, or None; counts as a use
+
+        The file is read under the lock, so a concurrent store() or eviction
+        cannot delete it between the lookup and the read.
+        """
+        digest = self._digest(key)
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            path = self._path(digest, entry['etag'])
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)
+            except FileNotFoundError:
+                # Removed behind our back (another process sharing the directory): a miss
+                self._drop(digest)
+                return None
+            self.entries.move_to_end(digest)
+            return data, entry['etag']
+
+    def store(self, key, etag, data):
+        """Cache `data` as the object for `key` at `etag`; returns its path"""
+        digest = self._digest(key)
+        path = self._path(digest, etag)
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+        with self.lock:
+            old = self.entries.get(digest)
+            if old is not None and old['etag'] != etag:
+                self._drop(digest)
+            elif old is not None:
+                self.total_bytes -= old['size']
+            self.entries[digest] = {'etag': etag, 'size': len(data)}
+            self.entries.move_to_end(digest)
+            self.total_bytes += len(data)
+            self._evict()
+        return path
+
+    def _drop(self, digest):
+        entry = self.entries.pop(digest, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry['size']
+        try:
+            os.remove(self._path(digest, entry['etag']))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            digest = next(iter(self.entries))
+            self._drop(digest)
+            self.evictions += 1
+
+
+class ImageDownloader:
+    """Fetches S3 images by key through the API's presigned download URLs
+
+    fetch(key) returns the image bytes; with a cache they come from disk
+    whenever the key has been downloaded before and not evicted since.
+    """
+
+    def __init__(self, client, cache=None, revalidate=False, refresh_margin=URL_REFRESH_MARGIN):
+        self.client = client
+        self.cache = cache
+        self.revalidate = revalidate
+        self.refresh_margin = refresh_margin
+        self.lock = threading.Lock()
+        self.urls = {}
+        self.in_flight = {}
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'revalidated': 0, 'coalesced': 0,
+                      'urlRequests': 0, 'urlRefreshes': 0, 'bytesDownloaded': 0, 'bytesFromCache': 0}
+
+    def _count(self, field, amount=1):
+        with self.lock:
+            self.stats[field] += amount
+
+    def _download_url(self, key, force=False):
+        """A presigned GET URL for `key`, reusing the last one until it nearly expires"""
+        now = time.time()
+        with self.lock:
+            cached = self.urls.get(key)
+        if cached and not force and cached[1] - self.refresh_margin > now:
+            return cached[0]
+        response = self.client.get_download_url(key)
+        response.raise_for_status()
+        body = response.json()
+        url = body['downloadUrl']
+        expires_in = int(body.get('expiresIn') or dict(parse_qsl(urlsplit(url).query)).get('X-Amz-Expires', 900))
+        with self.lock:
+            self.urls[key] = (url, now + expires_in)
+            self.stats['urlRequests'] += 1
+            self.stats['urlRefreshes'] += cached is not None
+        return url
+
+    def fetch(self, key):
+        """Image bytes for `key`"""
+        self._count('requests')
+        cached = self.cache.lookup(key) if self.cache else None
+        if cached and not self.revalidate:
+            data = cached[0]
+            self._count('hits')
+            self._count('bytesFromCache', len(data))
+            return data
+
+        # Single flight: the first caller downloads, concurrent callers wait for its result
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            return future.result()
+        try:
+            data = self._download(key, cached)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def _download(self, key, cached):
+        headers = {'If-None-Match': f'"{cached[1]}"'} if cached else None
+        response = None
+        for attempt in range(2):
+            url = self._download_url(key, force=attempt > 0)
+            response = self.client.request('GET', 's3:GetObject', url=url, headers=headers)
+            if response.status_code != 403:
+                break
+        if response.status_code == 304 and cached:
+            data = cached[0]
+            self._count('hits')
+            self._count('revalidated')
+            self._count('bytesFromCache', len(data))
+            return data
+        response.raise_for_status()
+        data = response.content
+        self._count('misses')
+        self._count('bytesDownloaded', len(data))
+        if self.cache:
+            self.cache.store(key, response.headers.get('ETag', '').strip('"') or 'none', data)
+        return data
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        served = stats['hits'] + stats['misses']
+        stats['hitRatio'] = round(stats['hits'] / served, 4) if served else 0.0
+        if self.cache:
+            stats['cacheBytes'] = self.cache.total_bytes
+            stats['evictions'] = self.cache.evictions
+        return stats
+
+
+def browse(downloader, keys, views, browsers=8, skew=1.1, seed=0):
+    """Simulated students viewing images with Zipf-like popularity; returns seconds"""
+    weights = [1.0 / (rank + 1) ** skew for rank in range(len(keys))]
+    per_browser = views // browsers
+
+    def student(index):
+        rng = random.Random(seed + index)
+        for key in rng.choices(keys, weights, k=per_browser):
+            downloader.fetch(key)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=student, args=(i,), daemon=True) for i in range(browsers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    from .emulator import Emulator, make_token
+
+    parser = argparse.ArgumentParser(description='Browse trainer photos through an LRU disk cache')
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--image-kb', type=int, default=120)
+    parser.add_argument('--views', type=int, default=5000)
+    parser.add_argument('--browsers', type=int, default=16)
+    parser.add_argument('--cache-mb', type=float, default=8.0)
+    parser.add_argument('--cache-dir', help='defaults to a temporary directory')
+    parser.add_argument('--no-cache', action='store_true', help='baseline without the disk cache')
+    parser.add_argument('--revalidate', action='store_true')
+    parser.add_argument('--s3-latency', type=float, default=0.02)
+    parser.add_argument('--emulator', action='store_true', required=True,
+                        help='browse synthetic photos on the local emulator')
+    args = parser.parse_args()
+
+    emulator = Emulator(endpoint_latency={'s3': args.s3_latency}).start()
+    try:
+        with GrippedClient(make_token('photo-uploader'), base_url=emulator.base_url) as uploader:
+            keys = []
+            for url in (u for _ in range(-(-args.images // 10))
+                        for u in uploader.get_presigned_urls(10).json()['presignedUrls']):
+                uploader.put_object(url['uploadUrl'], os.urandom(args.image_kb * 1024))
+                keys.append(url['key'])
+            keys = keys[:args.images]
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = None if args.no_cache else DiskLRUCache(args.cache_dir or directory,
+                                                            int(args.cache_mb * 1024 * 1024))
+            with GrippedClient(make_token('photo-browser'), base_url=emulator.base_url) as client:
+                downloader = ImageDownloader(client, cache, revalidate=args.revalidate)
+                elapsed = browse(downloader, keys, args.views, args.browsers)
+            stats = downloader.summary()
+    finally:
+        emulator.stop()
+
+    print(f"🖼️  {stats['requests']} views of {len(keys)} images by {args.browsers} browsers in {elapsed:.2f}s")
+    print(f"📦 hit ratio {stats['hitRatio']:.1%} ({stats['hits']} hits, {stats['misses']} downloads, "
+          f"{stats['coalesced']} coalesced, {stats.get('evictions', 0)} evictions)")
+    print(f"🔗 {stats['urlRequests']} download-url calls ({stats['urlRefreshes']} refreshes), "
+          f"{stats['bytesDownloaded'] / 1e6:.1f} MB downloaded, {stats['bytesFromCache'] / 1e6:.1f} MB from cache")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,940 @@
+"""
+Local in-process emulator of the Gripped REST API and its S3 bucket
+Lets the SDK and the performance tooling run offline on one machine.
+
+The emulator keeps profiles, class sessions, enrollments, messages, ratings
+and uploaded objects in memory, speaks the same JSON shapes as the deployed
+API Gateway + Lambda stack, and serves presigned S3 URLs from a '/_s3/'
+prefix on the same port. Tokens are not verified; the user ID is the 'sub'
+claim of whatever Bearer token is sent (see make_token()).
+
+Beyond the deployed API it also issues presigned multipart uploads
+(/profile/multipart-upload), the contract the resumable large-media upload
+in gripped_sdk.multipart is written against.
+"""
+
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, quote, unquote, urlsplit
+
+from .codec import get_codec
+
+# ZIP -> (latitude, longitude) for the ZIP codes the e2e scripts use
+ZIP_COORDINATES = {
+    '10001': (40.7506, -73.9972),
+    '11201': (40.6940, -73.9903),
+    '75454': (33.2829, -96.5724),
+    '94129': (37.7989, -122.4662),
+}
+
+EARTH_RADIUS_MILES = 3958.8
+PRESIGNED_EXPIRES = 900
+# S3 multipart limits: every part but the last must be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+
+def make_token(sub, email=None):
+    """Build an unsigned JWT the emulator accepts as an ID token"""
+    def encode(part):
+        raw = json.dumps(part, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    claims = {'sub': sub, 'email': email or f'{sub}@example.com', 'token_use': 'id'}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.emulator"
+
+
+def zip_coordinates(zip_code):
+    """Look up ZIP coordinates, falling back to a stable point in the continental US"""
+    if zip_code in ZIP_COORDINATES:
+        return ZIP_COORDINATES[zip_code]
+    digest = hashlib.sha256(str(zip_code).encode('utf-8')).digest()
+    latitude = 25.0 + digest[0] / 255.0 * 24.0
+    longitude = -124.0 + digest[1] / 255.0 * 57.0
+    return round(latitude, 4), round(longitude, 4)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _compile(template):
+    pattern = re.sub(r'\\\{(\w+)\\\}', r'(?P<\1>[^/]+)', re.escape(template))
+    return re.compile(f'^{pattern}$')
+
+
+class ApiError(Exception):
+    """Raised by emulator handlers to produce an error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class EmulatorState:
+    """In-memory tables and the API handlers that operate on them"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.profiles = {}
+        self.sessions = {}
+        self.enrollments = {}
+        self.messages = {}
+        self.ratings = {}
+        self.objects = {}
+        self.multipart = {}
+
+    # Profile endpoints
+    def get_profile(self, user, params, body):
+        profile = self.profiles.get(user)
+        if not profile:
+            raise ApiError(404, 'Profile not found')
+        return 200, profile
+
+    def put_profile(self, user, params, body):
+        with self.lock:
+            profile = dict(self.profiles.get(user, {}))
+            profile.update({k: v for k, v in (body or {}).items() if k not in ('idImage', 'userId')})
+            id_image = (body or {}).get('idImage')
+            if id_image:
+                profile['idImageKey'] = id_image['key']
+            profile['userId'] = user
+            profile.setdefault('status', 'active')
+            profile.setdefault('createdAt', _now_iso())
+            profile['updatedAt'] = _now_iso()
+            self.profiles[user] = profile
+        return 200, profile
+
+    def delete_profile(self, user, params, body):
+        with self.lock:
+            profile = self.profiles.get(user)
+            if not profile:
+                raise ApiError(404, 'Profile not found')
+            profile['status'] = 'inactive'
+        return 200, {'message': 'Profile deleted successfully'}
+
+    def presigned_url(self, user, params, body, base_url=''):
+        count = int((body or {}).get('imageCount', 1))
+        if count < 1 or count > 10:
+            raise ApiError(400, 'imageCount must be between 1 and 10')
+        urls = []
+        for _ in range(count):
+            image_id = str(uuid.uuid4())
+            key = f'profiles/{user}/{image_id}.jpg'
+            urls.append({
+                'imageId': image_id,
+                'key': key,
+                'uploadUrl': self.presign(base_url, key),
+            })
+        return 200, {'presignedUrls': urls}
+
+    def download_url(self, user, params, body, base_url=''):
+        key = params.get('key')
+        if not key:
+            raise ApiError(400, 'key is required')
+        return 200, {'downloadUrl': self.presign(base_url, key), 'expiresIn': PRESIGNED_EXPIRES}
+
+    def presign(self, base_url, key):
+        return (f"{base_url}/_s3/{quote(key)}?X-Amz-Date={int(time.time())}"
+                f"&X-Amz-Expires={PRESIGNED_EXPIRES}&X-Amz-Signature={uuid.uuid4().hex}")
+
+    # Multipart uploads (emulator extension, see the module docstring)
+    def start_multipart(self, user, params, body, base_url=''):
+        body = body or {}
+        size = body.get('size')
+        part_size = body.get('partSize', 8 * 1024 * 1024)
+        if not isinstance(size, int) or size < 1:
+            raise ApiError(400, 'size must be a positive integer')
+        if not isinstance(part_size, int) or part_size < MIN_PART_SIZE:
+            raise ApiError(400, f'partSize must be at least {MIN_PART_SIZE} bytes')
+        part_count = -(-size // part_size)
+        if part_count > MAX_PARTS:
+            raise ApiError(400, f'Object needs more than {MAX_PARTS} parts; use a larger partSize')
+        image_id = str(uuid.uuid4())
+        upload_id = uuid.uuid4().hex
+        key = f'profiles/{user}/{image_id}.jpg'
+        with self.lock:
+            self.multipart[upload_id] = {'user': user, 'key': key, 'imageId': image_id, 'parts': {},
+                                         'contentType': body.get('contentType', 'image/jpeg')}
+        return 200, {
+            'uploadId': upload_id,
+            'imageId': image_id,
+            'key': key,
+            'partSize': part_size,
+            'parts': self._presign_parts(base_url, key, upload_id, range(1, part_count + 1)),
+        }
+
+    def presign_parts(self, user, params, body, base_url=''):
+        upload = self._upload_for(user, (body or {}).get('uploadId'))
+        numbers = (body or {}).get('partNumbers') or []
+        if not all(isinstance(n, int) and 1 <= n <= MAX_PARTS for n in numbers):
+            raise ApiError(400, 'partNumbers must be integers between 1 and 10000')
+        return 200, {'parts': self._presign_parts(base_url, upload['key'], body['uploadId'], numbers)}
+
+    def complete_multipart(self, user, params, body):
+        upload_id = (body or {}).get('uploadId')
+        upload = self._upload_for(user, upload_id)
+        listed = (body or {}).get('parts') or []
+        numbers = [p.get('partNumber') for p in listed]
+        if not listed or numbers != sorted(set(numbers)):
+            raise ApiError(400, 'parts must be listed once each in ascending partNumber order')
+        chunks, digests = [], []
+        for i, part in enumerate(listed):
+            stored = upload['parts'].get(part['partNumber'])
+            if not stored or stored['etag'] != part.get('etag', '').strip('"'):
+                raise ApiError(400, f"InvalidPart: part {part['partNumber']} was not uploaded with that ETag")
+            if i < len(listed) - 1 and len(stored['body']) < MIN_PART_SIZE:
+                raise ApiError(400, f"EntityTooSmall: part {part['partNumber']} is under {MIN_PART_SIZE} bytes")
+            chunks.append(stored['body'])
+            digests.append(bytes.fromhex(stored['etag']))
+        data = b''.join(chunks)
+        etag = f'{hashlib.md5(b"".join(digests)).hexdigest()}-{len(listed)}'
+        with self.lock:
+            self.objects[upload['key']] = {'body': data, 'etag': f'"{etag}"', 'contentType': upload['contentType'],
+                                           'lastModified': time.time()}
+            self.multipart.pop(upload_id, None)
+        return 200, {'key': upload['key'], 'imageId': upload['imageId'], 'etag': etag, 'size': len(data)}
+
+    def abort_multipart(self, user, params, body):
+        self._upload_for(user, params.get('uploadId'))
+        with self.lock:
+            self.multipart.pop(params['uploadId'], None)
+        return 200, {'message': 'Upload aborted'}
+
+    def _upload_for(self, user, upload_id):
+        upload = self.multipart.get(upload_id)
+        if not upload or upload['user'] != user:
+            raise ApiError(404, 'NoSuchUpload')
+        return upload
+
+    def _presign_parts(self, base_url, key, upload_id, numbers):
+        return [{'partNumber': n, 'uploadUrl': f'{self.presign(base_url, key)}&partNumber={n}&uploadId={upload_id}'}
+                for n in numbers]
+
+    def delete_image(self, user, params, body, imageId):
+        with self.lock:
+            profile = self.profiles.get(user)
+            if not profile:
+                raise ApiError(404, 'Profile not found')
+            images = profile.get('images', [])
+            remaining = [img for img in images if img.get('imageId') != imageId]
+            if len(remaining) == len(images):
+                raise ApiError(404, 'Image not found')
+            profile['images'] = remaining
+        return 200, {'message': f'Image {imageId} deleted'}
+
+    # Class endpoints
+    def create_class(self, user, params, body):
+        body = body or {}
+        if not body.get('className'):
+            raise ApiError(400, 'className is required')
+        if 'sessions' in body:
+            specs = [(s.get('startDateTime'), s.get('endDateTime'), s.get('capacity')) for s in body['sessions']]
+        else:
+            specs = [(body.get('startTime'), body.get('endTime'), body.get('capacity'))]
+        if not specs:
+            raise ApiError(400, 'At least one session is required')
+        for start, end, capacity in specs:
+            if not start or not end:
+                raise ApiError(400, 'Each session needs a start and end time')
+            if _parse_time(end) <= _parse_time(start):
+                raise ApiError(400, 'Session end time must be after start time')
+            if not isinstance(capacity, int) or capacity < 1:
+                raise ApiError(400, 'Session capacity must be a positive integer')
+
+        latitude, longitude = zip_coordinates(body.get('zip', ''))
+        class_id = str(uuid.uuid4())
+        shared = {k: v for k, v in body.items() if k not in ('sessions', 'startTime', 'endTime', 'capacity')}
+        created = []
+        with self.lock:
+            for start, end, capacity in specs:
+                item = dict(shared)
+                item.update({
+                    'sessionId': str(uuid.uuid4()),
+                    'classId': class_id,
+                    'trainerId': user,
+                    'startTime': start,
+                    'endTime': end,
+                    'capacity': capacity,
+                    'countRegistered': 0,
+                    'status': 'ACTIVE',
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'createdAt': _now_iso(),
+                })
+                self.sessions[item['sessionId']] = item
+                created.append(item)
+        if 'sessions' in body:
+            return 200, {'classId': class_id, 'sessions': created}
+        return 200, created[0]
+
+    def list_classes(self, user, params, body):
+        zip_code = params.get('zip')
+        trainer_id = params.get('trainerId')
+        with self.lock:
+            items = [dict(s) for s in self.sessions.values()
+                     if (not zip_code or s.get('zip') == zip_code)
+                     and (not trainer_id or s['trainerId'] == trainer_id)]
+        return 200, items
+
+    def search_classes(self, user, params, body):
+        zip_code = params.get('zipCode')
+        if not zip_code:
+            raise ApiError(400, 'zipCode is required')
+        try:
+            radius = float(params.get('radiusMiles', 30))
+        except ValueError:
+            raise ApiError(400, 'radiusMiles must be a number')
+        query = (params.get('query') or '').strip().lower()
+        date_filter = params.get('date')
+        tz = _zone(params.get('timezone'))
+        latitude, longitude = zip_coordinates(zip_code)
+
+        with self.lock:
+            candidates = [dict(s) for s in self.sessions.values() if s['status'] == 'ACTIVE']
+            profiles = dict(self.profiles)
+
+        results = []
+        for item in candidates:
+            distance = haversine_miles(latitude, longitude, item['latitude'], item['longitude'])
+            if distance > radius:
+                continue
+            trainer = profiles.get(item['trainerId'], {})
+            if query and not _matches(query, item, trainer):
+                continue
+            if date_filter and _parse_time(item['startTime']).astimezone(tz).strftime('%Y-%m-%d') != date_filter:
+                continue
+            results.append(_search_result(item, trainer, distance))
+        results.sort(key=lambda r: r['distanceMiles'])
+
+        response = {
+            'results': results,
+            'totalFound': len(results),
+            'searchLocation': {'latitude': latitude, 'longitude': longitude, 'zipCode': zip_code},
+            'radiusMiles': radius,
+        }
+        if date_filter:
+            response['dateFilter'] = date_filter
+        return 200, response
+
+    def cancel_session(self, user, params, body, sessionId):
+        with self.lock:
+            item = self._session(sessionId)
+            if item['trainerId'] != user:
+                raise ApiError(403, 'Only the trainer can cancel this session')
+            item['status'] = 'CANCELLED'
+            item['updatedAt'] = _now_iso()
+        return 200, {'message': f'Session {sessionId} cancelled successfully'}
+
+    def enroll(self, user, params, body, sessionId):
+        with self.lock:
+            enrollment = self._enroll(user, sessionId)
+        return 200, enrollment
+
+    def _enroll(self, user, session_id):
+        item = self._session(session_id)
+        if item['status'] != 'ACTIVE':
+            raise ApiError(400, 'Session is not active')
+        existing = self.enrollments.get((user, session_id))
+        if existing and existing['status'] == 'ACTIVE':
+            raise ApiError(400, 'Already enrolled in this session')
+        if item['countRegistered'] >= item['capacity']:
+            raise ApiError(400, 'Session is full')
+        start, end = _parse_time(item['startTime']), _parse_time(item['endTime'])
+        for (student_id, other_id), other in self.enrollments.items():
+            if student_id != user or other['status'] != 'ACTIVE':
+                continue
+            other_item = self.sessions[other_id]
+            if start < _parse_time(other_item['endTime']) and _parse_time(other_item['startTime']) < end:
+                raise ApiError(400, f"Time conflict with enrolled class '{other_item.get('className')}'")
+
+        enrollment = {
+            'studentId': user,
+            'sessionId': session_id,
+            'status': 'ACTIVE',
+            'enrolledAt': _now_iso(),
+            'createdAt': existing['createdAt'] if existing else _now_iso(),
+        }
+        self.enrollments[(user, session_id)] = enrollment
+        item['countRegistered'] += 1
+        return dict(enrollment)
+
+    def unenroll(self, user, params, body, sessionId):
+        with self.lock:
+            item = self._session(sessionId)
+            enrollment = self.enrollments.get((user, sessionId))
+            if not enrollment or enrollment['status'] != 'ACTIVE':
+                raise ApiError(404, 'Not enrolled in this session')
+            enrollment['status'] = 'CANCELLED'
+            enrollment['cancelledAt'] = _now_iso()
+            item['countRegistered'] = max(0, item['countRegistered'] - 1)
+        return 200, {'message': 'Successfully unenrolled from class'}
+
+    def batch_enroll(self, user, params, body):
+        session_ids = (body or {}).get('sessionIds') or []
+        if not session_ids:
+            raise ApiError(400, 'sessionIds is required')
+        results = []
+        with self.lock:
+            for session_id in session_ids:
+                try:
+                    results.append({'sessionId': session_id, 'success': True,
+                                    'enrollment': self._enroll(user, session_id)})
+                except ApiError as e:
+                    results.append({'sessionId': session_id, 'success': False, 'error': e.message})
+        enrolled = sum(1 for r in results if r['success'])
+        return 200, {'results': results, 'enrolled': enrolled, 'failed': len(results) - enrolled}
+
+    def send_message(self, user, params, body, sessionId):
+        text = (body or {}).get('messageText')
+        if not text:
+            raise ApiError(400, 'messageText is required')
+        with self.lock:
+            item = self._session(sessionId)
+            if item['trainerId'] != user:
+                raise ApiError(403, 'Only the trainer can message this class')
+            message = {
+                'messageId': str(uuid.uuid4()),
+                'sessionId': sessionId,
+                'trainerId': user,
+                'messageText': text,
+                'createdAt': _now_iso(),
+            }
+            self.messages[message['messageId']] = message
+        return 200, message
+
+    def student_classes(self, user, params, body):
+        with self.lock:
+            classes = [{'class': dict(self.sessions[session_id]), 'enrollment': dict(e)}
+                       for (student_id, session_id), e in self.enrollments.items()
+                       if student_id == user and e['status'] == 'ACTIVE']
+        return 200, {'classes': classes, 'count': len(classes)}
+
+    # Trainer and rating endpoints
+    def trainer_profile(self, user, params, body, trainerId):
+        profile = self.profiles.get(trainerId)
+        if not profile or profile.get('role') != 'trainer':
+            raise ApiError(404, 'Trainer not found')
+        public = {k: v for k, v in profile.items() if k not in ('idImageKey', 'phone')}
+        return 200, public
+
+    def trainer_classes(self, user, params, body, trainerId):
+        horizon = datetime.now(timezone.utc) + timedelta(days=int(params.get('daysAhead', 90)))
+        with self.lock:
+            classes = [dict(s) for s in self.sessions.values()
+                       if s['trainerId'] == trainerId and s['status'] == 'ACTIVE'
+                       and _parse_time(s['startTime']) <= horizon]
+        classes.sort(key=lambda s: s['startTime'])
+        return 200, {'trainerId': trainerId, 'classes': classes, 'count': len(classes)}
+
+    def get_ratings(self, user, params, body):
+        trainer_id = params.get('trainerId')
+        with self.lock:
+            if not trainer_id:
+                return 200, [dict(r) for (student_id, _), r in self.ratings.items() if student_id == user]
+            ratings = [dict(r) for (_, rated), r in self.ratings.items() if rated == trainer_id]
+        if params.get('summary') == 'true':
+            if not ratings:
+                raise ApiError(404, 'No ratings found for trainer')
+            average = sum(r['rating'] for r in ratings) / len(ratings)
+            return 200, {'trainerId': trainer_id, 'averageRating': round(average, 2), 'totalRatings': len(ratings)}
+        return 200, ratings
+
+    def submit_rating(self, user, params, body, trainerId=None):
+        body = body or {}
+        trainer_id = trainerId or body.get('trainerId')
+        rating = body.get('rating')
+        if not trainer_id or not isinstance(rating, int) or not 1 <= rating <= 5:
+            raise ApiError(400, 'trainerId and a rating between 1 and 5 are required')
+        record = {
+            'studentId': user,
+            'trainerId': trainer_id,
+            'rating': rating,
+            'feedback': body.get('feedback'),
+            'isAnonymous': bool(body.get('isAnonymous')),
+            'createdAt': _now_iso(),
+        }
+        with self.lock:
+            self.ratings[(user, trainer_id)] = record
+        return 200, record
+
+    def _session(self, session_id):
+        item = self.sessions.get(session_id)
+        if not item:
+            raise ApiError(404, 'Session not found')
+        return item
+
+    def seed(self, trainers=10, sessions_per_trainer=5, zip_codes=('75454',), spread_miles=20.0,
+             start=None, rng=None):
+        """Populate trainers and sessions scattered around the given ZIP codes
+
+        Returns the list of created session IDs.
+        """
+        rng = rng or random.Random(42)
+        start = start or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        tags = ['strength', 'pilates', 'yoga', 'hiit', 'boxing', 'cycling']
+        session_ids = []
+        with self.lock:
+            for t in range(trainers):
+                trainer_id = str(uuid.uuid4())
+                specialty = tags[t % len(tags)]
+                self.profiles[trainer_id] = {
+                    'userId': trainer_id,
+                    'role': 'trainer',
+                    'status': 'active',
+                    'firstName': f'Trainer{t}',
+                    'lastName': 'Seed',
+                    'displayName': f'Trainer{t} Seed',
+                    'email': f'trainer{t}@example.com',
+                    'specialty': specialty.title(),
+                    'bio': f'Seeded {specialty} trainer',
+                    'certifications': ['NASM', 'CPR'],
+                    'images': [],
+                }
+                base_lat, base_lon = zip_coordinates(zip_codes[t % len(zip_codes)])
+                for s in range(sessions_per_trainer):
+                    offset_lat = rng.uniform(-spread_miles, spread_miles) / 69.0
+                    offset_lon = rng.uniform(-spread_miles, spread_miles) / (69.0 * max(0.1, math.cos(math.radians(base_lat))))
+                    begins = start + timedelta(days=s, hours=t % 12)
+                    item = {
+                        'sessionId': str(uuid.uuid4()),
+                        'classId': f'seed-{t}',
+                        'trainerId': trainer_id,
+                        'className': f'{specialty.title()} Class {t}',
+                        'overview': f'Seeded {specialty} session',
+                        'classLocationAddress1': f'{100 + t} Seed Street',
+                        'city': 'Seed City',
+                        'state': 'TX',
+                        'zip': zip_codes[t % len(zip_codes)],
+                        'pricePerClass': 20 + (t % 5) * 5,
+                        'currency': 'USD',
+                        'classTags': [specialty, 'seed'],
+                        'startTime': begins.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        'endTime': (begins + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        'capacity': 15,
+                        'countRegistered': 0,
+                        'status': 'ACTIVE',
+                        'latitude': round(base_lat + offset_lat, 6),
+                        'longitude': round(base_lon + offset_lon, 6),
+                        'createdAt': _now_iso(),
+                    }
+                    self.sessions[item['sessionId']] = item
+                    session_ids.append(item['sessionId'])
+        return session_ids
+
+
+def _zone(name):
+    if not name:
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        return timezone.utc
+
+
+def _matches(query, item, trainer):
+    haystack = [item.get('className', ''), item.get('overview', ''), trainer.get('specialty', '')]
+    haystack.extend(item.get('classTags') or [])
+    return any(query in str(value).lower() for value in haystack)
+
+
+def _search_result(item, trainer, distance):
+    name = trainer.get('displayName') or f"{trainer.get('firstName', '')} {trainer.get('lastName', '')}".strip()
+    return {
+        'sessionId': item['sessionId'],
+        'classId': item.get('classId'),
+        'trainerId': item['trainerId'],
+        'classTitle': item.get('className'),
+        'classOverview': item.get('overview'),
+        'trainerName': name,
+        'trainerEmail': trainer.get('email'),
+        'trainerPhone': trainer.get('phone'),
+        'trainerBio': trainer.get('bio'),
+        'trainerSpecialty': trainer.get('specialty'),
+        'trainerCertifications': trainer.get('certifications', []),
+        'tags': item.get('classTags', []),
+        'address': item.get('classLocationAddress1'),
+        'city': item.get('city'),
+        'state': item.get('state'),
+        'zip': item.get('zip'),
+        'price': item.get('pricePerClass'),
+        'currency': item.get('currency', 'USD'),
+        'startDateTime': item['startTime'],
+        'endDateTime': item['endTime'],
+        'maxStudents': item['capacity'],
+        'currentStudents': item['countRegistered'],
+        'latitude': item['latitude'],
+        'longitude': item['longitude'],
+        'distanceMiles': round(distance, 2),
+    }
+
+
+ROUTES = [
+    ('GET', '/profile/me', 'get_profile'),
+    ('PUT', '/profile/me', 'put_profile'),
+    ('POST', '/profile/me', 'put_profile'),
+    ('DELETE', '/profile/me', 'delete_profile'),
+    ('POST', '/profile/presigned-url', 'presigned_url'),
+    ('GET', '/profile/download-url', 'download_url'),
+    ('DELETE', '/profile/images/{imageId}', 'delete_image'),
+    ('POST', '/profile/multipart-upload', 'start_multipart'),
+    ('POST', '/profile/multipart-upload/parts', 'presign_parts'),
+    ('POST', '/profile/multipart-upload/complete', 'complete_multipart'),
+    ('DELETE', '/profile/multipart-upload', 'abort_multipart'),
+    ('GET', '/classes/search', 'search_classes'),
+    ('POST', '/classes/batch-enroll', 'batch_enroll'),
+    ('GET', '/classes', 'list_classes'),
+    ('POST', '/classes', 'create_class'),
+    ('DELETE', '/classes/{sessionId}', 'cancel_session'),
+    ('POST', '/classes/{sessionId}/enroll', 'enroll'),
+    ('DELETE', '/classes/{sessionId}/enroll', 'unenroll'),
+    ('POST', '/classes/{sessionId}/messages', 'send_message'),
+    ('GET', '/students/me/classes', 'student_classes'),
+    ('GET', '/trainers/{trainerId}/profile', 'trainer_profile'),
+    ('GET', '/trainers/{trainerId}/classes', 'trainer_classes'),
+    ('GET', '/ratings', 'get_ratings'),
+    ('POST', '/ratings', 'submit_rating'),
+    ('PUT', '/ratings/{trainerId}', 'submit_rating'),
+]
+
+COMPILED_ROUTES = [(method, template, _compile(template), name) for method, template, name in ROUTES]
+
+# Handlers that build presigned URLs need the emulator's own base URL
+NEEDS_BASE_URL = {'presigned_url', 'download_url', 'start_multipart', 'presign_parts'}
+
+
+def match_route(method, path):
+    """Return (template, handler name, path params) for a request, or None"""
+    for route_method, template, regex, name in COMPILED_ROUTES:
+        if route_method != method:
+            continue
+        match = regex.match(path)
+        if match:
+            return template, name, {k: unquote(v) for k, v in match.groupdict().items()}
+    return None
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many simulated users connecting at the same instant must not overflow the listen backlog (default 5)
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'GrippedEmulator/1.0'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def do_HEAD(self):
+        self._dispatch('HEAD')
+
+    def _dispatch(self, method):
+        emulator = self.server.emulator
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+
+        if parts.path.startswith('/_s3/'):
+            emulator.before_request(method, 's3')
+            return self._s3(method, unquote(parts.path[len('/_s3/'):]), params, raw)
+
+        route = match_route(method, parts.path)
+        if not route:
+            return self._send(404, {'error': f'No route for {method} {parts.path}'})
+        template, name, path_params = route
+        container, headers = emulator.before_request(method, template)
+        try:
+            status, payload = self._handle(emulator, name, params, raw, path_params)
+        finally:
+            emulator.after_request(container)
+        self._send(status, payload, headers)
+
+    def _handle(self, emulator, name, params, raw, path_params):
+        user = _user_from(self.headers.get('Authorization'))
+        if not user:
+            return 401, {'message': 'Unauthorized'}
+        try:
+            body = emulator.codec.loads(raw) if raw else None
+        except ValueError:
+            return 400, {'error': 'Invalid JSON body'}
+
+        handler = getattr(emulator.state, name)
+        if name in NEEDS_BASE_URL:
+            path_params['base_url'] = emulator.base_url
+        try:
+            return handler(user, params, body, **path_params)
+        except ApiError as e:
+            return e.status, {'error': e.message}
+
+    def _s3(self, method, key, params, raw):
+        state = self.server.emulator.state
+        issued = int(params.get('X-Amz-Date', 0))
+        if issued and time.time() > issued + int(params.get('X-Amz-Expires', PRESIGNED_EXPIRES)):
+            return self._send_raw(403, b'<Error><Code>AccessDenied</Code><Message>Request has expired</Message></Error>',
+                                  'application/xml')
+        emulator = self.server.emulator
+        if emulator.s3_bandwidth and method in ('PUT', 'GET'):
+            # Per-request transfer limit, like a single TCP stream to S3
+            size = len(raw) if method == 'PUT' else len(state.objects.get(key, {}).get('body', b''))
+            time.sleep(size / emulator.s3_bandwidth)
+        if method == 'PUT' and 'uploadId' in params:
+            upload = state.multipart.get(params['uploadId'])
+            if not upload or upload['key'] != key:
+                return self._send_raw(404, b'<Error><Code>NoSuchUpload</Code></Error>', 'application/xml')
+            etag = hashlib.md5(raw).hexdigest()
+            with state.lock:
+                upload['parts'][int(params.get('partNumber', 0))] = {'body': raw, 'etag': etag}
+            return self._send_raw(200, b'', 'application/xml', {'ETag': f'"{etag}"'})
+        if method == 'PUT':
+            etag = f'"{hashlib.md5(raw).hexdigest()}"'
+            with state.lock:
+                state.objects[key] = {'body': raw, 'etag': etag,
+                                      'contentType': self.headers.get('Content-Type', 'binary/octet-stream'),
+                                      'lastModified': time.time()}
+            return self._send_raw(200, b'', 'application/xml', {'ETag': etag})
+        obj = state.objects.get(key)
+        if not obj:
+            return self._send_raw(404, b'<Error><Code>NoSuchKey</Code></Error>', 'application/xml')
+        headers = {'ETag': obj['etag'], 'Accept-Ranges': 'bytes'}
+        if self.headers.get('If-None-Match') in (obj['etag'], obj['etag'].strip('"')):
+            return self._send_raw(304, b'', obj['contentType'], headers)
+        if method == 'HEAD':
+            return self._send_raw(200, b'', obj['contentType'], headers, length=len(obj['body']))
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if match:
+            size = len(obj['body'])
+            first = int(match.group(1))
+            last = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            if first >= size or last < first:
+                return self._send_raw(416, b'<Error><Code>InvalidRange</Code></Error>', 'application/xml',
+                                      {'Content-Range': f'bytes */{size}'})
+            headers['Content-Range'] = f'bytes {first}-{last}/{size}'
+            return self._send_raw(206, obj['body'][first:last + 1], obj['contentType'], headers)
+        return self._send_raw(200, obj['body'], obj['contentType'], headers)
+
+    def _send(self, status, payload, headers=None):
+        body = self.server.emulator.codec.dumps(payload)
+        self._send_raw(status, body, 'application/json', headers)
+
+    def _send_raw(self, status, body, content_type, headers=None, length=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body) if length is None else length))
+        self.send_header('x-amzn-RequestId', str(uuid.uuid4()))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+def _user_from(authorization):
+    if not authorization or not authorization.startswith('Bearer '):
+        return None
+    token = authorization[len('Bearer '):]
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get('sub')
+    except (IndexError, ValueError):
+        return None
+
+
+def routable_address():
+    """This host's address on the interface that reaches other hosts (no packet is sent)"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect(('192.0.2.1', 9))
+        return probe.getsockname()[0]
+    except OSError:
+        return socket.gethostname()
+    finally:
+        probe.close()
+
+
+class Emulator:
+    """Threaded HTTP server hosting EmulatorState on a local port
+
+    `latency` adds a fixed service time (seconds) to every request and
+    `endpoint_latency` overrides it per endpoint template. pause() stalls all
+    requests for a while, which is handy for checking that measurements do
+    not hide stalls.
+
+    `cold_start` simulates Lambda cold starts: each endpoint keeps a pool of
+    warm containers, one request per container at a time, and a container
+    idle for longer than `idle_timeout` seconds is reclaimed. A request that
+    finds no idle warm container pays `cold_start` extra seconds and carries
+    an 'x-amzn-Init-Duration' header (milliseconds) in its response.
+
+    `s3_bandwidth` (bytes/s) caps how fast each single S3 PUT or GET
+    transfers, the way one TCP stream to S3 is capped in practice.
+
+    `codec` (see gripped_sdk.codec) parses request bodies and encodes
+    responses.
+
+    base_url (and every presigned URL) names `advertise_host`. By default
+    that is `host`, or this host's routable address when `host` is a
+    wildcard such as '0.0.0.0', so clients on other hosts can reach it.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, endpoint_latency=None, state=None,
+                 cold_start=0.0, idle_timeout=300.0, s3_bandwidth=None, codec='auto', advertise_host=None):
+        self.state = state or EmulatorState()
+        self.codec = get_codec(codec, default=str) if isinstance(codec, str) else codec
+        self.s3_bandwidth = s3_bandwidth
+        self.latency = latency
+        self.endpoint_latency = dict(endpoint_latency or {})
+        self.cold_start = cold_start
+        self.idle_timeout = idle_timeout
+        self.cold_starts = 0
+        self._containers = {}
+        self.paused_until = 0.0
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self.server = _Server((host, port), _Handler)
+        self.server.emulator = self
+        self._thread = None
+        if advertise_host is None:
+            advertise_host = routable_address() if host in ('', '0.0.0.0', '::') else host
+        self.advertise_host = advertise_host
+
+    @property
+    def base_url(self):
+        port = self.server.server_address[1]
+        host = f'[{self.advertise_host}]' if ':' in self.advertise_host else self.advertise_host
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='gripped-emulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def pause(self, seconds):
+        """Stall every request that arrives in the next `seconds`"""
+        self.paused_until = time.monotonic() + seconds
+
+    def before_request(self, method, endpoint):
+        """Apply simulated delays; returns (container, extra response headers)"""
+        with self._count_lock:
+            self.request_count += 1
+        container, headers = None, {}
+        delay = max(0.0, self.paused_until - time.monotonic())
+        delay += self.endpoint_latency.get(endpoint, self.latency)
+        if self.cold_start > 0 and endpoint != 's3':
+            container, cold = self._acquire_container(endpoint)
+            if cold:
+                delay += self.cold_start
+                headers['x-amzn-Init-Duration'] = f'{self.cold_start * 1000.0:.1f}'
+        if delay > 0:
+            time.sleep(delay)
+        return container, headers
+
+    def after_request(self, container):
+        if container is not None:
+            with self._count_lock:
+                container['busy'] = False
+                container['lastUsed'] = time.monotonic()
+
+    def reclaim_containers(self):
+        """Drop every warm container so the next request to each endpoint is cold"""
+        with self._count_lock:
+            self._containers.clear()
+
+    def _acquire_container(self, endpoint):
+        now = time.monotonic()
+        with self._count_lock:
+            pool = self._containers.setdefault(endpoint, [])
+            pool[:] = [c for c in pool if c['busy'] or now - c['lastUsed'] <= self.idle_timeout]
+            for container in pool:
+                if not container['busy']:
+                    container['busy'] = True
+                    return container, False
+            container = {'busy': True, 'lastUsed': now}
+            pool.append(container)
+            self.cold_starts += 1
+            return container, True
+
+
+def main():
+    """Run the emulator in the foreground with some seeded classes"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the local Gripped API emulator')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--latency', type=float, default=0.0, help='added service time in seconds')
+    parser.add_argument('--trainers', type=int, default=10)
+    parser.add_argument('--sessions-per-trainer', type=int, default=5)
+    parser.add_argument('--cold-start', type=float, default=0.0, help='simulated Lambda cold start in seconds')
+    parser.add_argument('--idle-timeout', type=float, default=300.0, help='seconds before a warm container is reclaimed')
+    args = parser.parse_args()
+
+    emulator = Emulator(port=args.port, latency=args.latency, cold_start=args.cold_start,
+                        idle_timeout=args.idle_timeout)
+    sessions = emulator.state.seed(args.trainers, args.sessions_per_trainer)
+    print(f"🚀 Gripped emulator listening on {emulator.base_url}")
+    print(f"🌱 Seeded {args.trainers} trainers and {len(sessions)} sessions")
+    try:
+        emulator.server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Emulator stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Micro-batching of enroll calls into POST /classes/batch-enroll
+A student who picks several sessions in a row sends one
+POST /classes/{sessionId}/enroll per session, although
+/classes/batch-enroll takes a list. EnrollmentBatcher queues enroll
+requests and sends them as one batch-enroll call. A batch is sent when
+`max_batch` sessions are waiting, or `max_wait` seconds after the first
+one arrived. Each caller gets a Future that resolves to its own
+session's result. This means fewer requests per enrollment, and the
+server's conflict checks run once per batch.
+
+Sessions are sent in submission order, so a session submitted twice
+gets the server's answer for a repeat enrollment ('Already enrolled').
+Batch-enroll acts for the client's user, so use one batcher per student
+client.
+
+Usage:
+    with EnrollmentBatcher(client, max_batch=10, max_wait=0.05) as batcher:
+        futures = [batcher.submit(session_id) for session_id in picked]
+        results = [f.result() for f in futures]    # {'sessionId', 'success', 'enrollment' | 'error'}
+    print(batcher.summary())
+
+    python -m gripped_sdk.enrollbatch --students 20 --picks 6 --latency 0.02
+"""
+
+import argparse
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from .client import GrippedClient
+
+DEFAULT_MAX_BATCH = 10
+DEFAULT_MAX_WAIT = 0.02
+_STOP = object()
+
+
+class EnrollmentBatcher:
+    """Collects enroll requests from any number of threads and sends them in batch-enroll calls"""
+
+    def __init__(self, client, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT):
+        if max_batch < 1:
+            raise ValueError('max_batch must be at least 1')
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stats = {'enrollments': 0, 'succeeded': 0, 'failed': 0, 'batches': 0, 'largestBatch': 0,
+                      'requestsSaved': 0}
+        self.worker = threading.Thread(target=self._run, name='enroll-batcher', daemon=True)
+        self.worker.start()
+
+    def submit(self, session_id):
+        """A Future for the enrollment result of `session_id`
+
+        It resolves to {'sessionId', 'success', 'enrollment'} or
+        {'sessionId', 'success': False, 'error'}, or raises the exception
+        (requests.RequestException, an undecodable body, ...) that failed
+        the whole batch.
+        """
+        future = Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError('EnrollmentBatcher is closed')
+            if not self.worker.is_alive():
+                raise RuntimeError('EnrollmentBatcher worker has stopped')
+            self.queue.put((session_id, future))
+        return future
+
+    def enroll(self, session_id, timeout=None):
+        """submit() and wait: the result dict for one session"""
+        return self.submit(session_id).result(timeout)
+
+    def close(self):
+        """Send whatever is still queued, then stop the worker"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.put(_STOP)
+        self.worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Whatever stopped the worker, nobody may wait forever on work it will never send
+            with self.lock:
+                self.closed = True
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP and not item[1].done():
+                    item[1].set_exception(RuntimeError('EnrollmentBatcher worker has stopped'))
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._send(batch)
+            except Exception as e:
+                # A failed call or an unusable body fails this batch, not the worker
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._record(batch, [])
+
+    def _send(self, batch):
+        session_ids = [session_id for session_id, _ in batch]
+        response = self.client.batch_enroll(session_ids)
+        if response.status_code == 200:
+            body = response.json()
+            results = body.get('results') if isinstance(body, dict) else None
+            if not isinstance(results, list) or not all(isinstance(r, dict) for r in results):
+                raise ValueError(f'batch-enroll returned an unexpected body: {response.text[:200]}')
+        else:
+            error = f'batch-enroll failed: {response.status_code} {response.text[:200]}'
+            results = [{'sessionId': session_id, 'success': False, 'error': error} for session_id in session_ids]
+        if [r.get('sessionId') for r in results] != session_ids:
+            # Not one result per request in order: match by session ID instead
+            by_session = {r.get('sessionId'): r for r in results}
+            results = [by_session.get(session_id) or {'sessionId': session_id, 'success': False,
+                                                      'error': 'No result returned for this session'}
+                       for session_id in session_ids]
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        self._record(batch, results)
+
+    def _record(self, batch, results):
+        with self.lock:
+            self.stats['enrollments'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['largestBatch'] = max(self.stats['largestBatch'], len(batch))
+            self.stats['requestsSaved'] += len(batch) - 1
+            succeeded = sum(1 for r in results if r.get('success'))
+            self.stats['succeeded'] += succeeded
+            self.stats['failed'] += len(batch) - succeeded
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        stats['meanBatchSize'] = round(stats['enrollments'] / stats['batches'], 2) if stats['batches'] else 0.0
+        return stats
+
+
+def main():
+    from .emulator import Emulator, make_token
+    from .workloads import emulator_context
+
+    parser = argparse.ArgumentParser(description='Compare one enroll call per session with micro-batched enrolls')
+    parser.add_argument('--students', type=int, default=20)
+    parser.add_argument('--picks', type=int, default=6, help='sessions each student enrolls in')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--max-wait', type=float, default=DEFAULT_MAX_WAIT, help='seconds to wait for more')
+    parser.add_argument('--latency', type=float, default=0.02, help='emulator service time in seconds')
+    args = parser.parse_args()
+
+    emulator = Emulator(latency=args.latency).start()
+    context = emulator_context(emulator, trainers=40, sessions_per_trainer=5, capacity=100)
+    try:
+        for batched in (False, True):
+            sent, outcomes = [0], {'ok': 0, 'failed': 0}
+            lock = threading.Lock()
+
+            def count(event):
+                with lock:
+                    sent[0] += 1
+
+            def student(index):
+                rng = random.Random(index)
+                picks = rng.sample(context['sessionIds'], args.picks)
+                token = make_token(f"{'batched' if batched else 'single'}-student-{index}")
+                with GrippedClient(token, base_url=emulator.base_url) as client:
+                    client.add_hook(count)
+                    if batched:
+                        # The student taps several sessions in quick succession, each from its own callback
+                        with EnrollmentBatcher(client, args.max_batch, args.max_wait) as batcher:
+                            futures = []
+                            for session_id in picks:
+                                futures.append(batcher.submit(session_id))
+                                time.sleep(rng.uniform(0, args.max_wait / 4))
+                            ok = [f.result()['success'] for f in futures]
+                    else:
+                        ok = [client.enroll(session_id).status_code == 200 for session_id in picks]
+                with lock:
+                    outcomes['ok'] += sum(ok)
+                    outcomes['failed'] += len(ok) - sum(ok)
+
+            started = time.perf_counter()
+            threads = [threading.Thread(target=student, args=(i,)) for i in range(args.students)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            enrollments = args.students * args.picks
+            print(f"{'📦 batched' if batched else '✉️  one by one'}: {enrollments} enrollments "
+                  f"({outcomes['ok']} ok, {outcomes['failed']} rejected) in {sent[0]} requests, "
+                  f"{sent[0] / enrollments:.2f} requests per enrollment, {elapsed:.2f}s")
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+Parallel segmented export of the Gripped DynamoDB tables to Parquet
+Scans a table with Segment/TotalSegments, one worker thread per segment,
+and streams each page into Parquet row groups. Memory stays bounded by
+`row_group_rows` items per worker. Items are converted straight from the
+low-level AttributeValue form: numbers become int or float (never
+Decimal), and maps, lists and sets become JSON text columns.
+
+Each segment writes its own files, '<table>/segment-0003-part-0000.parquet'.
+After a file is closed, the segment's checkpoint (the Scan's
+LastEvaluatedKey at that point) is saved under '<table>/_checkpoints/'.
+Running the export again resumes every unfinished segment from its
+checkpoint. Files written after the last checkpoint are replaced, so no
+rows are duplicated. A page whose columns no longer fit the open file's
+schema starts a new part file. Read throughput and consumed read capacity
+are reported per segment.
+
+Needs pyarrow (imported on first use). Point --endpoint-url at DynamoDB
+Local to export a local copy.
+
+Usage:
+    python -m gripped_sdk.export --tables class,students --segments 8 --out exports/
+    python -m gripped_sdk.export --tables profiles --segments 4 --endpoint-url http://localhost:8000 --out exports/
+"""
+
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import CLASS_TABLE, MESSAGES_TABLE, REGION, STUDENTS_TABLE, USER_PROFILES_TABLE
+from .optional import require_pyarrow
+
+TABLES = {
+    'class': CLASS_TABLE,
+    'students': STUDENTS_TABLE,
+    'messages': MESSAGES_TABLE,
+    'profiles': USER_PROFILES_TABLE,
+}
+
+
+def _number(text):
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+def plain_value(value):
+    """A low-level AttributeValue ({'N': '12'}, {'M': {...}}, ...) as plain Python, numbers as int/float"""
+    (kind, data), = value.items()
+    if kind == 'S':
+        return data
+    if kind == 'N':
+        return _number(data)
+    if kind == 'BOOL':
+        return data
+    if kind == 'NULL':
+        return None
+    if kind == 'M':
+        return {k: plain_value(v) for k, v in data.items()}
+    if kind == 'L':
+        return [plain_value(v) for v in data]
+    if kind == 'SS':
+        return sorted(data)
+    if kind == 'NS':
+        return sorted(_number(n) for n in data)
+    if kind == 'B':
+        return data
+    if kind == 'BS':
+        return sorted(data)
+    raise ValueError(f'Unknown DynamoDB attribute type {kind}')
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def flatten_item(item):
+    """One exported row: scalars as-is, nested maps/lists/sets as JSON text"""
+    row = {}
+    for name, value in item.items():
+        value = plain_value(value)
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, separators=(',', ':'), sort_keys=True, default=_json_default)
+        row[name] = value
+    return row
+
+
+def rows_to_table(rows):
+    """Arrow table over the union of the rows' attributes
+
+    DynamoDB does not type attributes per table, so a column whose values
+    mix types (say a number in one item, a string in the next) is stored as
+    JSON text rather than failing the page.
+    """
+    pa = require_pyarrow()
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    arrays = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else json.dumps(v, default=_json_default) for v in values],
+                                   type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def _conform(table, schema):
+    """`table` cast to `schema` (missing columns as nulls), or None if it cannot be"""
+    pa = require_pyarrow()
+    if not set(table.column_names) <= set(schema.names):
+        return None
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(len(table), field.type))
+            continue
+        column = table[field.name]
+        if column.type != field.type:
+            try:
+                column = column.cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                return None
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class _SegmentWriter:
+    """Part files of one segment; a part is only checkpointed once it is closed"""
+
+    def __init__(self, directory, segment, part):
+        self.directory = directory
+        self.segment = segment
+        self.part = part
+        self.writer = None
+        self.rows_in_file = 0
+
+    def path(self, part):
+        return os.path.join(self.directory, f'segment-{self.segment:04d}-part-{part:04d}.parquet')
+
+    def write(self, table):
+        """Append `table` as a row group; returns True if an open file had to be closed first"""
+        rotated = False
+        if self.writer is not None:
+            conformed = _conform(table, self.writer.schema)
+            if conformed is None:
+                self.close()
+                rotated = True
+            else:
+                table = conformed
+        if self.writer is None:
+            self.writer = require_pyarrow().parquet.ParquetWriter(self.path(self.part), table.schema, compression='zstd')
+        self.writer.write_table(table)
+        self.rows_in_file += len(table)
+        return rotated
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.part += 1
+            self.rows_in_file = 0
+
+
+class TableExporter:
+    """Exports one DynamoDB table with a parallel segmented Scan
+
+    `client` is a low-level boto3 DynamoDB client (thread-safe, unlike
+    resources). Each segment keeps at most `row_group_rows` items in memory
+    and closes its current file, saving a checkpoint, after `file_rows`.
+    """
+
+    def __init__(self, client, table_name, out_dir, segments=4, max_workers=None, row_group_rows=10000,
+                 file_rows=100000, page_limit=None, consistent_read=False):
+        self.client = client
+        self.table_name = table_name
+        self.directory = out_dir
+        self.checkpoint_dir = os.path.join(out_dir, '_checkpoints')
+        self.segments = segments
+        self.max_workers = max_workers or segments
+        self.row_group_rows = row_group_rows
+        self.file_rows = file_rows
+        self.page_limit = page_limit
+        self.consistent_read = consistent_read
+        self.lock = threading.Lock()
+        self.segment_stats = {}
+
+    # Checkpoints
+    def _checkpoint_path(self, segment):
+        return os.path.join(self.checkpoint_dir, f'segment-{segment:04d}.json')
+
+    def _load_checkpoint(self, segment):
+        path = self._checkpoint_path(segment)
+        if not os.path.exists(path):
+            return {'segment': segment, 'totalSegments': self.segments, 'lastKey': None, 'parts': 0,
+                    'items': 0, 'done': False}
+        with open(path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('totalSegments') != self.segments:
+            raise ValueError(f"{self.table_name} was checkpointed with {checkpoint.get('totalSegments')} "
+                             f"segments; rerun with --segments {checkpoint.get('totalSegments')} or --fresh")
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint):
+        path = self._checkpoint_path(checkpoint['segment'])
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, path)
+
+    def _discard_unfinished_parts(self, writer):
+        """Remove part files written after the checkpoint; their rows will be scanned again"""
+        part = writer.part
+        while os.path.exists(writer.path(part)):
+            os.remove(writer.path(part))
+            part += 1
+
+    # Scan
+    def _export_segment(self, segment):
+        checkpoint = self._load_checkpoint(segment)
+        stats = {'segment': segment, 'items': 0, 'scanned': 0, 'pages': 0, 'capacityUnits': 0.0,
+                 'resumed': checkpoint['lastKey'] is not None or checkpoint['done'], 'seconds': 0.0}
+        if checkpoint['done']:
+            with self.lock:
+                self.segment_stats[segment] = stats
+            return stats
+
+        started = time.perf_counter()
+        writer = _SegmentWriter(self.directory, segment, checkpoint['parts'])
+        self._discard_unfinished_parts(writer)
+        buffer = []
+        # LastEvaluatedKey at the end of what the open file holds / of what is buffered
+        written_key, buffered_key = checkpoint['lastKey'], checkpoint['lastKey']
+        written_items = checkpoint['items']
+
+        def flush():
+            nonlocal buffer, written_key, written_items
+            if not buffer:
+                return
+            rotated_at = (written_key, written_items)
+            if writer.write(rows_to_table(buffer)):
+                # The previous file closed at the last flush boundary; checkpoint it
+                self._save_checkpoint(dict(checkpoint, lastKey=rotated_at[0], parts=writer.part,
+                                           items=rotated_at[1]))
+            written_items += len(buffer)
+            written_key = buffered_key
+            buffer = []
+
+        kwargs = {'TableName': self.table_name, 'Segment': segment, 'TotalSegments': self.segments,
+                  'ReturnConsumedCapacity': 'TOTAL', 'ConsistentRead': self.consistent_read}
+        if self.page_limit:
+            kwargs['Limit'] = self.page_limit
+        start_key = checkpoint['lastKey']
+        try:
+            while True:
+                if start_key:
+                    kwargs['ExclusiveStartKey'] = start_key
+                page = self.client.scan(**kwargs)
+                stats['pages'] += 1
+                stats['scanned'] += page.get('ScannedCount', 0)
+                stats['capacityUnits'] += (page.get('ConsumedCapacity') or {}).get('CapacityUnits', 0.0)
+                items = page.get('Items', [])
+                stats['items'] += len(items)
+                buffer.extend(flatten_item(item) for item in items)
+                start_key = page.get('LastEvaluatedKey')
+                buffered_key = start_key
+                if len(buffer) >= self.row_group_rows or not start_key:
+                    flush()
+                if writer.rows_in_file >= self.file_rows or not start_key:
+                    writer.close()
+                    self._save_checkpoint(dict(checkpoint, lastKey=written_key, parts=writer.part,
+                                               items=written_items, done=not start_key))
+                if not start_key:
+                    break
+        finally:
+            # An interrupted segment leaves its open file unfinished; the next run replaces it
+            if writer.writer is not None:
+                writer.writer.close()
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        with self.lock:
+            self.segment_stats[segment] = stats
+        return stats
+
+    def run(self):
+        """Export every segment (resuming from checkpoints); returns the table summary"""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            segments = list(pool.map(self._export_segment, range(self.segments)))
+        elapsed = time.perf_counter() - started
+        items = sum(s['items'] for s in segments)
+        capacity = sum(s['capacityUnits'] for s in segments)
+        files = sorted(name for name in os.listdir(self.directory) if name.endswith('.parquet'))
+        return {
+            'table': self.table_name,
+            'segments': segments,
+            'items': items,
+            'scanned': sum(s['scanned'] for s in segments),
+            'pages': sum(s['pages'] for s in segments),
+            'resumedSegments': sum(1 for s in segments if s['resumed']),
+            'files': len(files),
+            'bytes': sum(os.path.getsize(os.path.join(self.directory, name)) for name in files),
+            'capacityUnits': round(capacity, 1),
+            'seconds': round(elapsed, 3),
+            'itemsPerSecond': round(items / elapsed, 1) if elapsed else 0.0,
+            'capacityUnitsPerSecond': round(capacity / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def format_report(summary):
+    lines = [f"📤 {summary['table']}: {summary['items']} items ({summary['scanned']} scanned, "
+             f"{summary['pages']} pages) in {summary['seconds']:.2f}s = {summary['itemsPerSecond']:.0f} items/s, "
+             f"{summary['capacityUnits']:.1f} RCU ({summary['capacityUnitsPerSecond']:.1f} RCU/s), "
+             f"{summary['files']} files / {summary['bytes'] / 1e6:.2f} MB"]
+    if summary['resumedSegments']:
+        lines.append(f"   ↪️  {summary['resumedSegments']} segment(s) resumed from checkpoints")
+    for segment in summary['segments']:
+        lines.append(f"   segment {segment['segment']:>3}: {segment['items']:>8} items {segment['pages']:>5} pages "
+                     f"{segment['capacityUnits']:>8.1f} RCU {segment['seconds']:>7.2f}s")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export Gripped DynamoDB tables to Parquet with a parallel Scan')
+    parser.add_argument('--tables', default=','.join(TABLES), help=f"comma-separated: {', '.join(TABLES)}")
+    parser.add_argument('--out', default='exports')
+    parser.add_argument('--segments', type=int, default=4)
+    parser.add_argument('--workers', type=int, help='threads per table (default: one per segment)')
+    parser.add_argument('--row-group-rows', type=int, default=10000)
+    parser.add_argument('--file-rows', type=int, default=100000, help='rows per file, i.e. checkpoint interval')
+    parser.add_argument('--page-limit', type=int, help='Scan Limit per page')
+    parser.add_argument('--consistent-read', action='store_true')
+    parser.add_argument('--fresh', action='store_true', help='ignore and delete earlier checkpoints and files')
+    parser.add_argument('--endpoint-url', help='e.g. DynamoDB Local at http://localhost:8000')
+    parser.add_argument('--region', default=REGION)
+    args = parser.parse_args()
+
+    import boto3
+    from botocore.config import Config
+
+    client = boto3.client('dynamodb', region_name=args.region, endpoint_url=args.endpoint_url,
+                          config=Config(retries={'mode': 'adaptive', 'max_attempts': 10},
+                                        max_pool_connections=max(10, args.segments)))
+    for label in args.tables.split(','):
+        table_name = TABLES.get(label, label)
+        directory = os.path.join(args.out, label)
+        if args.fresh and os.path.isdir(directory):
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    if name.endswith(('.parquet', '.json')):
+                        os.remove(os.path.join(root, name))
+        os.makedirs(directory, exist_ok=True)
+        exporter = TableExporter(client, table_name, directory, args.segments, args.workers, args.row_group_rows,
+                                 args.file_rows, args.page_limit, args.consistent_read)
+        print(format_report(exporter.run()))
+
+
+if __name__ == '__main__':
+    main()
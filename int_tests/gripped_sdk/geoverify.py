@@ -0,0 +1,266 @@
+"""
+Vectorized distance verification of /classes/search responses
+/classes/search reports distanceMiles per result but nothing checks it.
+verify_search() recomputes every distance in one NumPy haversine pass from
+the search origin and flags results that are:
+- outside radiusMiles,
+- out of distance order,
+- reporting a distance off by more than a tolerance,
+- unknown to the dataset, or duplicated.
+Results whose distance cannot be recomputed (no index and no coordinates
+on the result) are listed as unverifiable rather than flagged.
+Given a SessionIndex of the sessions that should be searchable, it also
+lists sessions inside the radius that the response left out. The index
+holds the coordinates as radians, precomputed once, so each check is a
+few array operations, cheap enough to run as a continuous canary.
+
+Needs NumPy (imported on first use).
+
+Usage:
+    index = SessionIndex.from_items(emulator.state.sessions.values())
+    result = verify_search(response.content, index)
+    print(format_report(result))
+
+    python -m gripped_sdk.geoverify --emulator --trainers 500 --radii 5,15,30,60 --repeat 20
+    python -m gripped_sdk.geoverify --token $ID_TOKEN --sessions exports/class --zips 75454 --radii 30
+"""
+
+import argparse
+import time
+
+from .client import GrippedClient
+from .codec import default_codec
+from .emulator import EARTH_RADIUS_MILES
+from .optional import require_numpy, require_pyarrow
+
+# Reported and recomputed distances may differ by rounding (the API rounds to 0.01 mi)
+DEFAULT_TOLERANCE_MILES = 0.02
+
+
+def haversine_miles(origin_lat, origin_lon, lat_rad, lon_rad, cos_lat=None):
+    """Distances in miles from one point (degrees) to arrays of points (radians)"""
+    np = require_numpy()
+    phi = np.radians(origin_lat)
+    lam = np.radians(origin_lon)
+    if cos_lat is None:
+        cos_lat = np.cos(lat_rad)
+    a = np.sin((lat_rad - phi) / 2) ** 2 + np.cos(phi) * cos_lat * np.sin((lon_rad - lam) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SessionIndex:
+    """The searchable sessions: IDs sorted for vectorized lookup, coordinates in radians"""
+
+    def __init__(self, session_ids, latitudes, longitudes):
+        np = require_numpy()
+        ids = np.asarray(session_ids, dtype=np.str_)
+        order = np.argsort(ids, kind='stable')
+        self.ids = ids[order]
+        self.lat = np.radians(np.asarray(latitudes, dtype=np.float64)[order])
+        self.lon = np.radians(np.asarray(longitudes, dtype=np.float64)[order])
+        self.cos_lat = np.cos(self.lat)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_items(cls, items, active_only=True):
+        """From session items (emulator state, DynamoDB items, list_classes output)"""
+        rows = [(i['sessionId'], float(i['latitude']), float(i['longitude'])) for i in items
+                if i.get('latitude') is not None and (not active_only or i.get('status', 'ACTIVE') == 'ACTIVE')]
+        return cls([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows])
+
+    @classmethod
+    def from_parquet(cls, path, active_only=True):
+        """From a ClassTable export written by gripped_sdk.export (file or directory)"""
+        pa = require_pyarrow()
+        import pyarrow.compute
+        import pyarrow.dataset
+        columns = ['sessionId', 'latitude', 'longitude'] + (['status'] if active_only else [])
+        table = pyarrow.dataset.dataset(path, format='parquet').to_table(columns=columns)
+        if active_only:
+            table = table.filter(pyarrow.compute.equal(table['status'], 'ACTIVE'))
+        table = table.filter(pyarrow.compute.is_valid(table['latitude']))
+        return cls(table['sessionId'].to_numpy(zero_copy_only=False),
+                   table['latitude'].cast(pa.float64()).to_numpy(),
+                   table['longitude'].cast(pa.float64()).to_numpy())
+
+    def lookup(self, session_ids):
+        """Positions of `session_ids` in the index and a mask of which were found"""
+        np = require_numpy()
+        wanted = np.asarray(session_ids, dtype=np.str_)
+        if not len(self.ids):
+            return np.zeros(len(wanted), dtype=np.intp), np.zeros(len(wanted), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.ids, wanted), len(self.ids) - 1)
+        return positions, self.ids[positions] == wanted
+
+
+def _issue(session_id, rank, reported, computed):
+    return {'sessionId': str(session_id), 'rank': int(rank),
+            'reported': None if reported != reported else round(float(reported), 4),
+            'computed': None if computed != computed else round(float(computed), 4)}
+
+
+def _decreasing(values, rows, tolerance=0.0):
+    """Positions among `rows` where `values` drops by more than `tolerance` from the previous row"""
+    np = require_numpy()
+    return rows[1:][np.diff(values[rows]) < -tolerance]
+
+
+def verify_search(response, index=None, tolerance=DEFAULT_TOLERANCE_MILES, origin=None, radius=None,
+                  check_missing=True):
+    """Check one search response; returns a result dict with ok and the flagged results
+
+    `response` is the raw body, its parsed dict, or a models.SearchPage.
+    `origin` (lat, lon) and `radius` default to the response's
+    searchLocation and radiusMiles. Without an index, distances are
+    recomputed from each result's own latitude/longitude and the missing
+    and unknown checks are skipped. Set check_missing=False for searches
+    with a query or date filter, which legitimately leave sessions out.
+    """
+    np = require_numpy()
+    started = time.perf_counter()
+    if isinstance(response, (bytes, bytearray, str)):
+        response = default_codec().loads(response)
+    if not isinstance(response, dict):
+        response = {'results': [{'sessionId': r.session_id, 'distanceMiles': r.distance_miles,
+                                 'latitude': r.latitude, 'longitude': r.longitude} for r in response.results],
+                    'searchLocation': response.search_location, 'radiusMiles': response.radius_miles}
+    results = response.get('results') or []
+    location = response.get('searchLocation') or {}
+    origin_lat, origin_lon = origin or (location.get('latitude'), location.get('longitude'))
+    radius = float(radius if radius is not None else response.get('radiusMiles'))
+
+    ids = np.array([r.get('sessionId') or '' for r in results], dtype=np.str_)
+    reported = np.array([r.get('distanceMiles') for r in results], dtype=np.float64)
+    if index is not None:
+        positions, known = index.lookup(ids)
+        computed = np.full(len(ids), np.nan)
+        if len(index):
+            all_distances = haversine_miles(origin_lat, origin_lon, index.lat, index.lon, index.cos_lat)
+            computed[known] = all_distances[positions[known]]
+    else:
+        known = np.ones(len(ids), dtype=bool)
+        lat = np.radians(np.array([r.get('latitude') for r in results], dtype=np.float64))
+        lon = np.radians(np.array([r.get('longitude') for r in results], dtype=np.float64))
+        computed = haversine_miles(origin_lat, origin_lon, lat, lon)
+
+    # Without coordinates there is nothing to check a result against
+    located = np.isfinite(computed)
+    unverifiable = np.flatnonzero(known & ~located)
+    error = np.abs(reported - computed)
+    outside = np.flatnonzero(located & (computed > radius + tolerance))
+    # A located result without a reported distance is a mismatch too
+    mismatch = np.flatnonzero(located & ~(error <= tolerance))
+    # Ordered by reported distance, and the true distances must not decrease by more than the tolerance
+    out_of_order = np.union1d(_decreasing(reported, np.flatnonzero(np.isfinite(reported))),
+                              _decreasing(computed, np.flatnonzero(located), tolerance))
+    verified_error = error[located & np.isfinite(error)]
+    unknown = np.flatnonzero(~known) if index is not None else np.empty(0, dtype=np.intp)
+    unique, counts = np.unique(ids, return_counts=True)
+    duplicates = [str(i) for i in unique[counts > 1]]
+
+    missing = []
+    if index is not None and check_missing and len(index):
+        returned = np.zeros(len(index), dtype=bool)
+        returned[positions[known]] = True
+        absent = (all_distances <= radius - tolerance) & ~returned
+        missing = [{'sessionId': str(index.ids[i]), 'computed': round(float(all_distances[i]), 4)}
+                   for i in np.flatnonzero(absent)]
+
+    def issues(rows):
+        return [_issue(ids[i], i, reported[i], computed[i]) for i in rows]
+
+    result = {
+        'results': len(results),
+        'radiusMiles': radius,
+        'outsideRadius': issues(outside),
+        'outOfOrder': issues(out_of_order),
+        'distanceMismatch': issues(mismatch),
+        'unknown': [str(ids[i]) for i in unknown],
+        'duplicates': duplicates,
+        'missing': missing,
+        'unverifiable': [str(ids[i]) for i in unverifiable],
+        'maxErrorMiles': round(float(verified_error.max()), 4) if len(verified_error) else 0.0,
+        'indexedSessions': len(index) if index is not None else None,
+        'seconds': time.perf_counter() - started,
+    }
+    result['ok'] = not any(result[k] for k in ('outsideRadius', 'outOfOrder', 'distanceMismatch', 'unknown',
+                                               'duplicates', 'missing'))
+    return result
+
+
+def format_report(result, label=None, limit=5):
+    head = f"{'✅' if result['ok'] else '❌'} {label + ': ' if label else ''}{result['results']} results within " \
+           f"{result['radiusMiles']:g} mi checked in {result['seconds'] * 1000:.1f} ms " \
+           f"(max error {result['maxErrorMiles']} mi)"
+    lines = [head]
+    for kind in ('outsideRadius', 'outOfOrder', 'distanceMismatch'):
+        for issue in result[kind][:limit]:
+            lines.append(f"   {kind}: #{issue['rank']} {issue['sessionId']} reported {issue['reported']} "
+                         f"computed {issue['computed']}")
+    for kind in ('unknown', 'duplicates'):
+        if result[kind]:
+            lines.append(f"   {kind}: {len(result[kind])} ({', '.join(result[kind][:limit])})")
+    if result['missing']:
+        sample = ', '.join(f"{m['sessionId']} @ {m['computed']} mi" for m in result['missing'][:limit])
+        lines.append(f"   missing: {len(result['missing'])} sessions inside the radius ({sample})")
+    if result['unverifiable']:
+        lines.append(f"   ⚠️  unverifiable (no coordinates): {len(result['unverifiable'])} "
+                     f"({', '.join(result['unverifiable'][:limit])})")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify /classes/search distances, radius and ordering')
+    parser.add_argument('--zips', default='75454')
+    parser.add_argument('--radii', default='5,15,30,60')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE_MILES)
+    parser.add_argument('--repeat', type=int, default=1, help='rounds of searches (canary mode)')
+    parser.add_argument('--emulator', action='store_true', help='check a seeded local emulator')
+    parser.add_argument('--trainers', type=int, default=200)
+    parser.add_argument('--sessions', help='ClassTable Parquet export to find missing sessions (live runs)')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    args = parser.parse_args()
+
+    zips = args.zips.split(',')
+    radii = [float(r) for r in args.radii.split(',')]
+    emulator, index = None, None
+    if args.emulator:
+        from .emulator import Emulator, make_token
+        emulator = Emulator().start()
+        emulator.state.seed(trainers=args.trainers, sessions_per_trainer=20, zip_codes=zips, spread_miles=60.0)
+        index = SessionIndex.from_items(emulator.state.sessions.values())
+        base_url, token = emulator.base_url, make_token('search-canary')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+        if args.sessions:
+            index = SessionIndex.from_parquet(args.sessions)
+
+    failures, checks, check_seconds = 0, 0, 0.0
+    try:
+        with GrippedClient(token, base_url=base_url) as client:
+            for round_number in range(args.repeat):
+                for zip_code in zips:
+                    for radius in radii:
+                        response = client.search_classes(zip_code, radius)
+                        response.raise_for_status()
+                        result = verify_search(response.content, index, args.tolerance)
+                        checks += 1
+                        check_seconds += result['seconds']
+                        failures += not result['ok']
+                        if round_number == 0 or not result['ok']:
+                            print(format_report(result, f'{zip_code} r={radius:g}'))
+    finally:
+        if emulator:
+            emulator.stop()
+    indexed = f" against {len(index)} indexed sessions" if index is not None else ''
+    print(f"🧭 {checks} searches verified{indexed}, {failures} failed, "
+          f"{check_seconds / max(1, checks) * 1000:.2f} ms per check")
+
+
+if __name__ == '__main__':
+    main()
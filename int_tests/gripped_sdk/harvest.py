@@ -0,0 +1,370 @@
+"""
+Bulk search harvester with columnar export
+Runs a grid of /classes/search queries (ZIP x radius x date) and moves each
+page of results straight into per-column buffers, so no result dicts outlive
+the page they came in. Buffers are flushed every `batch_rows` rows into
+NumPy columns, and from there into Parquet row groups (pyarrow) or one
+NumPy structured array (.npz). Every row carries the query that found it
+(queryZip, queryRadiusMiles, queryDate, queryRank), and analyze() computes
+distance percentiles, fill rate (currentStudents / maxStudents) and price
+vs capacity per ZIP with vectorized NumPy.
+
+Needs NumPy; Parquet output also needs pyarrow. Both are imported on first
+use.
+
+Usage:
+    python -m gripped_sdk.harvest --emulator --trainers 200 --zips 75454,10001 --radii 10,30,60 --days 7 --out search.parquet
+    python -m gripped_sdk.harvest --token $ID_TOKEN --zips 75454 --radii 30 --out search.npz
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import product
+
+import requests
+
+from .client import GrippedClient
+from .optional import require_numpy, require_pyarrow
+
+# (JSON field, column kind); the query columns are filled in by the harvester
+RESULT_COLUMNS = (
+    ('sessionId', 'string'),
+    ('classId', 'string'),
+    ('trainerId', 'string'),
+    ('classTitle', 'string'),
+    ('zip', 'string'),
+    ('city', 'string'),
+    ('state', 'string'),
+    ('price', 'float'),
+    ('currency', 'string'),
+    ('startDateTime', 'timestamp'),
+    ('endDateTime', 'timestamp'),
+    ('maxStudents', 'int'),
+    ('currentStudents', 'int'),
+    ('latitude', 'float'),
+    ('longitude', 'float'),
+    ('distanceMiles', 'float'),
+)
+QUERY_COLUMNS = (
+    ('queryZip', 'string'),
+    ('queryRadiusMiles', 'float'),
+    ('queryDate', 'string'),
+    ('queryRank', 'int'),
+)
+COLUMNS = RESULT_COLUMNS + QUERY_COLUMNS
+# Missing integers become this in NumPy output (Arrow keeps them null)
+INT_MISSING = -1
+
+
+def _utc_text(value):
+    """ISO-8601 text as naive UTC, which is what numpy.datetime64 parses"""
+    if not value:
+        return 'NaT'
+    if value.endswith('Z'):
+        return value[:-1]
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def to_numpy_column(kind, values):
+    """One buffered column as a NumPy array (strings fixed-width, timestamps datetime64[ms])"""
+    np = require_numpy()
+    if kind == 'float':
+        return np.array(values, dtype=np.float64)
+    if kind == 'int':
+        return np.array([INT_MISSING if v is None else v for v in values], dtype=np.int32)
+    if kind == 'timestamp':
+        return np.array([_utc_text(v) for v in values], dtype='datetime64[ms]')
+    return np.array(['' if v is None else str(v) for v in values], dtype=np.str_)
+
+
+def search_grid(zips, radii, dates=(None,), query=None):
+    """Every combination of ZIP, radius and date as search parameter dicts"""
+    return [{'zipCode': zip_code, 'radiusMiles': radius, 'date': date, 'query': query}
+            for zip_code, radius, date in product(zips, radii, dates)]
+
+
+class ArraySink:
+    """Collects flushed batches; result() is one NumPy structured array"""
+
+    def __init__(self):
+        self.batches = []
+
+    def write(self, columns):
+        self.batches.append(columns)
+
+    def close(self):
+        pass
+
+    def result(self):
+        np = require_numpy()
+        if not self.batches:
+            return np.empty(0, dtype=[(name, np.float64) for name, _ in COLUMNS])
+        merged = {name: np.concatenate([batch[name] for batch in self.batches]) for name, _ in COLUMNS}
+        array = np.empty(len(merged[COLUMNS[0][0]]), dtype=[(name, merged[name].dtype) for name, _ in COLUMNS])
+        for name, column in merged.items():
+            array[name] = column
+        return array
+
+    def save(self, path):
+        require_numpy().savez_compressed(path, results=self.result())
+
+
+class ParquetSink:
+    """Writes every flushed batch as a row group of one Parquet file"""
+
+    def __init__(self, path, compression='zstd'):
+        self.path = path
+        self.compression = compression
+        self.writer = None
+
+    def _table(self, columns):
+        pa = require_pyarrow()
+        arrays = []
+        for name, kind in COLUMNS:
+            column = columns[name]
+            if kind == 'int':
+                # Arrow has real nulls; put them back
+                arrays.append(pa.array(column, mask=column == INT_MISSING))
+            elif kind == 'timestamp':
+                arrays.append(pa.array(column, type=pa.timestamp('ms', tz='UTC')))
+            else:
+                arrays.append(pa.array(column))
+        return pa.Table.from_arrays(arrays, names=[name for name, _ in COLUMNS])
+
+    def write(self, columns):
+        table = self._table(columns)
+        if self.writer is None:
+            self.writer = require_pyarrow().parquet.ParquetWriter(self.path, table.schema, compression=self.compression)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is None:
+            # Nothing was harvested: still leave a readable file with the full schema
+            self.write({name: to_numpy_column(kind, []) for name, kind in COLUMNS})
+        self.writer.close()
+
+
+class SearchHarvester:
+    """Runs search queries concurrently and streams the results into a sink column by column"""
+
+    def __init__(self, client, sink, batch_rows=50000, max_workers=4):
+        self.client = client
+        self.sink = sink
+        self.batch_rows = batch_rows
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        # Sinks are not thread-safe; this serializes writes without holding up the query threads
+        self.write_lock = threading.Lock()
+        self._reset()
+        self.stats = {'queries': 0, 'failed': 0, 'rows': 0, 'responseBytes': 0, 'batches': 0, 'seconds': 0.0}
+
+    def _reset(self):
+        self.buffer = {name: [] for name, _ in COLUMNS}
+        self.buffered = 0
+
+    def _take(self):
+        """Swap out the buffered rows (call with self.lock held); None if there are none"""
+        if not self.buffered:
+            return None
+        buffer = self.buffer
+        self._reset()
+        self.stats['batches'] += 1
+        return buffer
+
+    def _flush(self, buffer):
+        """Convert a taken buffer to NumPy columns and write it, outside self.lock"""
+        if buffer is None:
+            return
+        columns = {name: to_numpy_column(kind, buffer[name]) for name, kind in COLUMNS}
+        with self.write_lock:
+            self.sink.write(columns)
+
+    def _run_query(self, search):
+        try:
+            response = self.client.search_classes(search['zipCode'], search['radiusMiles'],
+                                                  query=search.get('query'), date=search.get('date'))
+            body = self.client.codec.loads(response.content) if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            body = None
+        if not isinstance(body, dict):
+            # One failed query is counted, not allowed to end the harvest
+            with self.lock:
+                self.stats['queries'] += 1
+                self.stats['failed'] += 1
+            return
+        rows = body.get('results') or []
+        del body
+        # Column-wise extraction while the page is in hand; the row dicts die with it
+        page = {name: [row.get(name) for row in rows] for name, _ in RESULT_COLUMNS}
+        count = len(rows)
+        del rows
+        page['queryZip'] = [search['zipCode']] * count
+        page['queryRadiusMiles'] = [float(search['radiusMiles'])] * count
+        page['queryDate'] = [search.get('date')] * count
+        page['queryRank'] = list(range(count))
+        with self.lock:
+            for name, values in page.items():
+                self.buffer[name].extend(values)
+            self.buffered += count
+            self.stats['queries'] += 1
+            self.stats['rows'] += count
+            self.stats['responseBytes'] += len(response.content)
+            buffer = self._take() if self.buffered >= self.batch_rows else None
+        self._flush(buffer)
+
+    def run(self, grid):
+        """Run every search in `grid`, flush what is left and close the sink; returns stats"""
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(self._run_query, grid))
+            with self.lock:
+                buffer = self._take()
+            self._flush(buffer)
+        finally:
+            with self.write_lock:
+                self.sink.close()
+        self.stats['seconds'] = round(time.perf_counter() - started, 3)
+        self.stats['rowsPerSecond'] = round(self.stats['rows'] / self.stats['seconds'], 1) if self.stats['seconds'] else 0.0
+        return self.stats
+
+
+def load_columns(path, names=None):
+    """Columns of a harvested .parquet or .npz file as {name: NumPy array}"""
+    if path.endswith('.parquet'):
+        table = require_pyarrow().parquet.read_table(path, columns=names)
+        columns = {}
+        for name in table.column_names:
+            column = table[name]
+            if column.null_count and dict(COLUMNS).get(name) == 'int':
+                column = column.fill_null(INT_MISSING)
+            columns[name] = column.to_numpy()
+        return columns
+    with require_numpy().load(path) as data:
+        results = data['results']
+    return {name: results[name] for name in (names or results.dtype.names)}
+
+
+def analyze(columns):
+    """Vectorized search-quality summary over harvested columns
+
+    Distance percentiles overall, then per query ZIP: rows, fill rate
+    (currentStudents / maxStudents, sessions with a known capacity only),
+    mean price and the price/capacity correlation.
+    """
+    np = require_numpy()
+    distance = columns['distanceMiles']
+    capacity = columns['maxStudents'].astype(np.float64)
+    filled = columns['currentStudents'].astype(np.float64)
+    price = columns['price']
+    known = (capacity > 0) & (filled >= 0)
+    fill = np.divide(filled, capacity, out=np.full_like(capacity, np.nan), where=known)
+
+    summary = {'rows': int(len(distance)), 'byZip': {}}
+    if not len(distance):
+        return summary
+    p50, p90, p99 = np.nanpercentile(distance, [50, 90, 99])
+    summary.update({'distanceP50': round(float(p50), 2), 'distanceP90': round(float(p90), 2),
+                    'distanceP99': round(float(p99), 2), 'fillRate': round(float(np.nanmean(fill)), 4)
+                    if known.any() else None})
+
+    zips, index = np.unique(columns['queryZip'], return_inverse=True)
+    rows = np.bincount(index, minlength=len(zips))
+    fill_sum = np.bincount(index, weights=np.where(known, fill, 0.0), minlength=len(zips))
+    fill_count = np.bincount(index, weights=known, minlength=len(zips))
+    priced = ~np.isnan(price)
+    price_sum = np.bincount(index, weights=np.where(priced, price, 0.0), minlength=len(zips))
+    price_count = np.bincount(index, weights=priced, minlength=len(zips))
+    for i, zip_code in enumerate(zips):
+        selected = (index == i) & priced & known
+        correlation = None
+        if selected.sum() > 2 and np.ptp(price[selected]) and np.ptp(capacity[selected]):
+            correlation = round(float(np.corrcoef(price[selected], capacity[selected])[0, 1]), 3)
+        summary['byZip'][str(zip_code)] = {
+            'rows': int(rows[i]),
+            'fillRate': round(float(fill_sum[i] / fill_count[i]), 4) if fill_count[i] else None,
+            'meanPrice': round(float(price_sum[i] / price_count[i]), 2) if price_count[i] else None,
+            'priceCapacityCorrelation': correlation,
+        }
+    return summary
+
+
+def format_report(stats, summary, out):
+    lines = [f"🌾 {stats['queries']} searches ({stats['failed']} failed) -> {stats['rows']} rows in "
+             f"{stats['seconds']:.2f}s ({stats['rowsPerSecond']:.0f} rows/s, {stats['batches']} batches) -> {out}"]
+    if summary['rows']:
+        fill = f"{summary['fillRate']:.1%}" if summary['fillRate'] is not None else 'n/a'
+        lines.append(f"📏 distance p50 {summary['distanceP50']} / p90 {summary['distanceP90']} / "
+                     f"p99 {summary['distanceP99']} miles, fill rate {fill}")
+        lines.append(f"{'zip':>8} {'rows':>9} {'fill':>7} {'price':>8} {'price~cap':>10}")
+        for zip_code, row in sorted(summary['byZip'].items()):
+            fill = f"{row['fillRate']:.1%}" if row['fillRate'] is not None else 'n/a'
+            price = f"{row['meanPrice']:.2f}" if row['meanPrice'] is not None else 'n/a'
+            correlation = row['priceCapacityCorrelation']
+            lines.append(f"{zip_code:>8} {row['rows']:>9} {fill:>7} {price:>8} "
+                         f"{correlation if correlation is not None else 'n/a':>10}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Harvest a grid of class searches into Parquet or NumPy')
+    parser.add_argument('--zips', default='75454')
+    parser.add_argument('--radii', default='30')
+    parser.add_argument('--days', type=int, default=0, help='also search each of the next N days')
+    parser.add_argument('--query')
+    parser.add_argument('--out', default='search-results.parquet', help='.parquet (needs pyarrow) or .npz')
+    parser.add_argument('--batch-rows', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--emulator', action='store_true', help='harvest from a seeded local emulator')
+    parser.add_argument('--trainers', type=int, default=100, help='trainers to seed per emulator ZIP')
+    parser.add_argument('--sessions-per-trainer', type=int, default=20)
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    args = parser.parse_args()
+
+    zips = args.zips.split(',')
+    radii = [float(r) for r in args.radii.split(',')]
+    today = datetime.now(timezone.utc).date()
+    dates = [None] + [(today + timedelta(days=d)).isoformat() for d in range(1, args.days + 1)]
+    grid = search_grid(zips, radii, dates, args.query)
+
+    emulator = None
+    if args.emulator:
+        from .emulator import Emulator, make_token
+        emulator = Emulator().start()
+        emulator.state.seed(trainers=args.trainers * len(zips), sessions_per_trainer=args.sessions_per_trainer,
+                            zip_codes=zips)
+        # Seeded sessions are all alike; vary capacity, bookings and price so the analysis has signal
+        rng = random.Random(7)
+        for item in emulator.state.sessions.values():
+            item['capacity'] = rng.choice((6, 10, 15, 20, 30))
+            item['countRegistered'] = rng.randint(0, item['capacity'])
+            item['pricePerClass'] = round(10 + item['capacity'] * rng.uniform(0.8, 1.6), 2)
+        base_url, token = emulator.base_url, make_token('search-harvester')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    parquet = args.out.endswith('.parquet')
+    sink = ParquetSink(args.out) if parquet else ArraySink()
+    try:
+        with GrippedClient(token, base_url=base_url) as client:
+            stats = SearchHarvester(client, sink, args.batch_rows, args.workers).run(grid)
+    finally:
+        if emulator:
+            emulator.stop()
+    if not parquet:
+        sink.save(args.out)
+    print(format_report(stats, analyze(load_columns(args.out)), args.out))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Pure-Python HDR (High Dynamic Range) histogram
+Same bucket layout as HdrHistogram: values are tracked to a fixed number of
+significant decimal digits across the whole range, so p99.9 of a 30 s stall
+and p50 of a 2 ms request are both precise. Histograms with the same layout
+can be merged and round-trip through plain JSON dicts.
+"""
+
+import math
+
+
+class Histogram:
+    """HDR histogram of integer values (the tooling records microseconds)"""
+
+    def __init__(self, lowest=1, highest=3_600_000_000, significant_figures=3):
+        if lowest < 1 or highest < 2 * lowest or not 1 <= significant_figures <= 5:
+            raise ValueError('Invalid histogram range or precision')
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self.sub_bucket_count = 1 << (self.sub_bucket_half_count_magnitude + 1)
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        smallest_untrackable = self.sub_bucket_count << self.unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.bucket_count = bucket_count
+        self.counts_len = (bucket_count + 1) * self.sub_bucket_half_count
+
+        self.counts = [0] * self.counts_len
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+
+    # Index arithmetic
+    def _bucket_index(self, value):
+        pow2_ceiling = (value | self.sub_bucket_mask).bit_length()
+        return pow2_ceiling - self.unit_magnitude - (self.sub_bucket_half_count_magnitude + 1)
+
+    def _counts_index(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        return ((bucket_index + 1) << self.sub_bucket_half_count_magnitude) + (sub_bucket_index - self.sub_bucket_half_count)
+
+    def _value_at_index(self, index):
+        bucket_index = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self.sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << (bucket_index + self.unit_magnitude)
+
+    def _equivalent_range(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        adjust = 1 if sub_bucket_index >= self.sub_bucket_count else 0
+        return 1 << (self.unit_magnitude + bucket_index + adjust)
+
+    def lowest_equivalent(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        return sub_bucket_index << (bucket_index + self.unit_magnitude)
+
+    def highest_equivalent(self, value):
+        return self.lowest_equivalent(value) + self._equivalent_range(value) - 1
+
+    # Recording
+    def record(self, value, count=1):
+        """Record a value; values beyond the trackable range are clamped"""
+        value = min(max(int(value), 0), self.highest)
+        self.counts[self._counts_index(value)] += count
+        self.total_count += count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def record_corrected(self, value, expected_interval):
+        """Record a value and back-fill the samples a stalled closed loop never sent
+
+        When a caller issues requests every `expected_interval` but one took
+        `value`, the requests it would have sent meanwhile are synthesised
+        with linearly decreasing latencies (coordinated-omission correction).
+        """
+        self.record(value)
+        if expected_interval <= 0 or value <= expected_interval:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    # Queries
+    def value_at_percentile(self, percentile):
+        if self.total_count == 0:
+            return 0
+        percentile = min(max(percentile, 0.0), 100.0)
+        target = max(1, int(percentile / 100.0 * self.total_count + 0.5))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            running += count
+            if running >= target:
+                return min(self.highest_equivalent(self._value_at_index(index)), self.max_value)
+        return self.max_value
+
+    def mean(self):
+        if self.total_count == 0:
+            return 0.0
+        total = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                value = self._value_at_index(index)
+                total += count * (value + self._equivalent_range(value) // 2)
+        return total / self.total_count
+
+    # Merging and serialization
+    def _check_compatible(self, other):
+        if (self.lowest, self.highest, self.significant_figures) != (other.lowest, other.highest, other.significant_figures):
+            raise ValueError('Cannot merge histograms with different layouts')
+
+    def merge(self, other):
+        """Add another histogram's counts into this one"""
+        self._check_compatible(other)
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        if other.min_value is not None and (self.min_value is None or other.min_value < self.min_value):
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        return self
+
+    def copy(self):
+        clone = Histogram(self.lowest, self.highest, self.significant_figures)
+        return clone.merge(self)
+
+    def to_dict(self):
+        """Sparse JSON-friendly representation (only non-zero buckets)"""
+        return {
+            'lowest': self.lowest,
+            'highest': self.highest,
+            'significantFigures': self.significant_figures,
+            'totalCount': self.total_count,
+            'min': self.min_value,
+            'max': self.max_value,
+            'counts': {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['lowest'], data['highest'], data['significantFigures'])
+        for index, count in data['counts'].items():
+            histogram.counts[int(index)] = count
+        histogram.total_count = data['totalCount']
+        histogram.min_value = data['min']
+        histogram.max_value = data['max']
+        return histogram
@@ -0,0 +1,206 @@
+"""
+Client-side image preparation before upload
+Decodes each image, applies its EXIF orientation, resizes it to a set of
+target sizes (longest edge, never upscaling) and re-encodes JPEG or WebP at
+a fixed quality with metadata stripped. Batches run in a process pool, and
+the report gives bytes saved against the originals and throughput, so both
+the upload and every later S3Image download move fewer bytes. The prepared
+files can be handed straight to gripped_sdk.uploads.UploadPipeline.
+
+Needs Pillow (pip install Pillow), imported on first use.
+
+Usage:
+    python -m gripped_sdk.images photos/*.jpg --out prepared/ --format webp --quality 80
+    python -m gripped_sdk.images --synthetic 24 --processes 4
+"""
+
+import argparse
+import hashlib
+import io
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Longest edge in pixels per variant: full replaces the original upload,
+# medium and thumb are what list and card views need
+TARGET_SIZES = {'full': 1600, 'medium': 800, 'thumb': 256}
+FORMATS = {'jpeg': ('JPEG', '.jpg'), 'webp': ('WEBP', '.webp')}
+
+
+def _pillow():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise RuntimeError('Image preparation needs Pillow: pip install Pillow') from None
+    return Image, ImageOps
+
+
+def _encode(image, image_format, quality):
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def prepare_image(source, sizes=None, image_format='jpeg', quality=82, out_dir=None):
+    """Orient, resize and re-encode one image (path or bytes) into every target size
+
+    Returns {'source', 'inputBytes', 'width', 'height', 'variants'} with the
+    original's stored dimensions; each variant has its width, height, byte size and either its output
+    path (with out_dir) or its encoded bytes. Output files are named
+    <name>-<content hash>-<variant>, so sources that share a file name do not collide.
+    """
+    Image, ImageOps = _pillow()
+    sizes = sizes or TARGET_SIZES
+    pil_format, extension = FORMATS[image_format]
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            data = f.read()
+        stem = os.path.splitext(os.path.basename(source))[0]
+    else:
+        data, stem = bytes(source), 'image'
+    input_bytes = len(data)
+    image = Image.open(io.BytesIO(data))
+    # Same-named files from different directories (and every bytes source) differ in content
+    name = f'{stem}-{hashlib.sha256(data).hexdigest()[:12]}'
+
+    width, height = image.size
+    sizes_by_edge = sorted(sizes.items(), key=lambda item: -item[1])
+    if image.format == 'JPEG':
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that still covers the largest variant.
+        # draft() keeps both edges at least the box, so the box has the image's aspect ratio
+        scale = sizes_by_edge[0][1] / max(width, height)
+        image.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L') and not (pil_format == 'WEBP' and image.mode == 'RGBA'):
+        # JPEG has no alpha: flatten transparent images onto white
+        if image.mode in ('RGBA', 'LA', 'P'):
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.split()[3])
+        else:
+            image = image.convert('RGB')
+
+    result = {'source': source if isinstance(source, str) else f'<{input_bytes} bytes>',
+              'inputBytes': input_bytes, 'width': width, 'height': height, 'variants': {}}
+    # Largest first; each smaller variant is resized from the previous (decoded, not
+    # re-encoded) one, so compression loss never compounds and each step is cheaper
+    resized = image
+    for variant, edge in sizes_by_edge:
+        resized = resized.copy()
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+        data = _encode(resized, pil_format, quality)
+        entry = {'width': resized.width, 'height': resized.height, 'bytes': len(data)}
+        if out_dir:
+            entry['path'] = os.path.join(out_dir, f'{name}-{variant}{extension}')
+            with open(entry['path'], 'wb') as f:
+                f.write(data)
+        else:
+            entry['data'] = data
+        result['variants'][variant] = entry
+    return result
+
+
+def _prepare_for_pool(args):
+    return prepare_image(*args)
+
+
+def prepare_batch(sources, sizes=None, image_format='jpeg', quality=82, out_dir=None, processes=None):
+    """Prepare many images in a process pool; returns (results, stats)
+
+    With out_dir the workers write the variants there and only metadata
+    crosses back to the parent, otherwise encoded bytes are returned.
+    """
+    sources = list(sources)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    jobs = [(source, sizes, image_format, quality, out_dir) for source in sources]
+    processes = processes or os.cpu_count() or 1
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunksize = max(1, len(jobs) // (4 * processes))
+        results = list(pool.map(_prepare_for_pool, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+    return results, batch_stats(results, elapsed)
+
+
+def batch_stats(results, elapsed):
+    """Bytes in/out per variant, bytes saved by uploading 'full' instead of the original, throughput"""
+    input_bytes = sum(r['inputBytes'] for r in results)
+    output_bytes = {}
+    for result in results:
+        for variant, entry in result['variants'].items():
+            output_bytes[variant] = output_bytes.get(variant, 0) + entry['bytes']
+    largest = max(output_bytes, key=output_bytes.get) if output_bytes else None
+    megapixels = sum(r['width'] * r['height'] for r in results) / 1e6
+    return {
+        'images': len(results),
+        'inputBytes': input_bytes,
+        'outputBytes': output_bytes,
+        'bytesSaved': input_bytes - output_bytes.get(largest, 0) if largest else 0,
+        'seconds': round(elapsed, 3),
+        'imagesPerSecond': round(len(results) / elapsed, 2) if elapsed else 0.0,
+        'megapixelsPerSecond': round(megapixels / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def format_report(stats):
+    lines = [f"🖼️  {stats['images']} images in {stats['seconds']:.2f}s "
+             f"({stats['imagesPerSecond']:.1f} images/s, {stats['megapixelsPerSecond']:.1f} MP/s)",
+             f"  originals: {stats['inputBytes'] / 1e6:>8.2f} MB"]
+    for variant, size in sorted(stats['outputBytes'].items(), key=lambda item: -item[1]):
+        share = size / stats['inputBytes'] if stats['inputBytes'] else 0.0
+        lines.append(f"  {variant + ':':<10} {size / 1e6:>8.2f} MB ({share:.0%} of originals)")
+    lines.append(f"💾 {stats['bytesSaved'] / 1e6:.2f} MB saved per full upload of the batch")
+    return '\n'.join(lines)
+
+
+def _synthetic_images(directory, count, width=4032, height=3024):
+    """Camera-sized JPEGs with enough detail not to compress to nothing"""
+    Image, _ = _pillow()
+    paths = []
+    for i in range(count):
+        image = Image.effect_mandelbrot((width, height), (-2.0 + i * 0.01, -1.2, 1.0, 1.2), 64).convert('RGB')
+        noise = Image.effect_noise((width, height), 40).convert('RGB')
+        image = Image.blend(image, noise, 0.3)
+        path = os.path.join(directory, f'synthetic-{i}.jpg')
+        image.save(path, 'JPEG', quality=95)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Orient, resize and re-encode images before upload')
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--synthetic', type=int, default=0, help='prepare N generated camera-sized images')
+    parser.add_argument('--out', help='directory for the prepared variants')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='jpeg')
+    parser.add_argument('--quality', type=int, default=82)
+    parser.add_argument('--sizes', help="variant sizes, e.g. 'full=1600,thumb=256'")
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    sizes = None
+    if args.sizes:
+        sizes = {name: int(edge) for name, edge in (item.split('=') for item in args.sizes.split(','))}
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files
+        if not files:
+            if not args.synthetic:
+                parser.error('pass image files or --synthetic N')
+            print(f"🎨 Generating {args.synthetic} synthetic images...")
+            files = _synthetic_images(directory, args.synthetic)
+        out_dir = args.out or os.path.join(directory, 'prepared')
+        results, stats = prepare_batch(files, sizes, args.format, args.quality, out_dir, args.processes)
+    print(format_report(stats))
+    if args.out:
+        print(f"📁 {sum(len(r['variants']) for r in results)} files written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+JSON codec microbenchmark on typical API payloads
+Times encoding a POST /classes body and a /classes/search response, and
+decoding them back, with every codec in gripped_sdk.codec that is
+installed, next to the path the client used before codecs existed
+(requests' json= and response.json()).
+
+Usage:
+    python -m gripped_sdk.jsonbench --sessions 12 --results 500 --repeat 2000
+"""
+
+import argparse
+import json
+import timeit
+
+from .codec import available_codecs, get_codec
+
+
+def _class_payload(sessions):
+    from datetime import datetime, timedelta, timezone
+
+    begins = datetime(2026, 3, 2, 17, tzinfo=timezone.utc)
+    return {
+        'className': 'Morning Strength & Conditioning',
+        'overview': 'Full-body strength session with kettlebells, sleds and mobility work — all levels welcome.',
+        'classLocationAddress1': '1200 Main Street', 'city': 'Anna', 'state': 'TX', 'zip': '75454',
+        'pricePerClass': 25.0, 'currency': 'USD', 'classTags': ['strength', 'conditioning', 'kettlebell'],
+        'sessions': [{'startDateTime': (begins + timedelta(days=7 * i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                      'endDateTime': (begins + timedelta(days=7 * i, hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                      'capacity': 12} for i in range(sessions)],
+    }
+
+
+def _search_response(results):
+    from .emulator import EmulatorState, _search_result
+
+    state = EmulatorState()
+    state.seed(trainers=max(1, results // 20), sessions_per_trainer=20)
+    rows = [_search_result(item, state.profiles[item['trainerId']], 3.25) for item in state.sessions.values()]
+    return {'results': rows[:results], 'totalFound': results, 'radiusMiles': 30.0,
+            'searchLocation': {'latitude': 33.2829, 'longitude': -96.5724, 'zipCode': '75454'}}
+
+
+def benchmark(sessions=12, results=500, repeat=2000, codecs=None):
+    """Encode and decode timings (microseconds per call) for each codec on two payloads
+
+    The 'requests' row is what the client did before codecs: requests'
+    json= (json.dumps to str, then encode) and response.json() (decode the
+    body to str, then json.loads).
+    """
+    payloads = {'createClass': _class_payload(sessions), 'searchResponse': _search_response(results)}
+    rows = []
+
+    def per_call(function, count):
+        # timeit turns the garbage collector off while timing
+        return min(timeit.repeat(function, number=count, repeat=5)) / count * 1e6
+
+    for label, payload in payloads.items():
+        count = max(1, repeat if label == 'createClass' else repeat // 50)
+        raw = json.dumps(payload).encode('utf-8')
+        rows.append({'payload': label, 'codec': 'requests', 'bytes': len(raw),
+                     'encodeUs': per_call(lambda: json.dumps(payload, allow_nan=False).encode('utf-8'), count),
+                     'decodeUs': per_call(lambda: json.loads(raw.decode('utf-8')), count)})
+        for name in codecs or available_codecs():
+            codec = get_codec(name)
+            encoded = codec.dumps(payload)
+            rows.append({'payload': label, 'codec': name, 'bytes': len(encoded),
+                         'encodeUs': per_call(lambda: codec.dumps(payload), count),
+                         'decodeUs': per_call(lambda: codec.loads(encoded), count)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark the JSON codecs on typical API payloads')
+    parser.add_argument('--sessions', type=int, default=12, help='sessions in the POST /classes payload')
+    parser.add_argument('--results', type=int, default=500, help='rows in the /classes/search response')
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = benchmark(args.sessions, args.results, args.repeat)
+    print(f"⚙️  JSON codecs available: {', '.join(available_codecs())}")
+    print(f"{'payload':<16} {'codec':<9} {'bytes':>8} {'encode µs':>10} {'decode µs':>10} {'vs requests':>12}")
+    baseline = {}
+    for row in rows:
+        total = row['encodeUs'] + row['decodeUs']
+        baseline.setdefault(row['payload'], total)
+        print(f"{row['payload']:<16} {row['codec']:<9} {row['bytes']:>8} {row['encodeUs']:>10.1f} "
+              f"{row['decodeUs']:>10.1f} {baseline[row['payload']] / total:>11.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""
+Coordinated-omission-corrected latency measurement
+Requests are issued on a fixed-rate schedule and each one is timed from its
+*intended* send time, not from when a worker finally got around to sending
+it. A stall on the server therefore shows up in every request that was due
+during the stall, instead of only in the one that was in flight.
+
+Usage:
+    python -m gripped_sdk.latency --emulator --workload search --rate 200 --duration 10
+    python -m gripped_sdk.latency --token $ID_TOKEN --workload search --rate 5 --duration 30
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+import traceback
+
+import requests
+
+from .client import GrippedClient, status_class
+from .hdr import Histogram
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+# Status (and status class) of an operation that sent no request and raised nothing
+LOCAL = 'local'
+
+
+def _status_class(status):
+    return LOCAL if status == LOCAL else status_class(status)
+
+
+class LatencyRecorder:
+    """Per (endpoint, status class) HDR histograms of request latency
+
+    Two histograms are kept per key: 'corrected' measures from the intended
+    send time (what a user on the fixed schedule experiences) and 'service'
+    measures from the actual send time (what a naive timing loop reports).
+    Values are recorded in microseconds and reported in milliseconds; the
+    run window (started/finished) is kept as time.time() epochs so recorders
+    from different processes merge correctly.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.corrected = {}
+        self.service = {}
+        self.started = None
+        self.finished = None
+        self._epoch_offset = time.time() - time.perf_counter()
+
+    def _histograms(self, key):
+        if key not in self.corrected:
+            self.corrected[key] = Histogram()
+            self.service[key] = Histogram()
+        return self.corrected[key], self.service[key]
+
+    def record(self, endpoint, status, intended, started, finished):
+        """Record one request; times are time.perf_counter() seconds"""
+        key = (endpoint, _status_class(status))
+        with self.lock:
+            corrected, service = self._histograms(key)
+            corrected.record((finished - intended) * 1e6)
+            service.record((finished - started) * 1e6)
+            intended += self._epoch_offset
+            finished += self._epoch_offset
+            if self.started is None or intended < self.started:
+                self.started = intended
+            if self.finished is None or finished > self.finished:
+                self.finished = finished
+
+    def record_closed_loop(self, endpoint, status, elapsed, expected_interval):
+        """Record a closed-loop sample, back-filling the requests a stall suppressed"""
+        key = (endpoint, _status_class(status))
+        with self.lock:
+            corrected, service = self._histograms(key)
+            corrected.record_corrected(elapsed * 1e6, expected_interval * 1e6)
+            service.record(elapsed * 1e6)
+
+    def merge(self, other):
+        """Fold another recorder (e.g. from another worker) into this one"""
+        with self.lock:
+            for key, histogram in other.corrected.items():
+                corrected, service = self._histograms(key)
+                corrected.merge(histogram)
+                service.merge(other.service[key])
+            if other.started is not None and (self.started is None or other.started < self.started):
+                self.started = other.started
+            if other.finished is not None and (self.finished is None or other.finished > self.finished):
+                self.finished = other.finished
+        return self
+
+    @property
+    def total_count(self):
+        return sum(h.total_count for h in self.service.values())
+
+    def to_dict(self):
+        return {
+            'started': self.started,
+            'finished': self.finished,
+            'entries': [
+                {
+                    'endpoint': endpoint,
+                    'statusClass': klass,
+                    'corrected': self.corrected[(endpoint, klass)].to_dict(),
+                    'service': self.service[(endpoint, klass)].to_dict(),
+                }
+                for endpoint, klass in sorted(self.corrected)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        recorder = cls()
+        recorder.started = data.get('started')
+        recorder.finished = data.get('finished')
+        for entry in data['entries']:
+            key = (entry['endpoint'], entry['statusClass'])
+            recorder.corrected[key] = Histogram.from_dict(entry['corrected'])
+            recorder.service[key] = Histogram.from_dict(entry['service'])
+        return recorder
+
+    def summary(self):
+        """One row per (endpoint, status class) with percentiles in ms"""
+        duration = (self.finished - self.started) if self.started is not None else 0.0
+        rows = []
+        for endpoint, klass in sorted(self.corrected):
+            corrected = self.corrected[(endpoint, klass)]
+            service = self.service[(endpoint, klass)]
+            rows.append({
+                'endpoint': endpoint,
+                'statusClass': klass,
+                'count': service.total_count,
+                'throughput': round(service.total_count / duration, 2) if duration > 0 else None,
+                'corrected': _latency_stats(corrected),
+                'service': _latency_stats(service),
+            })
+        return rows
+
+    def report_json(self):
+        return json.dumps({'percentiles': list(PERCENTILES), 'results': self.summary()}, indent=2)
+
+    def report_text(self):
+        headers = ['p50', 'p90', 'p99', 'p99.9', 'max']
+        rows = self.summary()
+        width = max([len('endpoint')] + [len(row['endpoint']) for row in rows])
+        lines = [f"{'endpoint':<{width}} {'class':<6} {'count':>8}  {'kind':<9} " + ' '.join(f'{h:>9}' for h in headers)]
+        lines.append('-' * len(lines[0]))
+        for row in rows:
+            for kind in ('corrected', 'service'):
+                stats = row[kind]
+                values = ' '.join(f"{stats[h]:>9.2f}" for h in headers)
+                if kind == 'corrected':
+                    prefix = f"{row['endpoint']:<{width}} {row['statusClass']:<6} {row['count']:>8}"
+                else:
+                    prefix = ' ' * (width + 16)
+                lines.append(f"{prefix}  {kind:<9} {values}")
+        lines.append('(latencies in ms; corrected = from intended send time, service = from actual send time)')
+        return '\n'.join(lines)
+
+
+def _latency_stats(histogram):
+    stats = {_percentile_label(p): histogram.value_at_percentile(p) / 1000.0 for p in PERCENTILES}
+    stats['max'] = histogram.max_value / 1000.0
+    stats['mean'] = round(histogram.mean() / 1000.0, 3)
+    return stats
+
+
+def _percentile_label(percentile):
+    return f"p{percentile:g}"
+
+
+def worst_status(events, raised=False):
+    """Pick the status that best describes a multi-request operation
+
+    An operation that sent no request and did not raise gets LOCAL: it may
+    have been answered by a SearchCache, or silently done nothing, so it is
+    neither a success nor an error and is reported in its own class.
+    """
+    if not events and not raised:
+        return LOCAL
+    if any(e['status'] is None for e in events):
+        return None
+    return max((e['status'] for e in events), default=None)
+
+
+_report_lock = threading.Lock()
+
+
+def run_operation(operation, client, context, reported):
+    """operation(client, context); returns the exception it raised, or None
+
+    Network errors are expected under load. Anything else is a bug in the
+    workload or the tooling, so the first exception of each type is printed
+    with its traceback; `reported` is the per-run set of types shown so far.
+    """
+    try:
+        operation(client, context)
+    except requests.RequestException as e:
+        return e
+    except Exception as e:
+        report_exception(e, getattr(operation, '__name__', 'operation'), reported)
+        return e
+    return None
+
+
+def report_exception(error, source, reported):
+    """Print `error` and its traceback if it is the first of its type in `reported`"""
+    with _report_lock:
+        first = type(error) not in reported
+        reported.add(type(error))
+    if first:
+        print(f"⚠️  {source} raised {type(error).__name__}: {error}")
+        traceback.print_exception(error)
+
+
+def run_fixed_rate(client_factory, operation, rate, duration, concurrency=16, recorder=None, label=None,
+                   context=None, start_at=None, slots=None):
+    """Run operation(client, context) at `rate` per second for `duration` seconds
+
+    Each of `concurrency` worker threads owns one client from
+    client_factory(index). Slot i is due at start + i / rate; a worker that
+    picks up a slot late still records latency from the slot's due time, so
+    queueing behind slow requests is charged to the requests that waited.
+    Operations are labelled with `label` or, for single-request workloads, by
+    'METHOD /endpoint/template'. `start_at` (a time.time() epoch) lets
+    several processes share one schedule, and `slots` overrides the number
+    of slots (rate * duration by default).
+    """
+    recorder = recorder or LatencyRecorder()
+    context = context if context is not None else {}
+    interval = 1.0 / rate
+    total = slots if slots is not None else int(rate * duration)
+    next_slot = itertools.count()
+    slot_lock = threading.Lock()
+    reported = set()
+    if start_at is None:
+        start = time.perf_counter() + 0.05
+    else:
+        start = time.perf_counter() + (start_at - time.time())
+
+    def worker(index):
+        client = client_factory(index)
+        events = []
+        client.add_hook(events.append)
+        try:
+            while True:
+                with slot_lock:
+                    slot = next(next_slot)
+                if slot >= total:
+                    return
+                intended = start + slot * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                events.clear()
+                sent = time.perf_counter()
+                error = run_operation(operation, client, context, reported)
+                finished = time.perf_counter()
+                name = label or _operation_label(events, error)
+                recorder.record(name, worst_status(events, error is not None), intended, sent, finished)
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder
+
+
+def _operation_label(events, error=None):
+    if not events:
+        if error is None:
+            return 'no request'
+        return 'unknown' if isinstance(error, requests.RequestException) else f'error ({type(error).__name__})'
+    if len(events) == 1:
+        return f"{events[0]['method']} {events[0]['endpoint']}"
+    return ' + '.join(f"{e['method']} {e['endpoint']}" for e in events)
+
+
+def main():
+    from .emulator import Emulator
+    from .singleflight import SingleFlight
+    from .workloads import (STATEFUL_WORKLOADS, WORKLOADS, add_context_arguments, emulator_context, emulator_token,
+                            live_context)
+
+    parser = argparse.ArgumentParser(description='Fixed-rate latency measurement with coordinated-omission correction')
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='search')
+    parser.add_argument('--rate', type=float, default=50.0, help='requests per second')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--emulator', action='store_true', help='run against a local seeded emulator')
+    parser.add_argument('--latency', type=float, default=0.0, help='emulator service time in seconds')
+    parser.add_argument('--pause-at', type=float, help='emulator: stall the server this many seconds in')
+    parser.add_argument('--pause-for', type=float, default=1.0, help='emulator: length of the stall')
+    parser.add_argument('--base-url', help='API base URL (defaults to the nonProd API)')
+    parser.add_argument('--token', action='append', default=[],
+                        help='Cognito ID token for live runs (repeatable; workers take them round-robin)')
+    parser.add_argument('--zip', default='75454')
+    add_context_arguments(parser)
+    parser.add_argument('--single-flight', action='store_true', help='coalesce identical concurrent GETs')
+    parser.add_argument('--json-out', help='write the JSON report here')
+    args = parser.parse_args()
+
+    single_flight = SingleFlight(share_across_users=True) if args.single_flight else None
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(latency=args.latency).start()
+        context = emulator_context(emulator, zip_code=args.zip)
+        base_url = emulator.base_url
+
+        def client_factory(index):
+            return GrippedClient(emulator_token(index), base_url=base_url, single_flight=single_flight)
+
+        if args.pause_at is not None:
+            threading.Timer(args.pause_at, emulator.pause, args=(args.pause_for,)).start()
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        context = live_context(parser, args, args.workload)
+        if args.workload in STATEFUL_WORKLOADS and args.concurrency > len(args.token):
+            # Workers sharing a token would enroll and unenroll each other
+            print(f"⚠️  '{args.workload}' needs one token per worker: running {len(args.token)} worker(s)")
+            args.concurrency = len(args.token)
+
+        def client_factory(index):
+            kwargs = {'base_url': args.base_url} if args.base_url else {}
+            return GrippedClient(args.token[index % len(args.token)], single_flight=single_flight, **kwargs)
+
+    print(f"🚀 Running '{args.workload}' at {args.rate:g} req/s for {args.duration:g}s "
+          f"with {args.concurrency} workers")
+    recorder = run_fixed_rate(client_factory, WORKLOADS[args.workload], args.rate, args.duration,
+                              concurrency=args.concurrency, context=context)
+    if emulator:
+        emulator.stop()
+
+    print(recorder.report_text())
+    if single_flight:
+        stats = single_flight.summary()
+        print(f"🔗 Single flight: {stats['coalesced']} of {stats['leaders'] + stats['coalesced']} GETs "
+              f"joined an in-flight request ({stats['savedRatio']:.1%})")
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            f.write(recorder.report_json())
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+Distributed multi-process load generator
+One Python process runs out of GIL and sockets long before API Gateway does,
+so the target rate is split across N worker processes, and optionally across
+agents on other hosts that connect to a TCP coordinator. Every worker process
+owns its own token pool and HTTP sessions, runs the fixed-rate schedule from
+gripped_sdk.latency on its share of the rate, and returns its HDR histograms
+and counters, which the coordinator merges into a single report.
+
+Usage:
+    # 4 local worker processes against a local emulator
+    python -m gripped_sdk.loadgen run --emulator --processes 4 --rate 800 --duration 10
+
+    # coordinator with 2 local processes waiting for 1 remote agent; agents reach
+    # the emulator at --advertise-host (default: this host's routable address)
+    python -m gripped_sdk.loadgen run --emulator --emulator-host 0.0.0.0 --advertise-host coordinator-host \\
+        --processes 2 --agents 1 --listen 0.0.0.0:7070 --rate 1000
+    python -m gripped_sdk.loadgen agent --coordinator coordinator-host:7070 --processes 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import socket
+import threading
+import time
+
+from .client import GrippedClient
+from .emulator import make_token
+from .latency import LatencyRecorder, run_fixed_rate
+from .singleflight import SingleFlight
+from .workloads import WORKLOADS
+
+COUNTER_FIELDS = ('requests', 'errors', 'requestBytes', 'responseBytes', 'coalesced')
+
+# Seconds between every worker reporting ready and the first scheduled request
+START_MARGIN = 1.0
+
+
+class TokenPool:
+    """Round-robin pool of ID tokens owned by one worker process"""
+
+    def __init__(self, tokens):
+        if not tokens:
+            raise ValueError('TokenPool needs at least one token')
+        self.tokens = list(tokens)
+
+    @classmethod
+    def for_emulator(cls, worker_index, size, prefix='load'):
+        """Distinct simulated users per worker, so workers never share an identity"""
+        return cls(make_token(f'{prefix}-w{worker_index}-u{i}') for i in range(size))
+
+    def token(self, index):
+        return self.tokens[index % len(self.tokens)]
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+def _token_pool(job):
+    tokens = job['tokens']
+    if tokens['mode'] == 'emulator':
+        return TokenPool.for_emulator(job['index'], tokens.get('size', job['concurrency']))
+    # Static tokens are dealt out so each worker gets a disjoint slice when possible
+    pool = tokens['tokens'][job['index']::job['workers']] or tokens['tokens']
+    return TokenPool(pool)
+
+
+def run_job(job):
+    """Run one worker's share of the load; executed inside a worker process"""
+    pool = _token_pool(job)
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    counter_lock = threading.Lock()
+
+    def count(event):
+        with counter_lock:
+            if event.get('coalesced'):
+                # Answered by another thread's identical in-flight request; nothing was sent
+                counters['coalesced'] += 1
+                return
+            counters['requests'] += 1
+            if event['status'] is None or event['status'] >= 500:
+                counters['errors'] += 1
+            counters['requestBytes'] += event['requestBytes']
+            counters['responseBytes'] += event['responseBytes']
+
+    # One group per worker process: its simulated users share identical in-flight GETs
+    single_flight = SingleFlight(share_across_users=True) if job.get('singleFlight') else None
+
+    def client_factory(index):
+        client = GrippedClient(pool.token(index), base_url=job['baseUrl'], single_flight=single_flight)
+        client.add_hook(count)
+        return client
+
+    context = dict(job['context'])
+    context['rng'] = random.Random(job.get('seed', 0) + job['index'])
+    recorder = run_fixed_rate(
+        client_factory, WORKLOADS[job['workload']], job['rate'], job['duration'],
+        concurrency=job['concurrency'], context=context, start_at=job['startAt'],
+        slots=job['slots'],
+    )
+    return {
+        'index': job['index'],
+        'host': socket.gethostname(),
+        'rate': job['rate'],
+        'tokens': len(pool),
+        'counters': counters,
+        'recorder': recorder.to_dict(),
+    }
+
+
+def _worker_ready(barrier):
+    # Pool initializer: each worker process checks in once it has finished starting up
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # a replacement worker started after the pool was already ready
+
+
+class WorkerPool:
+    """`size` spawned worker processes that have all finished starting up
+
+    A spawned worker re-imports the package before it can send anything, which
+    on a loaded host or a large agent takes far longer than any fixed head
+    start, so the pool waits until every worker has checked in.
+    """
+
+    def __init__(self, size, timeout=120.0):
+        self.pool = None
+        if not size:
+            return
+        context = multiprocessing.get_context('spawn')
+        barrier = context.Barrier(size + 1)
+        self.pool = context.Pool(size, initializer=_worker_ready, initargs=(barrier,))
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            self.pool.terminate()
+            raise RuntimeError(f'{size} worker process(es) did not start within {timeout:g}s') from None
+        barrier.abort()
+
+    def run(self, jobs, start_at):
+        """Run jobs on the schedule starting at `start_at`; results come back in job order"""
+        if not jobs:
+            return []
+        return self.pool.map(run_job, schedule(jobs, start_at), chunksize=1)
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def plan_jobs(base_job, process_count, rate):
+    """Split `rate` evenly over `process_count` workers on one interleaved schedule
+
+    Worker k starts k / rate seconds after worker 0, so the combined stream
+    of intended send times is the same evenly spaced schedule a single
+    process at the full rate would follow. The start time itself is only
+    fixed by schedule() once every worker is ready.
+    """
+    total = int(rate * base_job['duration'])
+    jobs = []
+    for index in range(process_count):
+        job = dict(base_job)
+        job.update({
+            'index': index,
+            'workers': process_count,
+            'rate': rate / process_count,
+            'startOffset': index / rate,
+            'slots': len(range(index, total, process_count)),
+        })
+        jobs.append(job)
+    return jobs
+
+
+def schedule(jobs, start_at):
+    """Copies of `jobs` with wall-clock start times for a run starting at `start_at`
+
+    Remote agents share the schedule through these start times, so their
+    clocks need to be NTP-synced.
+    """
+    return [dict(job, startAt=start_at + job['startOffset']) for job in jobs]
+
+
+def merge_results(results):
+    """Merge per-worker recorders and counters into (recorder, counters)"""
+    recorder = LatencyRecorder()
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    for result in results:
+        recorder.merge(LatencyRecorder.from_dict(result['recorder']))
+        for field in COUNTER_FIELDS:
+            counters[field] += result['counters'].get(field, 0)
+    return recorder, counters
+
+
+def report(results, duration):
+    """Text report: merged latency table plus per-worker throughput"""
+    recorder, counters = merge_results(results)
+    lines = [recorder.report_text(), '', f"{'worker':>6} {'host':<20} {'target/s':>9} {'achieved/s':>10} {'errors':>7}"]
+    for result in sorted(results, key=lambda r: r['index']):
+        achieved = result['counters']['requests'] / duration if duration else 0.0
+        lines.append(f"{result['index']:>6} {result['host'][:20]:<20} {result['rate']:>9.1f} "
+                     f"{achieved:>10.1f} {result['counters']['errors']:>7}")
+    lines.append(f"Total: {counters['requests']} requests, {counters['errors']} errors, "
+                 f"{counters['responseBytes'] / 1e6:.2f} MB received across {len(results)} workers")
+    if counters['coalesced']:
+        lines.append(f"Single flight: {counters['coalesced']} calls joined an identical in-flight request")
+    return '\n'.join(lines)
+
+
+# Coordinator <-> agent protocol: one JSON document per line over TCP
+def _send(stream, message):
+    stream.write(json.dumps(message).encode('utf-8') + b'\n')
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError('Peer closed the connection')
+    return json.loads(line)
+
+
+def coordinate(base_job, local_processes, rate, agents=0, listen=('127.0.0.1', 7070)):
+    """Run the local workers and any remote agents on one schedule; return all results"""
+    connections = []
+    if agents:
+        server = socket.create_server(listen)
+        print(f"📡 Waiting for {agents} agent(s) on {listen[0]}:{listen[1]}...")
+        while len(connections) < agents:
+            sock, address = server.accept()
+            stream = sock.makefile('rwb')
+            hello = _receive(stream)
+            connections.append((sock, stream, hello['processes']))
+            print(f"🤝 Agent {hello.get('host', address[0])} joined with {hello['processes']} processes")
+        server.close()
+
+    total = local_processes + sum(processes for _, _, processes in connections)
+    jobs = plan_jobs(base_job, total, rate)
+    local_jobs, offset = jobs[:local_processes], local_processes
+    for _, stream, processes in connections:
+        _send(stream, {'jobs': jobs[offset:offset + processes]})
+        offset += processes
+
+    with WorkerPool(local_processes) as pool:
+        for _, stream, _ in connections:
+            _receive(stream)  # {'ready': true} once the agent's workers have started
+        print(f"✅ {total} worker process(es) ready")
+        # Every worker is up, so the margin only has to cover getting the start time to the agents
+        start_at = time.time() + START_MARGIN
+        for _, stream, _ in connections:
+            _send(stream, {'startAt': start_at})
+        results = pool.run(local_jobs, start_at)
+    for sock, stream, _ in connections:
+        results.extend(_receive(stream)['results'])
+        sock.close()
+    return results
+
+
+def agent(coordinator, processes):
+    """Connect to a coordinator, run the jobs it assigns and send back the results"""
+    host, port = coordinator
+    with socket.create_connection((host, port)) as sock:
+        stream = sock.makefile('rwb')
+        _send(stream, {'processes': processes, 'host': socket.gethostname()})
+        jobs = _receive(stream)['jobs']
+        with WorkerPool(len(jobs)) as pool:
+            _send(stream, {'ready': True})
+            start_at = _receive(stream)['startAt']
+            print(f"🏃 Running {len(jobs)} worker(s)...")
+            results = pool.run(jobs, start_at)
+        _send(stream, {'results': results})
+    print("✅ Results sent to coordinator")
+
+
+def _address(value):
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main():
+    from .emulator import Emulator
+    from .workloads import STATEFUL_WORKLOADS, add_context_arguments, emulator_context, live_context
+
+    parser = argparse.ArgumentParser(description='Multi-process load generator with HDR histogram merge')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='coordinate a load run')
+    run.add_argument('--workload', choices=sorted(WORKLOADS), default='search')
+    run.add_argument('--rate', type=float, default=200.0, help='total requests per second')
+    run.add_argument('--duration', type=float, default=10.0)
+    run.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    run.add_argument('--concurrency', type=int, default=16, help='threads per worker process')
+    run.add_argument('--agents', type=int, default=0, help='remote agents to wait for')
+    run.add_argument('--listen', type=_address, default=('127.0.0.1', 7070))
+    run.add_argument('--emulator', action='store_true', help='serve a seeded local emulator')
+    run.add_argument('--emulator-host', default='127.0.0.1', help='address the emulator binds to')
+    run.add_argument('--advertise-host',
+                     help='host name or address agents use to reach the emulator (default: routable address '
+                          'when --emulator-host is a wildcard)')
+    run.add_argument('--base-url')
+    run.add_argument('--token', action='append', default=[], help='ID token for live runs (repeatable)')
+    run.add_argument('--users', help='comma-separated Cognito users to authenticate for live runs')
+    run.add_argument('--password')
+    run.add_argument('--zip', default='75454')
+    add_context_arguments(run)
+    run.add_argument('--single-flight', action='store_true',
+                     help='coalesce identical concurrent GETs within each worker process')
+    run.add_argument('--json-out')
+
+    agent_parser = sub.add_parser('agent', help='join a coordinator as a remote agent')
+    agent_parser.add_argument('--coordinator', type=_address, required=True)
+    agent_parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+
+    args = parser.parse_args()
+    if args.command == 'agent':
+        agent(args.coordinator, args.processes)
+        return
+
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(host=args.emulator_host, advertise_host=args.advertise_host).start()
+        context = emulator_context(emulator, zip_code=args.zip)
+        context.pop('rng')
+        base_url = emulator.base_url
+        tokens = {'mode': 'emulator', 'size': args.concurrency}
+        print(f"🧪 Emulator serving on {base_url}")
+    else:
+        token_list = list(args.token)
+        if args.users:
+            from .auth import authenticate_users
+            token_list.extend(authenticate_users(args.users.split(','), args.password))
+        if not token_list:
+            run.error('live runs need --token or --users/--password')
+        context = live_context(run, args, args.workload)
+        context.pop('rng')
+        if args.workload in STATEFUL_WORKLOADS and args.processes * args.concurrency > len(token_list):
+            print(f"⚠️  '{args.workload}' needs one token per worker thread: {len(token_list)} token(s) for "
+                  f"{args.processes * args.concurrency} local threads, so some will share an identity")
+        base_url = args.base_url or GrippedClient().base_url
+        tokens = {'mode': 'static', 'tokens': token_list}
+
+    base_job = {
+        'baseUrl': base_url,
+        'workload': args.workload,
+        'duration': args.duration,
+        'concurrency': args.concurrency,
+        'context': context,
+        'tokens': tokens,
+        'singleFlight': args.single_flight,
+    }
+    print(f"🚀 Running '{args.workload}' at {args.rate:g} req/s for {args.duration:g}s "
+          f"on {args.processes} local process(es) + {args.agents} agent(s)")
+    try:
+        results = coordinate(base_job, args.processes, args.rate, args.agents, args.listen)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    print(report(results, args.duration))
+    if args.json_out:
+        recorder, counters = merge_results(results)
+        with open(args.json_out, 'w') as f:
+            json.dump({'counters': counters, 'results': recorder.summary(),
+                       'histograms': recorder.to_dict()}, f, indent=2)
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,380 @@
+"""
+Typed response models for the Gripped API
+Models for the payloads the scripts pick apart by hand: search results,
+class sessions, enrollments, profiles, messages and ratings. Each model's
+JSON field mapping (including the aliases the app tolerates, e.g.
+classOverview/overview and price/classPrice/pricePerClass) is compiled
+once per model.
+
+With msgspec installed, from_json() decodes bytes straight into a
+msgspec.Struct per model in one C pass with no intermediate dicts, in well
+under half the time json.loads takes and with less retained memory than
+its dicts. Values are not type-checked, and every alias key keeps its own
+slot, so rows are somewhat larger than the dataclasses'. Without msgspec,
+the payload is parsed to dicts by the default codec and then copied into
+slotted dataclasses by a generated decode function: the copy costs about
+1.35x json.loads in total with the stdlib codec (about 1x with orjson), in
+exchange for a fraction of the retained memory. Both give the same
+attribute names; unknown fields are dropped.
+
+Usage:
+    page = SearchPage.from_json(response.content)
+    for result in page.results:
+        print(result.class_title, result.distance_miles)
+
+    python -m gripped_sdk.models --results 5000 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional, Union
+
+from .codec import default_codec
+
+
+def _camel(name):
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+
+def _field(*keys, model=None, many=False):
+    """A model field read from the first of `keys` present (default: camelCase of its name)
+
+    many=True makes a missing list an empty one; with `model`, nested
+    payloads are decoded as that model (or a list of them).
+    """
+    return field(default=None, metadata={'keys': keys, 'model': model, 'many': many})
+
+
+def _compile_decoder(cls):
+    """Generate `decode(payload) -> cls` from the field metadata, once per model"""
+    namespace = {'cls': cls}
+    lines, args = [], []
+    for i, f in enumerate(fields(cls)):
+        keys = _field_keys(f)
+        value = f'v{i}'
+        lines.append(f'    {value} = get({keys[0]!r})')
+        for key in keys[1:]:
+            lines.append(f'    if {value} is None: {value} = get({key!r})')
+        nested, many = f.metadata.get('model'), f.metadata.get('many')
+        if nested is not None:
+            namespace[f'decode{i}'] = nested.decode
+            if many:
+                lines.append(f'    {value} = [decode{i}(x) for x in {value}] if {value} else []')
+            else:
+                lines.append(f'    if {value} is not None: {value} = decode{i}({value})')
+        elif many:
+            lines.append(f'    if {value} is None: {value} = []')
+        args.append(value)
+    source = '\n'.join(['def decode(payload):', '    get = payload.get', *lines,
+                        f'    return cls({", ".join(args)})'])
+    exec(compile(source, f'<{cls.__name__} decoder>', 'exec'), namespace)
+    return namespace['decode']
+
+
+def _msgspec():
+    """The msgspec module, or None if it is not installed"""
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    return msgspec
+
+
+def _field_keys(f):
+    return f.metadata.get('keys') or (_camel(f.name),)
+
+
+def _compile_struct(cls, msgspec):
+    """A msgspec.Struct that decodes `cls`'s JSON directly, with the same attribute names
+
+    Every JSON key is its own field (aliases as '<name>__<key>'); a
+    generated __post_init__ moves the first non-null alias into the
+    attribute, the way the dataclass decoder does. Values are typed Any, so
+    msgspec does no type validation, only the nested models are typed.
+    """
+    specs, rename, lines = [], {}, []
+    for f in fields(cls):
+        keys = _field_keys(f)
+        nested, many = f.metadata.get('model'), f.metadata.get('many')
+        kind = Any
+        if nested is not None:
+            kind = Optional[list[nested.Struct]] if many else Optional[nested.Struct]
+        for i, key in enumerate(keys):
+            name = f.name if i == 0 else f'{f.name}__{key}'
+            specs.append((name, kind, None))
+            rename[name] = key
+            if i:
+                lines.append(f'    if self.{f.name} is None: self.{f.name} = self.{name}')
+        if many:
+            lines.append(f'    if self.{f.name} is None: self.{f.name} = []')
+    namespace = {}
+    if lines:
+        exec(compile('\n'.join(['def __post_init__(self):', *lines]), f'<{cls.__name__} struct>', 'exec'), namespace)
+    # gc=False: decoded payloads hold no reference cycles, so the collector can skip them
+    return msgspec.defstruct(cls.__name__, specs, rename=rename, namespace=namespace, gc=False,
+                             repr_omit_defaults=True, module=cls.__module__)
+
+
+class Model:
+    """Base for the response models; subclasses are declared with @model"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, raw):
+        """Decode bytes, str or an already parsed object into a model (or a list of them)
+
+        Returns instances of cls.Struct when msgspec is installed, else of
+        cls itself. Malformed JSON raises ValueError either way.
+        """
+        if cls.Struct is not None:
+            try:
+                if isinstance(raw, (bytes, bytearray, str)):
+                    return cls._struct_decoder.decode(raw)
+                return cls._msgspec.convert(raw, cls._struct_type)
+            except cls._msgspec.DecodeError as e:
+                # ValidationError too: a nested model that is not an object
+                raise ValueError(str(e)) from None
+        payload = default_codec().loads(raw) if isinstance(raw, (bytes, bytearray, str)) else raw
+        if isinstance(payload, list):
+            decode = cls.decode
+            return [decode(item) for item in payload]
+        return cls.decode(payload)
+
+
+def model(cls):
+    """Make `cls` a slotted dataclass, attach its compiled decoder and, with msgspec, its Struct"""
+    cls = dataclass(slots=True)(cls)
+    cls.decode = staticmethod(_compile_decoder(cls))
+    cls.Struct = None
+    msgspec = _msgspec()
+    if msgspec is not None:
+        cls.Struct = _compile_struct(cls, msgspec)
+        cls._msgspec = msgspec
+        cls._struct_type = Union[cls.Struct, list[cls.Struct]]
+        cls._struct_decoder = msgspec.json.Decoder(cls._struct_type)
+    return cls
+
+
+@model
+class SearchResult(Model):
+    """One row of GET /classes/search"""
+    session_id: str = _field()
+    class_id: str = _field()
+    trainer_id: str = _field()
+    class_title: str = _field('classTitle', 'className')
+    overview: str = _field('classOverview', 'overview')
+    trainer_name: str = _field()
+    trainer_email: str = _field()
+    trainer_phone: str = _field()
+    trainer_bio: str = _field()
+    trainer_specialty: str = _field()
+    trainer_certifications: list = _field(many=True)
+    tags: list = _field('tags', 'classTags', many=True)
+    address: str = _field('address', 'classLocationAddress1')
+    city: str = _field()
+    state: str = _field()
+    zip: str = _field()
+    price: float = _field('price', 'classPrice', 'pricePerClass')
+    currency: str = _field()
+    start_date_time: str = _field('startDateTime', 'startTime')
+    end_date_time: str = _field('endDateTime', 'endTime')
+    max_students: int = _field('maxStudents', 'capacity')
+    current_students: int = _field('currentStudents', 'countRegistered')
+    latitude: float = _field()
+    longitude: float = _field()
+    distance_miles: float = _field()
+
+
+@model
+class SearchPage(Model):
+    """The GET /classes/search envelope"""
+    results: list = _field(model=SearchResult, many=True)
+    total_found: int = _field()
+    search_location: dict = _field()
+    radius_miles: float = _field()
+    date_filter: str = _field()
+
+
+@model
+class Session(Model):
+    """A class session item (POST /classes, GET /classes, trainer classes)"""
+    session_id: str = _field()
+    class_id: str = _field()
+    trainer_id: str = _field()
+    class_name: str = _field('className', 'classTitle')
+    overview: str = _field('overview', 'classOverview')
+    price_per_class: float = _field('pricePerClass', 'classPrice', 'price')
+    currency: str = _field()
+    tags: list = _field('classTags', 'tags', many=True)
+    address: str = _field('classLocationAddress1', 'address')
+    city: str = _field()
+    state: str = _field()
+    zip: str = _field()
+    start_time: str = _field('startTime', 'startDateTime')
+    end_time: str = _field('endTime', 'endDateTime')
+    capacity: int = _field('capacity', 'maxStudents')
+    count_registered: int = _field('countRegistered', 'currentStudents')
+    status: str = _field()
+    latitude: float = _field()
+    longitude: float = _field()
+    created_at: str = _field()
+
+
+@model
+class Enrollment(Model):
+    """POST /classes/{sessionId}/enroll, and each entry of GET /students/me/classes"""
+    student_id: str = _field()
+    session_id: str = _field()
+    status: str = _field()
+    enrolled_at: str = _field()
+    created_at: str = _field()
+    cancelled_at: str = _field()
+    session: Session = _field('class', model=Session)
+
+
+@model
+class Profile(Model):
+    """GET /profile/me and GET /trainers/{trainerId}/profile"""
+    user_id: str = _field()
+    role: str = _field()
+    status: str = _field()
+    first_name: str = _field()
+    last_name: str = _field()
+    display_name: str = _field()
+    email: str = _field()
+    phone: str = _field()
+    bio: str = _field()
+    specialty: str = _field()
+    certifications: list = _field(many=True)
+    images: list = _field(many=True)
+    id_image_key: str = _field()
+    created_at: str = _field()
+    updated_at: str = _field()
+
+
+@model
+class Message(Model):
+    """POST /classes/{sessionId}/messages"""
+    message_id: str = _field()
+    session_id: str = _field()
+    trainer_id: str = _field()
+    message_text: str = _field()
+    created_at: str = _field()
+
+
+@model
+class Rating(Model):
+    """GET/POST /ratings"""
+    student_id: str = _field()
+    trainer_id: str = _field()
+    rating: int = _field()
+    feedback: str = _field()
+    is_anonymous: bool = _field()
+    created_at: str = _field()
+
+
+def student_classes(raw):
+    """Enrollments (each with its session) from GET /students/me/classes"""
+    payload = default_codec().loads(raw) if isinstance(raw, (bytes, bytearray, str)) else raw
+    return Enrollment.from_json([dict(entry['enrollment'], **{'class': entry['class']})
+                                 for entry in payload.get('classes', [])])
+
+
+def _search_payload(count):
+    from .emulator import EmulatorState, _search_result, zip_coordinates
+
+    state = EmulatorState()
+    state.seed(trainers=max(1, count // 20), sessions_per_trainer=20)
+    latitude, longitude = zip_coordinates('75454')
+    results = [_search_result(item, state.profiles[item['trainerId']], 1.5) for item in state.sessions.values()]
+    return json.dumps({'results': results[:count], 'totalFound': count, 'radiusMiles': 30.0,
+                       'searchLocation': {'latitude': latitude, 'longitude': longitude, 'zipCode': '75454'}}).encode()
+
+
+def _retained_bytes(build):
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def benchmark(count=5000, repeat=5):
+    """Dicts vs models on one large search payload: decode time, field access time, retained memory"""
+    raw = _search_payload(count)
+
+    def best(function):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def read_dicts(page):
+        for r in page['results']:
+            (r.get('classTitle'), r.get('classOverview') or r.get('overview'), r.get('trainerName'),
+             r.get('price') or r.get('pricePerClass'), r.get('distanceMiles'), r.get('maxStudents'),
+             r.get('currentStudents'), r.get('startDateTime'))
+
+    def read_models(page):
+        for r in page.results:
+            (r.class_title, r.overview, r.trainer_name, r.price, r.distance_miles, r.max_students,
+             r.current_students, r.start_date_time)
+
+    def decode_dataclasses():
+        return SearchPage.decode(default_codec().loads(raw))
+
+    dict_page, model_page = json.loads(raw), SearchPage.from_json(raw)
+    stats = {
+        'results': count,
+        'payloadBytes': len(raw),
+        'modelType': 'msgspec' if SearchPage.Struct is not None else 'dataclass',
+        'dictDecodeMs': round(best(lambda: json.loads(raw)) * 1000, 2),
+        'modelDecodeMs': round(best(lambda: SearchPage.from_json(raw)) * 1000, 2),
+        'dictAccessMs': round(best(lambda: read_dicts(dict_page)) * 1000, 2),
+        'modelAccessMs': round(best(lambda: read_models(model_page)) * 1000, 2),
+        # Parsed strings are shared by both, so retained memory is what outlives json.loads
+        'dictRetainedBytes': _retained_bytes(lambda: json.loads(raw)),
+        'modelRetainedBytes': _retained_bytes(lambda: SearchPage.from_json(raw)),
+        'dictRowBytes': sys.getsizeof(dict_page['results'][0]),
+        'modelRowBytes': sys.getsizeof(model_page.results[0]),
+    }
+    if SearchPage.Struct is not None:
+        # The fallback path, for comparison
+        dataclass_page = decode_dataclasses()
+        stats.update({
+            'dataclassDecodeMs': round(best(decode_dataclasses) * 1000, 2),
+            'dataclassAccessMs': round(best(lambda: read_models(dataclass_page)) * 1000, 2),
+            'dataclassRetainedBytes': _retained_bytes(decode_dataclasses),
+            'dataclassRowBytes': sys.getsizeof(dataclass_page.results[0]),
+        })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark typed response models against plain dicts')
+    parser.add_argument('--results', type=int, default=5000, help='search results in the payload')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stats = benchmark(args.results, args.repeat)
+    print(f"📦 Search payload: {stats['results']} results, {stats['payloadBytes'] / 1e6:.2f} MB")
+    print(f"{'':>9} {'decode ms':>10} {'access ms':>10} {'retained MB':>12} {'row bytes':>10}")
+    rows = [('dicts', 'dict'), (stats['modelType'], 'model')]
+    if 'dataclassDecodeMs' in stats:
+        rows.append(('dataclass', 'dataclass'))
+    for label, prefix in rows:
+        print(f"{label:>9} {stats[prefix + 'DecodeMs']:>10.2f} {stats[prefix + 'AccessMs']:>10.2f} "
+              f"{stats[prefix + 'RetainedBytes'] / 1e6:>12.2f} {stats[prefix + 'RowBytes']:>10}")
+
+
+if __name__ == '__main__':
+    main()
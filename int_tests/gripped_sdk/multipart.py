@@ -0,0 +1,289 @@
+"""
+Resumable multipart upload for large media
+A single presigned PUT restarts from zero when the connection drops. Here
+the object is split into parts, each part gets its own presigned URL, parts
+upload in parallel, and progress (upload ID, part URLs, finished part
+ETags) is written to a resume file after every part. Running the same
+upload again picks up the parts that are still missing, asking for fresh
+URLs if the old ones have expired, and then completes the upload.
+
+The multipart endpoints are served by the local emulator; the deployed API
+would need the same four routes (start, presign parts, complete, abort).
+
+Usage:
+    python -m gripped_sdk.multipart upload scan.jpg --emulator --part-size-mb 8 --workers 4
+    python -m gripped_sdk.multipart bench --emulator --sizes-mb 1,8,32,128 --s3-bandwidth-mbps 40
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .client import GrippedClient
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+# Re-presign part URLs this many seconds before they expire
+URL_EXPIRY_MARGIN = 60
+
+
+class FilePart:
+    """Read-only window onto [offset, offset + length) of a file
+
+    Has a length and a read(), so requests streams it from disk in blocks
+    instead of loading the part into memory.
+    """
+
+    def __init__(self, path, offset, length):
+        self.length = length
+        self.remaining = length
+        self._file = open(path, 'rb')
+        self._file.seek(offset)
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def _url_expires_at(url, issued_at):
+    params = dict(parse_qsl(urlsplit(url).query))
+    return issued_at + int(params.get('X-Amz-Expires', 900))
+
+
+class ResumableUpload:
+    """Multipart upload of one file with a resume file next to it
+
+    The resume file (default '<path>.upload.json') is only trusted while the
+    file's size and mtime are unchanged; it is deleted once the upload
+    completes. Parts are retried on their own; a 403 gets a fresh part URL.
+    """
+
+    def __init__(self, client, path, content_type='image/jpeg', part_size=DEFAULT_PART_SIZE, max_workers=4,
+                 retries=3, backoff=0.25, resume_path=None, sleep=time.sleep):
+        self.client = client
+        self.path = os.path.abspath(path)
+        self.content_type = content_type
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.resume_path = resume_path or self.path + '.upload.json'
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.state = None
+
+    # Resume file
+    def _fingerprint(self):
+        stat = os.stat(self.path)
+        return {'file': self.path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def _load(self):
+        if not os.path.exists(self.resume_path):
+            return None
+        with open(self.resume_path) as f:
+            state = json.load(f)
+        fingerprint = self._fingerprint()
+        if any(state.get(field) != value for field, value in fingerprint.items()):
+            # The file changed since the interrupted run; its parts are useless
+            self.client.abort_multipart_upload(state['uploadId'])
+            return None
+        return state
+
+    def _save(self):
+        # Parts finish on several threads; one writer at a time, atomically replaced
+        with self._save_lock:
+            with self.lock:
+                data = json.dumps(self.state, indent=1)
+            temporary = self.resume_path + '.tmp'
+            with open(temporary, 'w') as f:
+                f.write(data)
+            os.replace(temporary, self.resume_path)
+
+    # Upload
+    def _start(self):
+        fingerprint = self._fingerprint()
+        response = self.client.start_multipart_upload(fingerprint['size'], self.content_type, self.part_size)
+        response.raise_for_status()
+        started = response.json()
+        issued_at = time.time()
+        self.state = dict(fingerprint, uploadId=started['uploadId'], key=started['key'],
+                          imageId=started['imageId'], partSize=started['partSize'], done={},
+                          urls={str(p['partNumber']): {'url': p['uploadUrl'], 'issuedAt': issued_at}
+                                for p in started['parts']})
+        self._save()
+
+    def _refresh_urls(self, part_numbers):
+        response = self.client.presign_upload_parts(self.state['uploadId'], [int(n) for n in part_numbers])
+        response.raise_for_status()
+        issued_at = time.time()
+        with self.lock:
+            for part in response.json()['parts']:
+                self.state['urls'][str(part['partNumber'])] = {'url': part['uploadUrl'], 'issuedAt': issued_at}
+
+    def _upload_part(self, number):
+        offset = (int(number) - 1) * self.state['partSize']
+        length = min(self.state['partSize'], self.state['size'] - offset)
+        attempts, refreshed, error = 0, False, None
+        while True:
+            attempts += 1
+            with self.lock:
+                url = self.state['urls'][number]['url']
+            body = FilePart(self.path, offset, length)
+            try:
+                response = self.client.upload_part(url, body)
+                status, error = response.status_code, None if response.ok else response.text[:200]
+            except requests.RequestException as e:
+                status, error = None, str(e)
+            finally:
+                body.close()
+            if status == 200:
+                with self.lock:
+                    self.state['done'][number] = response.headers['ETag'].strip('"')
+                self._save()
+                return length
+            if status == 403 and not refreshed:
+                self._refresh_urls([number])
+                refreshed = True
+            elif attempts > self.retries or (status is not None and status < 500 and status != 403):
+                raise RuntimeError(f'Part {number} failed after {attempts} attempt(s): {status} {error}')
+            self.sleep(self.backoff * 2 ** (attempts - 1))
+
+    def run(self):
+        """Upload (or finish uploading) the file; returns a result dict"""
+        started = time.perf_counter()
+        self.state = self._load()
+        resumed = self.state is not None
+        if not resumed:
+            self._start()
+        pending = [n for n in self.state['urls'] if n not in self.state['done']]
+        resumed_parts = len(self.state['done']) if resumed else 0
+
+        now = time.time()
+        stale = [n for n in pending
+                 if _url_expires_at(self.state['urls'][n]['url'], self.state['urls'][n]['issuedAt'])
+                 - URL_EXPIRY_MARGIN <= now]
+        if stale:
+            self._refresh_urls(stale)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            uploaded_bytes = sum(pool.map(self._upload_part, pending))
+
+        parts = [{'partNumber': int(n), 'etag': etag}
+                 for n, etag in sorted(self.state['done'].items(), key=lambda item: int(item[0]))]
+        response = self.client.complete_multipart_upload(self.state['uploadId'], parts)
+        response.raise_for_status()
+        completed = response.json()
+        os.remove(self.resume_path)
+        elapsed = time.perf_counter() - started
+        return {
+            'key': completed['key'],
+            'imageId': completed['imageId'],
+            'etag': completed['etag'],
+            'size': self.state['size'],
+            'parts': len(parts),
+            'resumedParts': resumed_parts,
+            'uploadedBytes': uploaded_bytes,
+            'seconds': round(elapsed, 3),
+            'mbPerSecond': round(uploaded_bytes / 1e6 / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def single_put(client, path, content_type='image/jpeg'):
+    """Upload `path` with one presigned PUT (the existing flow); returns seconds"""
+    started = time.perf_counter()
+    response = client.get_presigned_urls(1, content_type)
+    response.raise_for_status()
+    url = response.json()['presignedUrls'][0]['uploadUrl']
+    with open(path, 'rb') as f:
+        client.put_object(url, f, content_type).raise_for_status()
+    return time.perf_counter() - started
+
+
+def benchmark(client, sizes_mb, part_size=DEFAULT_PART_SIZE, max_workers=4, directory=None):
+    """Single PUT vs multipart for each object size; returns rows of timings"""
+    rows = []
+    for size_mb in sizes_mb:
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.bin', delete=False) as f:
+            f.write(os.urandom(int(size_mb * 1024 * 1024)))
+            path = f.name
+        try:
+            single = single_put(client, path)
+            result = ResumableUpload(client, path, part_size=part_size, max_workers=max_workers).run()
+        finally:
+            os.remove(path)
+        rows.append({'sizeMb': size_mb, 'parts': result['parts'], 'singlePutSeconds': round(single, 3),
+                     'multipartSeconds': result['seconds'], 'speedup': round(single / result['seconds'], 2)})
+    return rows
+
+
+def main():
+    from .emulator import Emulator, make_token
+
+    parser = argparse.ArgumentParser(description='Resumable multipart uploads to presigned part URLs')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('upload', 'bench'):
+        command = sub.add_parser(name)
+        command.add_argument('--part-size-mb', type=float, default=DEFAULT_PART_SIZE / 1024 / 1024)
+        command.add_argument('--workers', type=int, default=4)
+        command.add_argument('--emulator', action='store_true')
+        command.add_argument('--s3-bandwidth-mbps', type=float, help='emulator per-request S3 throughput cap')
+        command.add_argument('--base-url')
+        command.add_argument('--token')
+        if name == 'upload':
+            command.add_argument('file')
+            command.add_argument('--content-type', default='image/jpeg')
+            command.add_argument('--resume-file')
+        else:
+            command.add_argument('--sizes-mb', default='1,8,32,128')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator:
+        bandwidth = args.s3_bandwidth_mbps * 1e6 if args.s3_bandwidth_mbps else None
+        emulator = Emulator(s3_bandwidth=bandwidth).start()
+        base_url, token = emulator.base_url, make_token('multipart-user')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+    part_size = int(args.part_size_mb * 1024 * 1024)
+
+    try:
+        with GrippedClient(token, base_url=base_url) as client:
+            if args.command == 'upload':
+                upload = ResumableUpload(client, args.file, args.content_type, part_size, args.workers,
+                                         resume_path=args.resume_file)
+                result = upload.run()
+                resumed = f", {result['resumedParts']} resumed" if result['resumedParts'] else ''
+                print(f"✅ {result['key']}: {result['size'] / 1e6:.1f} MB in {result['parts']} parts{resumed}, "
+                      f"{result['seconds']:.2f}s ({result['mbPerSecond']:.1f} MB/s)")
+            else:
+                sizes = [float(s) for s in args.sizes_mb.split(',')]
+                print(f"📦 Single PUT vs multipart ({args.part_size_mb:g} MB parts, {args.workers} workers)")
+                print(f"{'size MB':>8} {'parts':>6} {'single s':>9} {'multipart s':>12} {'speedup':>8}")
+                for row in benchmark(client, sizes, part_size, args.workers):
+                    print(f"{row['sizeMb']:>8g} {row['parts']:>6} {row['singlePutSeconds']:>9.2f} "
+                          f"{row['multipartSeconds']:>12.2f} {row['speedup']:>7.2f}x")
+    finally:
+        if emulator:
+            emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Optional dependencies of the columnar tooling, imported on first use
+harvest, export and geoverify work on NumPy arrays and Parquet files, but
+the rest of the SDK needs neither, so they are imported only when one of
+those tools runs, with an install hint if they are missing.
+
+Usage:
+    np = require_numpy()
+    pa = require_pyarrow()    # pyarrow.parquet is imported too
+"""
+
+
+def require_numpy():
+    """The numpy module, or RuntimeError with an install hint"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('Columnar analysis needs NumPy: pip install numpy') from None
+    return numpy
+
+
+def require_pyarrow():
+    """The pyarrow module with pyarrow.parquet loaded, or RuntimeError with an install hint"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError('Parquet support needs pyarrow: pip install pyarrow') from None
+    return pyarrow
@@ -0,0 +1,223 @@
+"""
+Concurrent trainer detail prefetch for search results
+After a search the app fetches, for every result, the trainer's profile,
+upcoming classes and rating summary: 3N requests one after another.
+TrainerPrefetcher deduplicates the trainer IDs on a result page and
+fetches each trainer's details once, on a bounded thread pool. It then
+joins them back onto the results. A page then costs about
+3 * trainers / max_workers round trips of latency instead of 3N; with
+enough workers, that is one round trip.
+
+Usage:
+    with TrainerPrefetcher(client, max_workers=8) as prefetcher:
+        records = prefetcher.join(client.search_classes('75454', 30).json())
+    for record in records:
+        print(record['result']['classTitle'], record['profile']['displayName'], record['rating'])
+
+    python -m gripped_sdk.prefetch --emulator --trainers 30 --latency 0.02
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import GrippedClient
+
+DETAILS = ('profile', 'classes', 'rating')
+DEFAULT_WORKERS = 8
+
+
+def _trainer_id(result):
+    return result.get('trainerId') if isinstance(result, dict) else getattr(result, 'trainer_id', None)
+
+
+def widen_connection_pool(session, size, prefix='https://'):
+    """Let `size` threads share the session's connections to `prefix` without discarding any
+
+    requests keeps 10 connections per host by default; more concurrent
+    callers open extra connections and then throw them away.
+    """
+    adapter = session.get_adapter(prefix)
+    if getattr(adapter, '_pool_maxsize', size) < size:
+        session.mount(prefix, type(adapter)(pool_maxsize=size, max_retries=adapter.max_retries))
+
+
+class TrainerPrefetcher:
+    """Fetches profile, classes and rating summary for every distinct trainer on a result page
+
+    `details` picks which of the three to fetch. A trainer without
+    ratings has rating None; other failures leave the detail as None and
+    are listed under the record's 'errors'.
+    """
+
+    def __init__(self, client, max_workers=DEFAULT_WORKERS, details=DETAILS, days_ahead=90):
+        unknown = set(details) - set(DETAILS)
+        if unknown:
+            raise ValueError(f"Unknown detail(s) {', '.join(sorted(unknown))} (choose from {', '.join(DETAILS)})")
+        self.client = client
+        self.details = tuple(details)
+        self.days_ahead = days_ahead
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        widen_connection_pool(client.session, max_workers, client.base_url.split('//')[0] + '//')
+        self.lock = threading.Lock()
+        self.stats = {'pages': 0, 'results': 0, 'trainers': 0, 'requests': 0, 'requestsSaved': 0, 'errors': 0,
+                      'seconds': 0.0}
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fetch(self, detail, trainer_id):
+        """(value, error) for one detail of one trainer"""
+        try:
+            if detail == 'profile':
+                response = self.client.get_trainer_profile(trainer_id)
+            elif detail == 'classes':
+                response = self.client.get_trainer_classes(trainer_id, self.days_ahead)
+            else:
+                response = self.client.get_trainer_rating(trainer_id)
+        except requests.RequestException as e:
+            return None, str(e)
+        if response.status_code == 200:
+            body = response.json()
+            return (body.get('classes', []) if detail == 'classes' else body), None
+        if detail == 'rating' and response.status_code == 404:
+            return None, None
+        return None, f'{response.status_code} {response.text[:200]}'
+
+    def fetch(self, trainer_ids):
+        """{trainerId: {'profile', 'classes', 'rating', 'errors'}} for distinct trainer IDs, fetched concurrently"""
+        trainer_ids = list(dict.fromkeys(t for t in trainer_ids if t))
+        futures = {(trainer_id, detail): self.pool.submit(self._fetch, detail, trainer_id)
+                   for trainer_id in trainer_ids for detail in self.details}
+        joined = {trainer_id: {'errors': {}} for trainer_id in trainer_ids}
+        for (trainer_id, detail), future in futures.items():
+            value, error = future.result()
+            joined[trainer_id][detail] = value
+            if error:
+                joined[trainer_id]['errors'][detail] = error
+        with self.lock:
+            self.stats['requests'] += len(futures)
+            self.stats['errors'] += sum(len(d['errors']) for d in joined.values())
+        return joined
+
+    def join(self, results):
+        """One record per search result: {'result', 'trainerId', 'profile', 'classes', 'rating', 'errors'}
+
+        `results` is a search body, its 'results' list, or a
+        models.SearchPage. Results of the same trainer share the detail
+        objects.
+        """
+        started = time.perf_counter()
+        if isinstance(results, dict):
+            results = results.get('results', [])
+        elif hasattr(results, 'results'):
+            results = results.results
+        results = list(results)
+        details = self.fetch(_trainer_id(r) for r in results)
+        records = []
+        for result in results:
+            trainer_id = _trainer_id(result)
+            record = {'result': result, 'trainerId': trainer_id}
+            record.update(details.get(trainer_id) or {'errors': {}})
+            records.append(record)
+        with self.lock:
+            self.stats['pages'] += 1
+            self.stats['results'] += len(results)
+            self.stats['trainers'] += len(details)
+            self.stats['requestsSaved'] += (len(results) - len(details)) * len(self.details)
+            self.stats['seconds'] += time.perf_counter() - started
+        return records
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+def join_trainer_details(client, results, max_workers=DEFAULT_WORKERS, details=DETAILS):
+    """TrainerPrefetcher(client).join(results) with a pool that lives for one page"""
+    with TrainerPrefetcher(client, max_workers, details) as prefetcher:
+        return prefetcher.join(results)
+
+
+def sequential_details(client, results, days_ahead=90):
+    """What the app does today: three requests per result, one after another"""
+    records = []
+    for result in results:
+        trainer_id = _trainer_id(result)
+        profile = client.get_trainer_profile(trainer_id)
+        classes = client.get_trainer_classes(trainer_id, days_ahead)
+        rating = client.get_trainer_rating(trainer_id)
+        records.append({
+            'result': result,
+            'trainerId': trainer_id,
+            'profile': profile.json() if profile.status_code == 200 else None,
+            'classes': classes.json().get('classes', []) if classes.status_code == 200 else None,
+            'rating': rating.json() if rating.status_code == 200 else None,
+        })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render a search page with concurrent trainer detail prefetch')
+    parser.add_argument('--zip', default='75454')
+    parser.add_argument('--radius', default='30')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--limit', type=int, help='only the first N results (one page)')
+    parser.add_argument('--compare', action='store_true', help='also time the sequential 3N requests')
+    parser.add_argument('--emulator', action='store_true', help='run against a seeded local emulator')
+    parser.add_argument('--trainers', type=int, default=30)
+    parser.add_argument('--sessions-per-trainer', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.02, help='emulator service time in seconds')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator:
+        from .emulator import Emulator, make_token
+        emulator = Emulator(latency=args.latency).start()
+        emulator.state.seed(args.trainers, args.sessions_per_trainer, zip_codes=(args.zip,))
+        trainer_ids = sorted({s['trainerId'] for s in emulator.state.sessions.values()})
+        for i, trainer_id in enumerate(trainer_ids[::2]):
+            with GrippedClient(make_token(f'rater-{i}'), base_url=emulator.base_url) as rater:
+                rater.submit_rating(trainer_id, 3 + i % 3)
+        base_url, token = emulator.base_url, make_token('browsing-student')
+        args.compare = True
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    try:
+        with GrippedClient(token, base_url=base_url) as client:
+            response = client.search_classes(args.zip, args.radius)
+            response.raise_for_status()
+            results = response.json()['results'][:args.limit]
+            with TrainerPrefetcher(client, args.workers) as prefetcher:
+                records = prefetcher.join(results)
+                stats = prefetcher.summary()
+            print(f"⚡ prefetch: {len(records)} results, {stats['trainers']} trainers, {stats['requests']} requests "
+                  f"({stats['requestsSaved']} saved by dedup), {stats['seconds'] * 1000:.1f} ms, "
+                  f"{stats['errors']} errors")
+            if args.compare:
+                started = time.perf_counter()
+                sequential_details(client, results)
+                elapsed = time.perf_counter() - started
+                print(f"🐢 sequential: {3 * len(results)} requests, {elapsed * 1000:.1f} ms "
+                      f"({elapsed / max(stats['seconds'], 1e-9):.1f}x slower)")
+    finally:
+        if emulator:
+            emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Recurring schedules: an RRULE-style expander and chunked class creation
+A recurring class used to mean writing every session into the 'sessions'
+list by hand. Recurrence describes the schedule instead, for example
+weekly on Mon/Wed at 18:00 America/Chicago until a date, minus holidays.
+It expands lazily into session dicts: local wall-clock times are
+converted to UTC one occurrence at a time, so a class stays at 18:00
+local across DST changes.
+
+create_schedule() turns any session iterable into POST /classes requests
+of at most chunk_size sessions. Each chunk is validated locally and
+posted on a small thread pool. The iterable is only advanced while fewer
+than max_in_flight chunks are outstanding (backpressure), so a year of
+sessions takes one call and never one oversized request.
+
+Usage:
+    rule = Recurrence('2026-11-02T18:00', 60, by_weekday=('MO', 'WE'), until='2027-10-31',
+                      exceptions=['2026-11-25', '2026-12-23'], tz='America/Chicago')
+    summary = create_schedule(client, {'className': 'Evening HIIT', 'zip': '75454', 'pricePerClass': 20},
+                              rule.sessions(capacity=12))
+
+    python -m gripped_sdk.recurrence --rrule "FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20271031" --preview 5
+    python -m gripped_sdk.recurrence --emulator --rrule "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=104" --workers 4
+"""
+
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+import requests
+
+from .client import GrippedClient
+from .validation import MAX_SESSIONS, format_errors, validate_class_payload
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+DEFAULT_CHUNK_SESSIONS = 100
+
+
+def _zone(name):
+    if name in (None, 'UTC', 'Z'):
+        return timezone.utc
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+def _stamp(moment):
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_moment(value, zone):
+    """A naive local datetime (or a date) from a date/datetime, ISO text or RRULE text (20271031, ...T180000Z)"""
+    if isinstance(value, str):
+        text = value.strip()
+        if text.isdigit() and len(text) == 8:
+            return datetime.strptime(text, '%Y%m%d').date()
+        if len(text) >= 15 and text[8] == 'T' and text[:8].isdigit():
+            parsed = datetime.strptime(text.rstrip('Z'), '%Y%m%dT%H%M%S')
+            value = parsed.replace(tzinfo=timezone.utc) if text.endswith('Z') else parsed
+        elif len(text) == 10:
+            return date.fromisoformat(text)
+        else:
+            value = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(zone).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return value
+    raise ValueError(f'Not a date or time: {value!r}')
+
+
+def _add_months(day, months):
+    """The same day-of-month `months` later, or None if that month is too short"""
+    month = day.month - 1 + months
+    try:
+        return day.replace(year=day.year + month // 12, month=month % 12 + 1)
+    except ValueError:
+        return None
+
+
+class Recurrence:
+    """A recurring schedule in the spirit of RFC 5545 RRULEs
+
+    `start` is the first occurrence's local wall-clock time in `tz` (naive,
+    ISO text, or aware and converted to `tz`). `until` (a date, inclusive,
+    or a local datetime) and `count` bound the schedule; with neither it
+    never ends. `exceptions` are local dates to skip entirely or local
+    datetimes to skip one occurrence (EXDATE); as in RFC 5545 they are
+    removed after `count` is applied. Local times that DST skips over are
+    shifted forward by the gap.
+    """
+
+    def __init__(self, start, duration_minutes=60, freq='WEEKLY', interval=1, by_weekday=None, until=None,
+                 count=None, exceptions=(), tz='UTC'):
+        freq = freq.upper()
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}' (choose from {', '.join(FREQUENCIES)})")
+        if interval < 1:
+            raise ValueError('interval must be at least 1')
+        if duration_minutes <= 0:
+            raise ValueError('duration_minutes must be positive')
+        self.zone = _zone(tz)
+        self.start = _parse_moment(start, self.zone)
+        if not isinstance(self.start, datetime):
+            raise ValueError('start needs a time of day, e.g. 2026-11-02T18:00')
+        self.duration = timedelta(minutes=duration_minutes)
+        self.freq = freq
+        self.interval = interval
+        weekdays = [d.upper() for d in by_weekday] if by_weekday else []
+        unknown = [d for d in weekdays if d not in WEEKDAYS]
+        if unknown:
+            raise ValueError(f"Unknown weekday(s) {', '.join(unknown)} (use {', '.join(WEEKDAYS)})")
+        if weekdays and freq == 'MONTHLY':
+            raise ValueError('BYDAY is only supported with DAILY and WEEKLY')
+        if freq == 'WEEKLY' and not weekdays:
+            weekdays = [WEEKDAYS[self.start.weekday()]]
+        self.weekdays = sorted({WEEKDAYS.index(d) for d in weekdays})
+        until = _parse_moment(until, self.zone) if until is not None else None
+        if isinstance(until, date) and not isinstance(until, datetime):
+            until = datetime.combine(until, datetime.max.time())
+        self.until = until
+        self.count = count
+        self.skip_days, self.skip_times = set(), set()
+        for exception in exceptions:
+            moment = _parse_moment(exception, self.zone)
+            if isinstance(moment, datetime):
+                self.skip_times.add(moment)
+            else:
+                self.skip_days.add(moment)
+
+    @classmethod
+    def from_rrule(cls, rule, start, duration_minutes=60, exceptions=(), tz='UTC'):
+        """From RRULE text such as 'FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20271031' (FREQ, INTERVAL, BYDAY, UNTIL, COUNT)"""
+        parts = {}
+        for part in rule.strip().removeprefix('RRULE:').split(';'):
+            if part:
+                key, _, value = part.partition('=')
+                parts[key.strip().upper()] = value.strip()
+        unsupported = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT', 'WKST'}
+        if unsupported:
+            raise ValueError(f"Unsupported RRULE part(s): {', '.join(sorted(unsupported))}")
+        if 'FREQ' not in parts:
+            raise ValueError('RRULE needs FREQ')
+        return cls(start, duration_minutes, freq=parts['FREQ'], interval=int(parts.get('INTERVAL', 1)),
+                   by_weekday=parts['BYDAY'].split(',') if parts.get('BYDAY') else None,
+                   until=parts.get('UNTIL'), count=int(parts['COUNT']) if 'COUNT' in parts else None,
+                   exceptions=exceptions, tz=tz)
+
+    def _local_days(self):
+        """Candidate local dates, in order and unbounded"""
+        first = self.start.date()
+        if self.freq == 'MONTHLY':
+            for k in itertools.count():
+                day = _add_months(first, k * self.interval)
+                if day is not None:
+                    yield day
+        elif self.freq == 'DAILY':
+            for k in itertools.count():
+                day = first + timedelta(days=k * self.interval)
+                if not self.weekdays or day.weekday() in self.weekdays:
+                    yield day
+        else:
+            week = first - timedelta(days=first.weekday())
+            for k in itertools.count():
+                for weekday in self.weekdays:
+                    day = week + timedelta(days=k * 7 * self.interval + weekday)
+                    if day >= first:
+                        yield day
+
+    def occurrences(self):
+        """(start, end) aware UTC datetimes, lazily and in order"""
+        produced = 0
+        for day in self._local_days():
+            local = datetime.combine(day, self.start.time())
+            if self.until is not None and local > self.until:
+                return
+            if self.count is not None and produced >= self.count:
+                return
+            produced += 1
+            if day in self.skip_days or local in self.skip_times:
+                continue
+            begins = local.replace(tzinfo=self.zone).astimezone(timezone.utc)
+            yield begins, begins + self.duration
+
+    __iter__ = occurrences
+
+    def sessions(self, capacity):
+        """POST /classes session dicts (startDateTime/endDateTime/capacity), lazily"""
+        for begins, ends in self.occurrences():
+            yield {'startDateTime': _stamp(begins), 'endDateTime': _stamp(ends), 'capacity': capacity}
+
+
+def chunked(iterable, size):
+    """Lists of at most `size` items, pulling from `iterable` only as each list is needed"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def create_schedule(client, class_fields, sessions, chunk_size=DEFAULT_CHUNK_SESSIONS, max_workers=4,
+                    max_in_flight=None, existing_sessions=(), validate=True, stop_on_error=True, retries=2,
+                    backoff=0.5, sleep=time.sleep):
+    """Create every session in `sessions` with POST /classes, chunk_size sessions per request
+
+    `class_fields` are the shared class fields (className, zip, price...);
+    `sessions` is any iterable of session dicts, e.g. Recurrence.sessions().
+    At most `max_in_flight` chunks (default 2 * max_workers) are expanded
+    and outstanding at once. Chunks are validated locally first, against
+    `existing_sessions` too when given. A chunk rejected locally or by the
+    API stops further submissions unless stop_on_error=False. A 429 is
+    retried with backoff; other failures are not, since a POST that failed
+    with a 5xx may still have been written.
+
+    POST /classes cannot append to an existing class, so every chunk gets
+    its own classId; the summary lists them all in schedule order.
+    """
+    if not 1 <= chunk_size <= MAX_SESSIONS:
+        raise ValueError(f'chunk_size must be between 1 and {MAX_SESSIONS}')
+    max_in_flight = max_in_flight or 2 * max_workers
+    slots = threading.BoundedSemaphore(max_in_flight)
+    failed = threading.Event()
+    lock = threading.Lock()
+    stats = {'retries': 0}
+    started = time.perf_counter()
+
+    def post(number, payload):
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = client.create_class(payload)
+                status, error = response.status_code, None if response.status_code == 200 else response.text[:200]
+            except requests.RequestException as e:
+                response, status, error = None, None, str(e)
+            if status != 429 or attempts > retries:
+                break
+            with lock:
+                stats['retries'] += 1
+            sleep(backoff * 2 ** (attempts - 1))
+        result = {'chunk': number, 'sessions': len(payload['sessions']), 'status': status, 'error': error,
+                  'attempts': attempts, 'classId': None, 'created': []}
+        if status == 200:
+            data = response.json()
+            result['classId'], result['created'] = data.get('classId'), data.get('sessions', [])
+        elif stop_on_error:
+            failed.set()
+        return result
+
+    def release(future):
+        slots.release()
+
+    results, submitted = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for number, chunk in enumerate(chunked(sessions, chunk_size)):
+            payload = dict(class_fields, sessions=chunk)
+            errors = validate_class_payload(payload, existing_sessions, max_sessions=chunk_size) if validate else []
+            if errors:
+                submitted.append({'chunk': number, 'sessions': len(chunk), 'status': None, 'attempts': 0,
+                                  'error': format_errors(errors), 'classId': None, 'created': []})
+                if stop_on_error:
+                    break
+                continue
+            # Backpressure: expand the next chunk only once a slot frees up
+            slots.acquire()
+            if failed.is_set():
+                slots.release()
+                break
+            future = pool.submit(post, number, payload)
+            future.add_done_callback(release)
+            submitted.append(future)
+        for entry in submitted:
+            results.append(entry if isinstance(entry, dict) else entry.result())
+
+    created = [session for result in results for session in result['created']]
+    failures = [{k: result[k] for k in ('chunk', 'sessions', 'status', 'error')}
+                for result in results if result['classId'] is None]
+    return {
+        'ok': not failures,
+        'chunks': len(results),
+        'classIds': [result['classId'] for result in results if result['classId']],
+        'sessions': created,
+        'sessionCount': len(created),
+        'failed': failures,
+        'retries': stats['retries'],
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _next_monday(hour):
+    today = datetime.now().date()
+    return datetime.combine(today + timedelta(days=7 - today.weekday()), datetime.min.time()).replace(hour=hour)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Expand a recurring schedule and create it in chunks')
+    parser.add_argument('--rrule', default='FREQ=WEEKLY;BYDAY=MO,WE;COUNT=104',
+                        help='RRULE (FREQ, INTERVAL, BYDAY, UNTIL, COUNT)')
+    parser.add_argument('--start', help='first local start time (default: next Monday 18:00)')
+    parser.add_argument('--duration', type=int, default=60, help='minutes per session')
+    parser.add_argument('--tz', default='America/Chicago')
+    parser.add_argument('--except', dest='exceptions', default='', help='comma-separated local dates to skip')
+    parser.add_argument('--capacity', type=int, default=12)
+    parser.add_argument('--class-name', default='Recurring Evening HIIT')
+    parser.add_argument('--zip', default='75454')
+    parser.add_argument('--price', type=float, default=20.0)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SESSIONS)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-in-flight', type=int)
+    parser.add_argument('--preview', type=int, help='print the first N sessions and the total, create nothing')
+    parser.add_argument('--emulator', action='store_true', help='create the schedule on a local emulator')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    args = parser.parse_args()
+
+    exceptions = [d for d in args.exceptions.split(',') if d]
+    rule = Recurrence.from_rrule(args.rrule, args.start or _next_monday(18), args.duration, exceptions, args.tz)
+    if rule.until is None and rule.count is None:
+        parser.error('the RRULE needs UNTIL or COUNT to create a finite schedule')
+
+    if args.preview is not None:
+        started = time.perf_counter()
+        total = 0
+        for session in rule.sessions(args.capacity):
+            if total < args.preview:
+                print(f"   {session['startDateTime']} - {session['endDateTime']}")
+            total += 1
+        print(f"🗓️  {total} sessions expanded in {(time.perf_counter() - started) * 1000:.2f} ms")
+        return
+
+    emulator = None
+    if args.emulator:
+        from .emulator import Emulator, make_token
+        emulator = Emulator().start()
+        base_url, token = emulator.base_url, make_token('recurring-trainer')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    class_fields = {'className': args.class_name, 'zip': args.zip, 'pricePerClass': args.price,
+                    'currency': 'USD', 'classTags': ['recurring']}
+    try:
+        with GrippedClient(token, base_url=base_url) as client:
+            summary = create_schedule(client, class_fields, rule.sessions(args.capacity), args.chunk_size,
+                                      args.workers, args.max_in_flight)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    print(f"{'✅' if summary['ok'] else '❌'} {summary['sessionCount']} sessions created in {summary['chunks']} "
+          f"chunk(s) of up to {args.chunk_size} in {summary['seconds']:.2f}s ({summary['retries']} retries)")
+    if summary['sessions']:
+        print(f"🗓️  {summary['sessions'][0]['startTime']} .. {summary['sessions'][-1]['startTime']}")
+    for failure in summary['failed']:
+        print(f"   chunk {failure['chunk']} ({failure['sessions']} sessions): {failure['status']} {failure['error']}")
+    raise SystemExit(0 if summary['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
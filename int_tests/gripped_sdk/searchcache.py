@@ -0,0 +1,267 @@
+"""
+TTL + LRU cache for /classes/search
+Students re-run the same search many times while browsing. SearchCache
+answers repeats locally for `ttl` seconds. Its key is normalized the way
+the API reads the parameters:
+- ZIP code trimmed,
+- radius as a canonical number ('30', '30.0' and 30 match),
+- query stripped and case-folded,
+- timezone only kept when a date is given (missing means UTC).
+The cache holds at most `max_entries` searches, least recently used out
+first.
+
+It watches its client's own writes through a request hook:
+- a successful enroll or unenroll patches currentStudents in every cached
+  search that lists the session;
+- a rejected enroll (full, conflict) or a cancelled session drops the
+  searches that list it;
+- creating a class drops everything.
+Other users' changes show up once entries expire.
+
+Usage:
+    cache = SearchCache(client, ttl=30)
+    page = cache.search('75454', 30, query='Yoga')    # decoded body; treat as read-only
+    client.enroll(page['results'][0]['sessionId'])     # cached currentStudents is patched
+    print(cache.summary())
+
+    python -m gripped_sdk.searchcache --students 20 --views 50
+    python -m gripped_sdk.latency --emulator --workload browse --rate 200
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from .client import GrippedClient
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 256
+UTC_NAMES = ('', 'UTC', 'Z', 'GMT', 'ETC/UTC')
+
+
+def search_key(zip_code, radius_miles='30', query=None, date=None, timezone=None):
+    """The normalized (zipCode, radiusMiles, query, date, timezone) a search is cached under
+
+    Raises ValueError for a radius that is not a number.
+    """
+    radius = f'{float(radius_miles):g}'
+    query = (query or '').strip().casefold() or None
+    date = (date or '').strip() or None
+    if date is None:
+        timezone = None
+    else:
+        timezone = (timezone or '').strip()
+        timezone = 'UTC' if timezone.upper() in UTC_NAMES else timezone
+    return str(zip_code).strip(), radius, query, date, timezone
+
+
+class SearchCache:
+    """Cached search_classes() for one client, patched by that client's own enrollments"""
+
+    def __init__(self, client, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.monotonic):
+        self.client = client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (expires at, decoded body)
+        self.by_session = {}  # sessionId -> keys of the cached searches listing it
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'bypassed': 0, 'patched': 0,
+                      'invalidated': 0}
+        client.add_hook(self._on_request)
+
+    @classmethod
+    def for_client(cls, client, **kwargs):
+        """The cache attached to `client`, created on first use"""
+        cache = getattr(client, 'search_cache', None)
+        if cache is None:
+            cache = client.search_cache = cls(client, **kwargs)
+        return cache
+
+    def close(self):
+        """Stop watching the client's requests"""
+        self.client.remove_hook(self._on_request)
+
+    def search(self, zip_code, radius_miles='30', query=None, date=None, timezone=None):
+        """The decoded search body, from the cache when fresh; raises requests.HTTPError on errors
+
+        Misses are sent with the normalized parameters so the cached body
+        answers every spelling of the same search. The same dicts are handed
+        to every caller and patched in place, so treat them as read-only.
+        """
+        try:
+            key = search_key(zip_code, radius_miles, query, date, timezone)
+        except ValueError:
+            # Let the API report the bad radius
+            with self.lock:
+                self.stats['bypassed'] += 1
+            response = self.client.search_classes(zip_code, radius_miles, query, date, timezone)
+            response.raise_for_status()
+            return response.json()
+
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+
+        zip_code, radius, query, date, timezone = key
+        response = self.client.search_classes(zip_code, radius, query, date, timezone)
+        response.raise_for_status()
+        body = response.json()
+        if self.ttl <= 0:
+            return body
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (self.clock() + self.ttl, body)
+            for result in body.get('results', ()):
+                self.by_session.setdefault(result.get('sessionId'), set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+                self.stats['evictions'] += 1
+        return body
+
+    def invalidate(self, session_id=None):
+        """Drop the cached searches listing `session_id`, or all of them"""
+        with self.lock:
+            keys = list(self.entries) if session_id is None else list(self.by_session.get(session_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.stats['invalidated'] += len(keys)
+
+    def _remove(self, key):
+        _, body = self.entries.pop(key)
+        for result in body.get('results', ()):
+            keys = self.by_session.get(result.get('sessionId'))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_session[result.get('sessionId')]
+
+    def _patch(self, session_id, delta):
+        with self.lock:
+            for key in self.by_session.get(session_id, ()):
+                for result in self.entries[key][1]['results']:
+                    if result.get('sessionId') == session_id:
+                        result['currentStudents'] = max(0, (result.get('currentStudents') or 0) + delta)
+                        self.stats['patched'] += 1
+
+    def _on_request(self, event):
+        endpoint, method, status = event['endpoint'], event['method'], event['status']
+        if endpoint == '/classes/{sessionId}/enroll':
+            session_id = event['pathParams']['sessionId']
+            if status == 200:
+                self._patch(session_id, 1 if method == 'POST' else -1)
+            else:
+                # Full, conflicting or unknown outcome: our copy of the session is suspect
+                self.invalidate(session_id)
+        elif endpoint == '/classes/batch-enroll':
+            if status != 200:
+                self.invalidate()
+                return
+            try:
+                results = event['response'].json().get('results') or []
+                results = [(r['sessionId'], bool(r.get('success'))) for r in results]
+            except (ValueError, AttributeError, TypeError, KeyError):
+                # We cannot tell which sessions changed, so trust none of them
+                self.invalidate()
+                return
+            for session_id, success in results:
+                if success:
+                    self._patch(session_id, 1)
+                else:
+                    self.invalidate(session_id)
+        elif endpoint == '/classes/{sessionId}' and method == 'DELETE' and status == 200:
+            self.invalidate(event['pathParams']['sessionId'])
+        elif endpoint == '/classes' and method == 'POST' and status == 200:
+            self.invalidate()
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats, entries=len(self.entries))
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRatio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Spellings a browsing student produces for the same few searches
+BROWSE_RADII = ('10', '25', '30', '30.0', 30)
+BROWSE_QUERIES = (None, None, 'yoga', 'Yoga', ' YOGA ', 'strength', 'Strength')
+
+
+def browse(cache, context, rng):
+    """One screen view: a search drawn from a small, repetitive set, sometimes followed by an enroll"""
+    page = cache.search(context.get('zipCode', '75454'), rng.choice(BROWSE_RADII), rng.choice(BROWSE_QUERIES))
+    results = page.get('results') or []
+    if results and rng.random() < context.get('enrollRate', 0.05):
+        cache.client.enroll(rng.choice(results)['sessionId'])
+    return page
+
+
+def main():
+    from .emulator import Emulator, make_token
+    from .workloads import emulator_context
+
+    parser = argparse.ArgumentParser(description='Simulate browsing students with and without a search cache')
+    parser.add_argument('--students', type=int, default=20)
+    parser.add_argument('--views', type=int, default=50, help='screen views per student')
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL)
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument('--enroll-rate', type=float, default=0.05, help='chance a view ends in an enrollment')
+    parser.add_argument('--latency', type=float, default=0.02, help='emulator service time in seconds')
+    parser.add_argument('--trainers', type=int, default=50)
+    args = parser.parse_args()
+
+    emulator = Emulator(latency=args.latency).start()
+    context = emulator_context(emulator, trainers=args.trainers, capacity=100)
+    context['enrollRate'] = args.enroll_rate
+    try:
+        for cached in (False, True):
+            requests_sent = [0]
+            totals = {}
+            lock = threading.Lock()
+
+            def count(event):
+                with lock:
+                    requests_sent[0] += 1
+
+            def student(index):
+                rng = random.Random(index)
+                with GrippedClient(make_token(f"browser-{'cached' if cached else 'plain'}-{index}"),
+                                   base_url=emulator.base_url) as client:
+                    client.add_hook(count)
+                    cache = SearchCache(client, ttl=args.ttl if cached else 0, max_entries=args.max_entries)
+                    for _ in range(args.views):
+                        browse(cache, context, rng)
+                    with lock:
+                        for name, value in cache.summary().items():
+                            if name != 'hitRatio':
+                                totals[name] = totals.get(name, 0) + value
+
+            started = time.perf_counter()
+            threads = [threading.Thread(target=student, args=(i,)) for i in range(args.students)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            views = args.students * args.views
+            lookups = totals['hits'] + totals['misses']
+            print(f"{'🗄️  cached' if cached else '🌐 no cache'}: {views} views, {requests_sent[0]} requests, "
+                  f"{elapsed:.2f}s, hit ratio {totals['hits'] / lookups:.1%}, {totals['patched']} patched, "
+                  f"{totals['invalidated']} invalidated")
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Single-flight coalescing of identical concurrent GETs
+Under load, many students ask for the same popular trainer profile or
+rating summary at the same moment. A SingleFlight group lets the first
+caller send the request while identical callers that arrive before it
+completes wait and share its response. The response's decoded body is
+shared too: response.json() is decoded once and returns the same object
+to every caller, so treat it as read-only.
+
+Calls are identical when they have the same path, the same query
+parameters and the same auth scope. The scope is the caller's user, so
+by default nothing is shared between users. With
+share_across_users=True, endpoints whose body does not depend on the
+caller (SHARED_ENDPOINTS, and /ratings?trainerId=) are shared across all
+clients in the group.
+
+GrippedClient(single_flight=group) coalesces threads;
+aioclient.AsyncGrippedClient(single_flight=AsyncSingleFlight()) coalesces
+tasks.
+
+Usage:
+    group = SingleFlight(share_across_users=True)
+    clients = [GrippedClient(token, single_flight=group) for token in tokens]
+    ...
+    print(group.summary())    # {'leaders': ..., 'coalesced': ..., 'savedRatio': ...}
+
+    python -m gripped_sdk.singleflight --students 50 --trainers 5 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from .client import GrippedClient
+
+# GET endpoints whose response is the same for every authenticated caller
+SHARED_ENDPOINTS = ('/trainers/{trainerId}/profile', '/trainers/{trainerId}/classes', '/classes/search')
+
+
+def share_decoded(response):
+    """Make response.json() decode once and return the same object to every caller"""
+    decode = response.json
+    lock = threading.Lock()
+    decoded = []
+
+    def json(**kwargs):
+        with lock:
+            if not decoded:
+                decoded.append(decode())
+        return decoded[0]
+
+    response.json = json
+    return response
+
+
+class SingleFlight:
+    """Thread-safe group of in-flight calls keyed by (scope, path, params)"""
+
+    def __init__(self, share_across_users=False, shared_endpoints=SHARED_ENDPOINTS):
+        self.share_across_users = share_across_users
+        self.shared_endpoints = frozenset(shared_endpoints)
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {'leaders': 0, 'coalesced': 0, 'errors': 0}
+
+    def _count(self, field):
+        with self.lock:
+            self.stats[field] += 1
+
+    def key(self, user, endpoint, path, params=None):
+        params = tuple(sorted((params or {}).items()))
+        shared = endpoint in self.shared_endpoints or (endpoint == '/ratings' and dict(params).get('trainerId'))
+        scope = '*' if self.share_across_users and shared else user
+        return scope, path, params
+
+    def do(self, key, fn):
+        """(fn()'s result, shared) where shared is True if another caller's call was joined"""
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+                self.stats['leaders'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            return future.result(), True
+        try:
+            response = share_decoded(fn())
+            future.set_result(response)
+            return response, False
+        except BaseException as e:
+            self._count('errors')
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        calls = stats['leaders'] + stats['coalesced']
+        stats['savedRatio'] = round(stats['coalesced'] / calls, 4) if calls else 0.0
+        return stats
+
+
+class AsyncSingleFlight(SingleFlight):
+    """The same group for asyncio tasks; do() takes a zero-argument function returning an awaitable"""
+
+    async def do(self, key, fn):
+        future = self.in_flight.get(key)
+        if future is not None:
+            self._count('coalesced')
+            # A cancelled follower must not cancel the call the others are waiting for
+            return await asyncio.shield(future), True
+        future = self.in_flight[key] = asyncio.get_running_loop().create_future()
+        self._count('leaders')
+        try:
+            response = share_decoded(await fn())
+            future.set_result(response)
+            return response, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._count('errors')
+            future.set_exception(e)
+            # Mark the exception retrieved even if nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self.in_flight.pop(key, None)
+
+
+def _popular_lookups(client, trainer_ids, lookups, rng):
+    for _ in range(lookups):
+        trainer_id = trainer_ids[min(int(rng.expovariate(1.0)), len(trainer_ids) - 1)]
+        client.get_trainer_profile(trainer_id).json()
+        client.get_trainer_rating(trainer_id)
+
+
+def _run_threads(base_url, students, trainer_ids, lookups, group):
+    from .emulator import make_token
+    sent = [0]
+    lock = threading.Lock()
+
+    def count(event):
+        if not event['coalesced']:
+            with lock:
+                sent[0] += 1
+
+    def student(index):
+        with GrippedClient(make_token(f'student-{index}'), base_url=base_url, single_flight=group) as client:
+            client.add_hook(count)
+            _popular_lookups(client, trainer_ids, lookups, random.Random(index))
+
+    threads = [threading.Thread(target=student, args=(i,)) for i in range(students)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sent[0]
+
+
+async def _run_tasks(base_url, students, trainer_ids, lookups, group):
+    from .aioclient import AsyncGrippedClient
+    from .emulator import make_token
+
+    async def student(index, client):
+        rng = random.Random(index)
+        for _ in range(lookups):
+            trainer_id = trainer_ids[min(int(rng.expovariate(1.0)), len(trainer_ids) - 1)]
+            await asyncio.gather(client.get_trainer_profile(trainer_id), client.get_trainer_rating(trainer_id))
+
+    clients = [AsyncGrippedClient(make_token(f'async-student-{i}'), base_url=base_url, single_flight=group,
+                                  max_workers=4) for i in range(students)]
+    try:
+        await asyncio.gather(*(student(i, client) for i, client in enumerate(clients)))
+    finally:
+        for client in clients:
+            await client.close()
+
+
+def main():
+    from .emulator import Emulator
+
+    parser = argparse.ArgumentParser(description='Many students looking up the same popular trainers')
+    parser.add_argument('--students', type=int, default=50)
+    parser.add_argument('--trainers', type=int, default=5)
+    parser.add_argument('--lookups', type=int, default=5, help='trainer lookups per student')
+    parser.add_argument('--latency', type=float, default=0.05, help='emulator service time in seconds')
+    args = parser.parse_args()
+
+    emulator = Emulator(latency=args.latency).start()
+    emulator.state.seed(args.trainers, 2)
+    trainer_ids = sorted({s['trainerId'] for s in emulator.state.sessions.values()})
+    calls = args.students * args.lookups * 2
+    try:
+        for label, group in (('🧵 threads, no coalescing', None),
+                             ('🧵 threads, single flight', SingleFlight(share_across_users=True))):
+            started = time.perf_counter()
+            sent = _run_threads(emulator.base_url, args.students, trainer_ids, args.lookups, group)
+            saved = f", {group.summary()['coalesced']} saved" if group else ''
+            print(f"{label}: {calls} calls, {sent} requests sent{saved}, {time.perf_counter() - started:.2f}s")
+        group = AsyncSingleFlight(share_across_users=True)
+        started = time.perf_counter()
+        asyncio.run(_run_tasks(emulator.base_url, args.students, trainer_ids, args.lookups, group))
+        stats = group.summary()
+        print(f"⚡ asyncio, single flight: {calls} calls, {stats['leaders']} requests sent, "
+              f"{stats['coalesced']} saved ({stats['savedRatio']:.0%}), {time.perf_counter() - started:.2f}s")
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+"""
+Per-request phase timing for GrippedClient
+Splits every request into DNS resolve, TCP connect, TLS handshake, request
+send, time-to-first-byte (server processing plus one round trip), body
+download and JSON decode, and aggregates the phases per endpoint. Requests
+that reuse a pooled connection report zero setup phases, so comparing a
+pooled run with an unpooled one shows what connection reuse saves; the
+response size column shows payload bloat.
+
+Usage:
+    python -m gripped_sdk.timing --emulator --workload search --requests 200 --compare-pooling
+    python -m gripped_sdk.timing --token $ID_TOKEN --workload search --requests 50
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from .client import GrippedClient
+from .hdr import Histogram
+
+PHASES = ('dns', 'connect', 'tls', 'send', 'ttfb', 'download', 'decode')
+SETUP_PHASES = ('dns', 'connect', 'tls')
+
+# Phases of the request in flight on this thread; connections are pooled
+# and shared between requests, so they write here rather than to themselves
+_local = threading.local()
+
+
+def _add(phase, seconds):
+    phases = getattr(_local, 'phases', None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+def _setup_total():
+    phases = getattr(_local, 'phases', None) or {}
+    return sum(phases.get(phase, 0.0) for phase in SETUP_PHASES)
+
+
+class _TimedConnectionMixin:
+    """Times name resolution, connect, TLS, send and first byte on a urllib3 connection"""
+
+    is_tls = False
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            # Let urllib3 resolve again and raise its usual NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        _add('dns', resolved - started)
+        phases = getattr(_local, 'phases', None)
+        if phases is not None:
+            phases['reused'] = False
+
+        # Connect to the resolved addresses in order, as create_connection would
+        hostname = self._dns_host
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    # Refused or timed out: try the next address, as create_connection would
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = hostname
+            _add('connect', time.perf_counter() - resolved)
+
+    def connect(self):
+        started = time.perf_counter()
+        setup_before = _setup_total()
+        super().connect()
+        if self.is_tls:
+            # connect() = _new_conn() + handshake; whatever _new_conn didn't account for is TLS
+            _add('tls', max(0.0, time.perf_counter() - started - (_setup_total() - setup_before)))
+
+    def request(self, *args, **kwargs):
+        # Plain HTTP connections connect lazily inside request(), so setup time is subtracted
+        started = time.perf_counter()
+        setup_before = _setup_total()
+        super().request(*args, **kwargs)
+        self._sent_at = time.perf_counter()
+        _add('send', max(0.0, self._sent_at - started - (_setup_total() - setup_before)))
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        _add('ttfb', time.perf_counter() - getattr(self, '_sent_at', time.perf_counter()))
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    is_tls = True
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """requests adapter whose responses carry a `phases` dict (seconds)
+
+    Body download is timed here by reading the body before handing the
+    response back (requests would read it right after anyway); streamed
+    responses get no download phase.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        phases = _local.phases = {'reused': True}
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                started = time.perf_counter()
+                response.content
+                phases['download'] = time.perf_counter() - started
+        finally:
+            _local.phases = None
+        response.phases = phases
+        return response
+
+
+class _EndpointTiming:
+    def __init__(self):
+        self.count = 0
+        self.new_connections = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.sums = dict.fromkeys(PHASES, 0.0)
+        self.total = Histogram()
+
+
+class PhaseTimer:
+    """Client hook that aggregates per-endpoint phase timings
+
+    install(client) mounts a TimingAdapter on the client's session and
+    registers the hook. With measure_decode=True the hook also times
+    response.json() on JSON responses; that decodes each body one extra
+    time, which only costs CPU in measurement runs.
+    """
+
+    def __init__(self, measure_decode=True):
+        self.measure_decode = measure_decode
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.errors = 0
+
+    def install(self, client):
+        adapter = TimingAdapter()
+        client.session.mount('http://', adapter)
+        client.session.mount('https://', adapter)
+        client.add_hook(self)
+        return client
+
+    def __call__(self, event):
+        if event.get('coalesced'):
+            # Shared another call's response; its phases were recorded once already
+            return
+        response = event.get('response')
+        phases = getattr(response, 'phases', None)
+        if phases is None:
+            with self.lock:
+                self.errors += 1
+            return
+        phases = dict(phases)
+        if self.measure_decode and 'json' in response.headers.get('Content-Type', ''):
+            started = time.perf_counter()
+            try:
+                response.json()
+            except ValueError:
+                pass
+            phases['decode'] = time.perf_counter() - started
+        with self.lock:
+            timing = self.endpoints.get(event['endpoint'])
+            if timing is None:
+                timing = self.endpoints[event['endpoint']] = _EndpointTiming()
+            timing.count += 1
+            timing.new_connections += not phases['reused']
+            timing.response_bytes += event['responseBytes']
+            timing.max_response_bytes = max(timing.max_response_bytes, event['responseBytes'])
+            for phase in PHASES:
+                seconds = phases.get(phase, 0.0)
+                timing.phases[phase].record(seconds * 1e6)
+                timing.sums[phase] += seconds
+            timing.total.record((event['elapsed'] + phases.get('decode', 0.0)) * 1e6)
+
+    def summary(self):
+        """Per-endpoint phase means and p99s in ms, plus connection and size stats"""
+        results = []
+        with self.lock:
+            for endpoint, timing in sorted(self.endpoints.items()):
+                results.append({
+                    'endpoint': endpoint,
+                    'requests': timing.count,
+                    'newConnections': timing.new_connections,
+                    'meanResponseBytes': round(timing.response_bytes / timing.count),
+                    'maxResponseBytes': timing.max_response_bytes,
+                    'meanMs': {phase: round(timing.sums[phase] / timing.count * 1000.0, 3) for phase in PHASES},
+                    'p99Ms': {phase: timing.phases[phase].value_at_percentile(99) / 1000.0 for phase in PHASES},
+                    'totalP50Ms': timing.total.value_at_percentile(50) / 1000.0,
+                    'totalP99Ms': timing.total.value_at_percentile(99) / 1000.0,
+                })
+        return results
+
+    def report_text(self):
+        """Fixed-width table of mean phase times per endpoint"""
+        summary = self.summary()
+        width = max([len('endpoint')] + [len(s['endpoint']) for s in summary])
+        header = f"{'endpoint':<{width}} {'n':>5} {'new conn':>8} " + ' '.join(f'{p:>8}' for p in PHASES)
+        lines = [header + f" {'p50 ms':>8} {'p99 ms':>8} {'mean KB':>8}"]
+        for s in summary:
+            phases = ' '.join(f"{s['meanMs'][p]:>8.2f}" for p in PHASES)
+            lines.append(f"{s['endpoint']:<{width}} {s['requests']:>5} {s['newConnections']:>8} {phases} "
+                         f"{s['totalP50Ms']:>8.2f} {s['totalP99Ms']:>8.2f} {s['meanResponseBytes'] / 1024:>8.1f}")
+        lines.append('(phase columns are mean ms; new conn = requests that opened a connection)')
+        if self.errors:
+            lines.append(f"{self.errors} request(s) failed before a response and are not included")
+        return '\n'.join(lines)
+
+
+def run_sequence(client_factory, operation, count, context, pooled=True, timer=None):
+    """Run `operation` count times, on one pooled client or a fresh client each time"""
+    timer = timer or PhaseTimer()
+    client = timer.install(client_factory()) if pooled else None
+    try:
+        for _ in range(count):
+            if pooled:
+                operation(client, context)
+            else:
+                with timer.install(client_factory()) as fresh:
+                    operation(fresh, context)
+    finally:
+        if client:
+            client.close()
+    return timer
+
+
+def main():
+    from .emulator import Emulator
+    from .workloads import WORKLOADS, emulator_context, emulator_token
+
+    parser = argparse.ArgumentParser(description='Per-request DNS/connect/TLS/TTFB/download/decode breakdown')
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='search')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--compare-pooling', action='store_true',
+                        help='also run with a new connection per request')
+    parser.add_argument('--emulator', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.0, help='emulator service time in seconds')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    parser.add_argument('--zip', default='75454')
+    parser.add_argument('--json-out')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(latency=args.latency).start()
+        context = emulator_context(emulator, zip_code=args.zip)
+        base_url, token = emulator.base_url, emulator_token(0, prefix='timing-user')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        import random
+        context = {'zipCode': args.zip, 'radiusMiles': '30', 'rng': random.Random(42)}
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    runs = {'pooled': True}
+    if args.compare_pooling:
+        runs['unpooled'] = False
+    results = {}
+    try:
+        for name, pooled in runs.items():
+            print(f"⏱️  {args.requests} x '{args.workload}' ({name})")
+            timer = run_sequence(lambda: GrippedClient(token, base_url=base_url), WORKLOADS[args.workload],
+                                 args.requests, context, pooled=pooled)
+            print(timer.report_text())
+            results[name] = timer.summary()
+    finally:
+        if emulator:
+            emulator.stop()
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+HTTP traffic recorder and time-scaled replayer
+The recorder is a GrippedClient hook that appends one JSON line per request
+(method, endpoint template, path params, query params, body size, status,
+timings) with the Authorization header redacted and the user reduced to a
+stable pseudonym. The replayer re-issues a recording against any base URL
+at 1x, Nx or maximum speed, keeping the recorded inter-arrival gaps and the
+order of each user's requests.
+
+Usage:
+    GRIPPED_TRAFFIC_LOG=traffic.jsonl python my_flow.py     # record any client traffic
+    python -m gripped_sdk.traffic replay traffic.jsonl --emulator --speed 4
+    python -m gripped_sdk.traffic replay traffic.jsonl --base-url $API --token $ID_TOKEN --speed max
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+from .client import GrippedClient
+from .latency import LatencyRecorder, report_exception
+
+
+def pseudonym(user_id):
+    """Stable, non-reversible stand-in for a user ID"""
+    if not user_id:
+        return 'anonymous'
+    return 'user-' + hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:12]
+
+
+class TrafficRecorder:
+    """Client hook that appends request/response records to a JSONL file
+
+    Bodies are only stored when include_bodies=True (base64), since they
+    can carry personal data; replaying requests that need a body (e.g.
+    POST /classes) requires them.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path, include_bodies=False):
+        self.path = path
+        self.include_bodies = include_bodies
+        self.lock = threading.Lock()
+        self.count = 0
+        self._file = open(path, 'a', buffering=1)
+
+    @classmethod
+    def shared(cls, path, include_bodies=False):
+        """One recorder per path, shared by every client in the process"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path, include_bodies)
+            return cls._shared[path]
+
+    def __call__(self, event):
+        record = {
+            'ts': event['start'],
+            'user': pseudonym(event.get('user')),
+            'method': event['method'],
+            'endpoint': event['endpoint'],
+            'pathParams': event.get('pathParams') or {},
+            'params': event.get('params') or {},
+            'auth': 'Bearer <redacted>' if event.get('user') else None,
+            'requestBytes': event['requestBytes'],
+            'status': event['status'],
+            'elapsedMs': round(event['elapsed'] * 1000.0, 3) if event['elapsed'] is not None else None,
+            'responseBytes': event['responseBytes'],
+            'error': event['error'],
+        }
+        response = event.get('response')
+        if self.include_bodies and response is not None and response.request.body:
+            body = response.request.body
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            if isinstance(body, bytes):
+                record['body'] = base64.b64encode(body).decode('ascii')
+        line = json.dumps(record, separators=(',', ':'))
+        with self.lock:
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            self._file.close()
+
+
+def load_traffic(path):
+    """Read a recording, ordered by original send time"""
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    records.sort(key=lambda r: r['ts'])
+    return records
+
+
+def replay(records, client_factory, speed=1.0, lanes=64, recorder=None):
+    """Re-issue recorded traffic; returns (recorder, stats)
+
+    `speed` scales the recorded gaps (2.0 = twice as fast); None or 0 replays
+    as fast as possible. Every user's requests go through one lane, in
+    recorded order, so causal sequences (enroll then unenroll) survive;
+    users are spread over at most `lanes` threads. client_factory(user)
+    returns the client to replay that user's requests with. Latency is
+    measured from each request's scheduled time, so a replay that falls
+    behind its schedule reports it. A request that fails with anything but
+    a network error is counted in 'errors' and recorded under
+    'error (<exception type>)'.
+    """
+    recorder = recorder or LatencyRecorder()
+    replayable = [r for r in records if r['endpoint'].startswith('/')]
+    stats = {
+        'records': len(records),
+        'skipped': len(records) - len(replayable),
+        'sent': 0,
+        'statusMatches': 0,
+        'errors': 0,
+        'maxLagMs': 0.0,
+    }
+    if not replayable:
+        return recorder, stats
+
+    by_lane = defaultdict(list)
+    users = sorted({r['user'] for r in replayable})
+    lane_of = {user: i % lanes for i, user in enumerate(users)}
+    for record in replayable:
+        by_lane[lane_of[record['user']]].append(record)
+
+    first_ts = replayable[0]['ts']
+    start = time.perf_counter() + 0.05
+    stats_lock = threading.Lock()
+    reported = set()
+
+    def lane(lane_records):
+        clients = {}
+        try:
+            for record in lane_records:
+                if speed:
+                    intended = start + (record['ts'] - first_ts) / speed
+                    delay = intended - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    intended = time.perf_counter()
+                client = clients.get(record['user'])
+                if client is None:
+                    client = clients[record['user']] = client_factory(record['user'])
+                name, status, failed = f"{record['method']} {record['endpoint']}", None, False
+                sent = time.perf_counter()
+                try:
+                    body = base64.b64decode(record['body']) if record.get('body') else None
+                    response = client.request(record['method'], record['endpoint'], record['pathParams'] or None,
+                                              params=record['params'] or None, data=body)
+                    status = response.status_code
+                except requests.RequestException:
+                    pass
+                except Exception as e:
+                    # Not a failed request but a bad record or a bug, so keep it out of the endpoint's row
+                    report_exception(e, f'replaying {name}', reported)
+                    name, failed = f'error ({type(e).__name__})', True
+                finished = time.perf_counter()
+                recorder.record(name, status, intended, sent, finished)
+                with stats_lock:
+                    stats['sent'] += 1
+                    stats['errors'] += failed
+                    stats['statusMatches'] += status == record['status']
+                    stats['maxLagMs'] = max(stats['maxLagMs'], round((sent - intended) * 1000.0, 3))
+        finally:
+            for client in clients.values():
+                client.close()
+
+    threads = [threading.Thread(target=lane, args=(lane_records,), daemon=True) for lane_records in by_lane.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, stats
+
+
+def _speed(value):
+    return None if value == 'max' else float(value.rstrip('x'))
+
+
+def main():
+    from .emulator import Emulator, make_token
+
+    parser = argparse.ArgumentParser(description='Replay recorded Gripped API traffic')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('replay', help='replay a JSONL recording')
+    run.add_argument('recording')
+    run.add_argument('--speed', type=_speed, default=1.0, help="time scale, e.g. 1, 4x or 'max'")
+    run.add_argument('--lanes', type=int, default=64)
+    run.add_argument('--emulator', action='store_true', help='replay against a seeded local emulator')
+    run.add_argument('--base-url')
+    run.add_argument('--token', action='append', default=[], help='ID tokens dealt out to recorded users')
+    run.add_argument('--json-out')
+    args = parser.parse_args()
+
+    records = load_traffic(args.recording)
+    emulator = None
+    if args.emulator:
+        emulator = Emulator().start()
+        emulator.state.seed()
+        base_url = emulator.base_url
+
+        def client_factory(user):
+            return GrippedClient(make_token(user), base_url=base_url)
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        assigned = {}
+
+        def client_factory(user):
+            token = assigned.setdefault(user, args.token[len(assigned) % len(args.token)])
+            kwargs = {'base_url': args.base_url} if args.base_url else {}
+            return GrippedClient(token, **kwargs)
+
+    span = records[-1]['ts'] - records[0]['ts'] if records else 0.0
+    label = 'max speed' if not args.speed else f'{args.speed:g}x'
+    print(f"🔁 Replaying {len(records)} requests spanning {span:.1f}s at {label}")
+    try:
+        recorder, stats = replay(records, client_factory, speed=args.speed, lanes=args.lanes)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    print(recorder.report_text())
+    print(f"📊 Sent {stats['sent']}, skipped {stats['skipped']} (presigned S3 calls), "
+          f"status matched recording for {stats['statusMatches']}, max schedule lag {stats['maxLagMs']:.1f} ms")
+    if stats['errors']:
+        print(f"⚠️  {stats['errors']} record(s) failed to replay with an exception (see 'error (...)' rows)")
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump({'stats': stats, 'results': recorder.summary()}, f, indent=2)
+        print(f"📄 JSON report written to {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,380 @@
+"""
+Concurrent presigned-URL image upload pipeline
+Requests every presigned URL a batch needs up front (up to 10 per
+/profile/presigned-url call, so a profile's photos and ID image share one
+call), then PUTs the bodies to S3 through a bounded thread pool. File paths
+are streamed from disk rather than read into memory, every upload is
+retried on its own, and an upload whose URL has expired gets a fresh one.
+The summary reports aggregate MB/s.
+
+With an UploadIndex the pipeline is content-addressed: every source is
+hashed (SHA-256) and looked up in a local index of earlier uploads. A hit
+is reused, without a presigned-URL call or upload, once a ranged GET shows
+the stored object still has the recorded ETag and size. By default only the
+caller's own earlier uploads are reused, since the API stores keys under
+the uploading user's prefix; pass share_across_users=True for a backend
+that accepts references to any key.
+
+Usage:
+    python -m gripped_sdk.uploads --emulator --synthetic 12 --size-kb 2048 --workers 6 --compare
+    python -m gripped_sdk.uploads --token $ID_TOKEN photos/*.jpg
+    python -m gripped_sdk.uploads --token $ID_TOKEN --index ~/.cache/gripped/upload-index.json photos/*.jpg
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import GrippedClient
+
+MAX_URLS_PER_CALL = 10
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'gripped', 'upload-index.json')
+
+
+def request_upload_urls(client, count, content_type='image/jpeg'):
+    """Presigned upload URLs for `count` images in as few calls as the API allows"""
+    urls = []
+    while len(urls) < count:
+        response = client.get_presigned_urls(min(MAX_URLS_PER_CALL, count - len(urls)), content_type)
+        response.raise_for_status()
+        batch = response.json().get('presignedUrls')
+        if not batch:
+            # Asking again would loop forever
+            raise RuntimeError(f'/profile/presigned-url returned no URLs ({len(urls)} of {count} received)')
+        urls.extend(batch)
+    return urls[:count]
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_size(source):
+    """Size in bytes of a path or bytes-like upload source"""
+    return os.path.getsize(source) if _is_path(source) else len(source)
+
+
+def content_digest(source, chunk_size=1 << 20):
+    """SHA-256 and MD5 (the single-part S3 ETag) of a path or bytes, plus its size"""
+    sha256, md5 = hashlib.sha256(), hashlib.md5()
+    if _is_path(source):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                sha256.update(chunk)
+                md5.update(chunk)
+    else:
+        sha256.update(source)
+        md5.update(source)
+    return {'sha256': sha256.hexdigest(), 'md5': md5.hexdigest(), 'size': source_size(source)}
+
+
+class UploadIndex:
+    """Local index from content SHA-256 to the S3 objects holding that content
+
+    Persisted as JSON at `path` (written atomically by save()). One digest
+    can map to several objects, e.g. the same photo uploaded by two users.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.objects = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.objects = json.load(f).get('objects', {})
+
+    def lookup(self, sha256, owner=None, exclude=()):
+        """An indexed object with this content (owned by `owner` if given), skipping keys in `exclude`"""
+        with self.lock:
+            for entry in self.objects.get(sha256, []):
+                if (owner is None or entry['owner'] == owner) and entry['key'] not in exclude:
+                    return dict(entry)
+        return None
+
+    def add(self, sha256, entry):
+        with self.lock:
+            entries = [e for e in self.objects.get(sha256, []) if e['key'] != entry['key']]
+            self.objects[sha256] = entries + [entry]
+
+    def discard(self, sha256, key):
+        with self.lock:
+            self.objects[sha256] = [e for e in self.objects.get(sha256, []) if e['key'] != key]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self.lock:
+            data = json.dumps({'version': 1, 'objects': self.objects}, indent=1)
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            f.write(data)
+        os.replace(temporary, self.path)
+
+
+class UploadPipeline:
+    """Uploads many images to presigned S3 URLs through a bounded thread pool
+
+    Sources are file paths (streamed; reopened on every attempt) or bytes.
+    Network errors and 5xx responses are retried with exponential backoff;
+    a 403 (expired or rejected URL) is retried once with a fresh URL, and
+    a 403 on the fresh URL fails the upload.
+    """
+
+    def __init__(self, client, max_workers=4, retries=3, backoff=0.25, content_type='image/jpeg',
+                 index=None, verify_reuse=True, share_across_users=False, sleep=time.sleep):
+        self.client = client
+        self.index = index
+        self.verify_reuse = verify_reuse
+        self.share_across_users = share_across_users
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.content_type = content_type
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.stats = {'files': 0, 'uploaded': 0, 'reused': 0, 'failed': 0, 'retries': 0, 'urlCalls': 0,
+                      'bytes': 0, 'bytesSaved': 0, 'seconds': 0.0}
+
+    def upload(self, sources, urls=None):
+        """Upload every source; returns one result dict per source, in order
+
+        `urls` are used for the sources that actually need uploading; any
+        more that are needed are requested.
+        """
+        sources = list(sources)
+        started = time.perf_counter()
+        results = [None] * len(sources)
+        digests = [None] * len(sources)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if self.index is not None:
+                digests = list(pool.map(content_digest, sources))
+                candidates, claimed = [], set()
+                owner = None if self.share_across_users else self.client.user_id
+                for digest in digests:
+                    entry = self.index.lookup(digest['sha256'], owner, exclude=claimed)
+                    if entry:
+                        claimed.add(entry['key'])
+                    candidates.append(entry)
+                results = list(pool.map(self._reuse, sources, digests, candidates))
+
+            pending = [i for i, result in enumerate(results) if result is None]
+            urls = list(urls or [])[:len(pending)]
+            missing = len(pending) - len(urls)
+            if missing:
+                urls += request_upload_urls(self.client, missing, self.content_type)
+                self.stats['urlCalls'] += -(-missing // MAX_URLS_PER_CALL)
+            uploads = pool.map(self._upload_one, [sources[i] for i in pending], urls)
+            for i, result in zip(pending, uploads):
+                results[i] = result
+
+        if self.index is not None:
+            owner = self.client.user_id
+            for result, digest in zip(results, digests):
+                result['sha256'] = digest['sha256']
+                if result['ok'] and not result['reused']:
+                    self.index.add(digest['sha256'], {
+                        'key': result['key'], 'imageId': result['imageId'], 'owner': owner,
+                        'etag': result['etag'] or digest['md5'], 'size': digest['size'],
+                        'uploadedAt': time.time(),
+                    })
+            self.index.save()
+        self.stats['seconds'] += time.perf_counter() - started
+        self.stats['files'] += len(results)
+        return results
+
+    def _reuse(self, source, digest, entry):
+        """A result reusing `entry` if the stored object still matches, else None"""
+        if entry is None:
+            return None
+        if self.verify_reuse and not self._object_matches(entry):
+            self.index.discard(digest['sha256'], entry['key'])
+            return None
+        with self.lock:
+            self.stats['reused'] += 1
+            self.stats['bytesSaved'] += digest['size']
+        return {
+            'source': source if _is_path(source) else f"<{digest['size']} bytes>",
+            'imageId': entry['imageId'],
+            'key': entry['key'],
+            'ok': True,
+            'reused': True,
+            'status': None,
+            'etag': entry['etag'],
+            'bytes': digest['size'],
+            'attempts': 0,
+            'error': None,
+        }
+
+    def _object_matches(self, entry):
+        """Ranged GET of one byte: the object exists with the recorded ETag and size"""
+        try:
+            response = self.client.get_download_url(entry['key'])
+            if response.status_code != 200:
+                return False
+            response = self.client.request('GET', 's3:GetObject', url=response.json()['downloadUrl'],
+                                           headers={'Range': 'bytes=0-0'})
+        except requests.RequestException:
+            return False
+        if response.status_code == 206:
+            size = int(response.headers.get('Content-Range', '/-1').rpartition('/')[2])
+        elif response.status_code == 200:
+            size = len(response.content)
+        else:
+            return False
+        return response.headers.get('ETag', '').strip('"') == entry['etag'] and size == entry['size']
+
+    def upload_profile_images(self, images, id_image=None):
+        """Upload profile images plus an optional ID image with a single presigned-URL call
+
+        Returns (uploaded_images, id_image) in the shapes PUT /profile/me
+        expects ({'imageId', 'key'} dicts); failed uploads are left out and
+        the ID image is None if it failed.
+        """
+        images = list(images)
+        sources = images + ([id_image] if id_image is not None else [])
+        results = self.upload(sources)
+        uploaded = [{'imageId': r['imageId'], 'key': r['key']} for r in results[:len(images)] if r['ok']]
+        id_result = results[len(images)] if id_image is not None else None
+        if id_result is None or not id_result['ok']:
+            return uploaded, None
+        return uploaded, {'imageId': id_result['imageId'], 'key': id_result['key']}
+
+    def _upload_one(self, source, url_info):
+        size = source_size(source)
+        attempts, status, error, etag = 0, None, None, None
+        refreshed = False
+        while True:
+            attempts += 1
+            body = open(source, 'rb') if _is_path(source) else source
+            try:
+                response = self.client.put_object(url_info['uploadUrl'], body, self.content_type)
+                status, error = response.status_code, None
+                if status == 200:
+                    etag = response.headers.get('ETag', '').strip('"') or None
+                else:
+                    error = response.text[:200]
+            except requests.RequestException as e:
+                status, error = None, str(e)
+            finally:
+                if body is not source:
+                    body.close()
+
+            if status == 200:
+                break
+            if status == 403 and not refreshed:
+                # Asking for a fresh URL only helps once; a second 403 means the upload itself is rejected
+                refreshed = True
+                with self.lock:
+                    self.stats['urlCalls'] += 1
+                try:
+                    url_info = request_upload_urls(self.client, 1, self.content_type)[0]
+                except (requests.RequestException, RuntimeError) as e:
+                    error = f'403, then no fresh URL: {e}'
+                    break
+            elif attempts > self.retries or (status is not None and status < 500):
+                break
+            with self.lock:
+                self.stats['retries'] += 1
+            self.sleep(self.backoff * 2 ** (attempts - 1))
+
+        ok = status == 200
+        with self.lock:
+            self.stats['uploaded' if ok else 'failed'] += 1
+            if ok:
+                self.stats['bytes'] += size
+        return {
+            'source': source if _is_path(source) else f'<{size} bytes>',
+            'imageId': url_info['imageId'],
+            'key': url_info['key'],
+            'ok': ok,
+            'reused': False,
+            'status': status,
+            'etag': etag,
+            'bytes': size,
+            'attempts': attempts,
+            'error': error,
+        }
+
+    def summary(self):
+        stats = dict(self.stats)
+        stats['mbPerSecond'] = round(stats['bytes'] / 1e6 / stats['seconds'], 2) if stats['seconds'] else 0.0
+        return stats
+
+
+def _synthetic_files(directory, count, size_kb):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'synthetic-{i}.jpg')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size_kb * 1024))
+        paths.append(path)
+    return paths
+
+
+def main():
+    from .emulator import Emulator, make_token
+
+    parser = argparse.ArgumentParser(description='Upload images to presigned S3 URLs in parallel')
+    parser.add_argument('files', nargs='*', help='image files to upload')
+    parser.add_argument('--synthetic', type=int, default=0, help='upload N generated files instead')
+    parser.add_argument('--size-kb', type=int, default=1024, help='size of each generated file')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--compare', action='store_true', help='also run one worker at a time')
+    parser.add_argument('--index', help='content-addressed upload index (JSON) to reuse earlier uploads')
+    parser.add_argument('--repeat', type=int, default=1, help='upload the same files N times')
+    parser.add_argument('--emulator', action='store_true')
+    parser.add_argument('--s3-latency', type=float, default=0.05, help='emulator latency per S3 request')
+    parser.add_argument('--base-url')
+    parser.add_argument('--token')
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator:
+        emulator = Emulator(endpoint_latency={'s3': args.s3_latency}).start()
+        base_url, token = emulator.base_url, make_token('upload-user')
+    else:
+        if not args.token:
+            parser.error('--token is required unless --emulator is given')
+        base_url, token = args.base_url or GrippedClient().base_url, args.token
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files or _synthetic_files(directory, args.synthetic, args.size_kb)
+        if not files:
+            parser.error('pass files to upload or --synthetic N')
+        total_mb = sum(source_size(f) for f in files) / 1e6
+        index = UploadIndex(args.index) if args.index else None
+        runs = [('sequential', 1)] if args.compare else []
+        runs.append((f'{args.workers} workers', args.workers))
+        runs = [(f'{label}, pass {n + 1}' if args.repeat > 1 else label, workers)
+                for label, workers in runs for n in range(args.repeat)]
+        try:
+            for label, workers in runs:
+                with GrippedClient(token, base_url=base_url) as client:
+                    pipeline = UploadPipeline(client, max_workers=workers, retries=args.retries, index=index)
+                    results = pipeline.upload(files)
+                stats = pipeline.summary()
+                print(f"📤 {label}: {stats['uploaded']}/{len(files)} uploaded ({total_mb:.1f} MB) in "
+                      f"{stats['seconds']:.2f}s = {stats['mbPerSecond']:.2f} MB/s, "
+                      f"{stats['urlCalls']} presigned-URL call(s), {stats['retries']} retries")
+                if index is not None:
+                    print(f"  ♻️  {stats['reused']} reused from the index, "
+                          f"{stats['bytesSaved'] / 1e6:.1f} MB not re-sent")
+                for result in results:
+                    if not result['ok']:
+                        print(f"  ❌ {result['source']}: {result['status']} {result['error']}")
+        finally:
+            if emulator:
+                emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
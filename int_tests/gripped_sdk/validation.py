@@ -0,0 +1,211 @@
+"""
+Client-side validation of POST /classes payloads
+A recurring schedule can carry hundreds of sessions, and the server
+rejects a bad payload only after a full round trip, one problem at a time.
+validate_class_payload() finds every problem in one local pass:
+- missing required fields,
+- unparseable times, or an end at or before its start,
+- capacity outside bounds,
+- sessions overlapping each other, or overlapping the trainer's existing
+  sessions.
+Overlaps are found with one sort-and-sweep over all intervals
+(O(n log n)), not by comparing every pair.
+
+Both payload shapes are accepted: a 'sessions' array
+(startDateTime/endDateTime/capacity) and the single-session form
+(startTime/endTime/capacity at the top level).
+
+Usage:
+    errors = validate_class_payload(payload, existing_sessions=client.list_classes(trainer_id=me).json())
+    if errors:
+        print(format_errors(errors))
+
+    python -m gripped_sdk.validation payload.json --existing sessions.json
+    python -m gripped_sdk.validation --synthetic 500
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+REQUIRED_FIELDS = ('className', 'zip', 'pricePerClass')
+MIN_CAPACITY = 1
+MAX_CAPACITY = 100
+MAX_SESSIONS = 500
+
+
+def _error(field, code, message):
+    return {'field': field, 'code': code, 'message': message}
+
+
+def _parse_time(value):
+    """Aware datetime from ISO-8601 text ('Z' or an offset); None if it is not one"""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else None
+
+
+def session_specs(payload):
+    """(field prefix, start, end, capacity) for every session a payload would create"""
+    if 'sessions' in payload:
+        sessions = payload['sessions'] if isinstance(payload['sessions'], list) else []
+        return [(f'sessions[{i}].', s.get('startDateTime'), s.get('endDateTime'), s.get('capacity'))
+                for i, s in enumerate(sessions) if isinstance(s, dict)]
+    return [('', payload.get('startTime'), payload.get('endTime'), payload.get('capacity'))]
+
+
+def find_overlaps(new, existing=()):
+    """Overlapping pairs among `new` intervals and between `new` and `existing` ones
+
+    Intervals are (start, end, label) and half-open, so back-to-back
+    sessions do not overlap. One sort by start, then one sweep remembering
+    the latest-ending interval seen so far from each side. An interval
+    that overlaps something is reported at most once per side, paired with
+    that side's latest-ending interval. Overlaps among `existing` alone
+    are not reported.
+    """
+    events = sorted([(start, end, label, True) for start, end, label in new] +
+                    [(start, end, label, False) for start, end, label in existing],
+                    key=lambda event: (event[0], event[1]))
+    latest_new, latest_existing = None, None
+    overlaps = []
+    for start, end, label, is_new in events:
+        if latest_new is not None and start < latest_new[1]:
+            overlaps.append((latest_new[2], label, 'existing' if not is_new else 'new'))
+        if is_new and latest_existing is not None and start < latest_existing[1]:
+            overlaps.append((label, latest_existing[2], 'existing'))
+        if is_new and (latest_new is None or end > latest_new[1]):
+            latest_new = (start, end, label)
+        if not is_new and (latest_existing is None or end > latest_existing[1]):
+            latest_existing = (start, end, label)
+    return overlaps
+
+
+def validate_class_payload(payload, existing_sessions=(), required=REQUIRED_FIELDS, min_capacity=MIN_CAPACITY,
+                           max_capacity=MAX_CAPACITY, max_sessions=MAX_SESSIONS):
+    """Every problem with a POST /classes payload, as a list of {'field', 'code', 'message'}
+
+    `existing_sessions` are the trainer's current session items (as GET
+    /classes returns them); cancelled ones are ignored. An empty list
+    means the payload is valid.
+    """
+    if not isinstance(payload, dict):
+        return [_error('', 'not_an_object', 'Payload must be a JSON object')]
+    errors = []
+    for field in required:
+        value = payload.get(field)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            errors.append(_error(field, 'required', f'{field} is required'))
+    price = payload.get('pricePerClass')
+    if price is not None and (isinstance(price, bool) or not isinstance(price, (int, float)) or price < 0):
+        errors.append(_error('pricePerClass', 'invalid_price', 'pricePerClass must be a non-negative number'))
+    tags = payload.get('classTags')
+    if tags is not None and (not isinstance(tags, list) or not all(isinstance(t, str) for t in tags)):
+        errors.append(_error('classTags', 'invalid_tags', 'classTags must be a list of strings'))
+
+    if 'sessions' in payload and (not isinstance(payload['sessions'], list) or not payload['sessions']):
+        errors.append(_error('sessions', 'no_sessions', 'sessions must be a non-empty list'))
+    elif 'sessions' in payload and len(payload['sessions']) > max_sessions:
+        errors.append(_error('sessions', 'too_many_sessions',
+                             f"{len(payload['sessions'])} sessions; at most {max_sessions} per request"))
+
+    intervals = []
+    start_key, end_key = ('startDateTime', 'endDateTime') if 'sessions' in payload else ('startTime', 'endTime')
+    for prefix, start_text, end_text, capacity in session_specs(payload):
+        start, end = _parse_time(start_text), _parse_time(end_text)
+        for key, text, parsed in ((start_key, start_text, start), (end_key, end_text, end)):
+            if text is None:
+                errors.append(_error(prefix + key, 'required', f'{prefix + key} is required'))
+            elif parsed is None:
+                errors.append(_error(prefix + key, 'invalid_time',
+                                     f'{prefix + key} must be an ISO-8601 time with a timezone, got {text!r}'))
+        if start and end:
+            if end <= start:
+                errors.append(_error(prefix + end_key, 'end_before_start',
+                                     f'{prefix + end_key} must be after {prefix + start_key}'))
+            else:
+                intervals.append((start, end, prefix.rstrip('.') or 'session'))
+        if isinstance(capacity, bool) or not isinstance(capacity, int):
+            errors.append(_error(prefix + 'capacity', 'invalid_capacity', f'{prefix}capacity must be an integer'))
+        elif not min_capacity <= capacity <= max_capacity:
+            errors.append(_error(prefix + 'capacity', 'capacity_out_of_range',
+                                 f'{prefix}capacity must be between {min_capacity} and {max_capacity}'))
+
+    existing = []
+    for item in existing_sessions:
+        if item.get('status', 'ACTIVE') != 'ACTIVE':
+            continue
+        start, end = _parse_time(item.get('startTime')), _parse_time(item.get('endTime'))
+        if start and end:
+            existing.append((start, end, f"existing session {item.get('sessionId')}"))
+
+    for first, second, kind in find_overlaps(intervals, existing):
+        code = 'overlaps_existing' if kind == 'existing' else 'overlapping_sessions'
+        errors.append(_error(second if kind == 'new' else first, code, f'{first} overlaps {second}'))
+    return errors
+
+
+def format_errors(errors):
+    if not errors:
+        return '✅ Payload is valid'
+    lines = [f"❌ {len(errors)} problem(s) in the class payload:"]
+    lines.extend(f"   {e['field'] or '(payload)'}: {e['message']}" for e in errors)
+    return '\n'.join(lines)
+
+
+def _synthetic_schedule(count, start=None):
+    """A weekly recurring payload of `count` sessions with a few planted problems"""
+    start = start or datetime(2026, 1, 5, 17, tzinfo=timezone.utc)
+    stamp = lambda moment: moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+    sessions = [{'startDateTime': stamp(start + timedelta(days=3.5 * i)),
+                 'endDateTime': stamp(start + timedelta(days=3.5 * i, hours=1)), 'capacity': 12}
+                for i in range(count)]
+    if count > 10:
+        sessions[3]['endDateTime'] = sessions[3]['startDateTime']
+        sessions[7]['capacity'] = 0
+        sessions.append(dict(sessions[9]))
+    payload = {'className': 'Synthetic Schedule', 'zip': '75454', 'pricePerClass': 20, 'sessions': sessions}
+    existing = [{'sessionId': 'existing-1', 'status': 'ACTIVE',
+                 'startTime': stamp(start + timedelta(days=3.5 * 5, minutes=30)),
+                 'endTime': stamp(start + timedelta(days=3.5 * 5, minutes=90))}]
+    return payload, existing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a POST /classes payload before sending it')
+    parser.add_argument('payload', nargs='?', help='JSON file with the payload')
+    parser.add_argument('--existing', help="JSON file with the trainer's current sessions (GET /classes)")
+    parser.add_argument('--synthetic', type=int, help='validate a generated schedule of N sessions')
+    parser.add_argument('--max-capacity', type=int, default=MAX_CAPACITY)
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        payload, existing = _synthetic_schedule(args.synthetic)
+    elif args.payload:
+        with open(args.payload) as f:
+            payload = json.load(f)
+        existing = []
+        if args.existing:
+            with open(args.existing) as f:
+                existing = json.load(f)
+    else:
+        parser.error('pass a payload file or --synthetic N')
+
+    started = time.perf_counter()
+    errors = validate_class_payload(payload, existing, max_capacity=args.max_capacity,
+                                    max_sessions=args.max_sessions)
+    elapsed = time.perf_counter() - started
+    print(format_errors(errors))
+    sessions = len(session_specs(payload))
+    print(f"⏱️  {sessions} sessions against {len(existing)} existing checked in {elapsed * 1000:.2f} ms")
+    raise SystemExit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""
+Post-run verification of what the API wrote to DynamoDB
+The e2e scripts check each record with its own get_item, so verification
+time grows with the number of records. BatchVerifier collects the keys to
+check during a run and resolves them with BatchGetItem, 100 keys per call,
+so it grows with the number of batches instead.
+
+Reads that follow a write can also land before the write has replicated;
+wait_until / wait_for_item poll with exponential backoff until a predicate
+holds and record how long that took, so replication lag is measured rather
+than guessed with fixed sleeps.
+
+S3Verifier checks uploaded objects by listing each key prefix once with
+list_objects_v2 and only falls back to (thread-pooled) head_object for the
+keys a listing did not return, so a profile with many images is verified in
+one or two round trips.
+
+Usage:
+    verifier = BatchVerifier(dynamodb)
+    for session_id in created_sessions:
+        verifier.expect(CLASS_TABLE, {'sessionId': session_id},
+                        check=lambda item: item['status'] == 'ACTIVE')
+    results = verifier.verify()
+    print(verifier.report(results))
+
+    s3_results = S3Verifier(s3_client, bucket_name).verify([image['key'] for image in images])
+
+    result = wait_for_item(dynamodb.Table(CLASS_TABLE), {'sessionId': session_id},
+                           lambda item: item['status'] == 'CANCELLED', tracker=convergence)
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import PHOTOS_BUCKET, REGION
+
+BATCH_GET_LIMIT = 100
+
+
+def _key_id(table, key):
+    return table, tuple(sorted(key.items()))
+
+
+class BatchVerifier:
+    """Collects (table, key) expectations and resolves them with batch_get_item
+
+    `dynamodb` is a boto3 DynamoDB resource; its client is used directly
+    (clients are thread-safe, resources are not) and still speaks plain
+    Python types. Keys that DynamoDB returns as UnprocessedKeys are retried
+    with exponential backoff and jitter; `parallel` > 1 fetches that many
+    batches at once.
+    """
+
+    def __init__(self, dynamodb=None, region_name=REGION, parallel=1, consistent_read=False,
+                 max_retries=8, base_delay=0.05, max_delay=5.0, sleep=time.sleep):
+        if dynamodb is None:
+            import boto3
+            dynamodb = boto3.resource('dynamodb', region_name=region_name)
+        self.client = dynamodb.meta.client
+        self.parallel = parallel
+        self.consistent_read = consistent_read
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.pending = []
+        self.stats = {'keys': 0, 'batches': 0, 'calls': 0, 'retries': 0, 'seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def expect(self, table, key, check=None, label=None, present=True):
+        """Queue a check that `key` exists in `table` (or not, with present=False)
+
+        check(item) is an optional predicate the stored item must satisfy.
+        """
+        self.pending.append({'table': table, 'key': dict(key), 'check': check,
+                             'label': label or ', '.join(f'{k}={v}' for k, v in key.items()),
+                             'present': present})
+
+    def verify(self):
+        """Resolve every queued expectation and return one result dict per expectation"""
+        expectations, self.pending = self.pending, []
+        unique = {}
+        for expectation in expectations:
+            unique.setdefault(_key_id(expectation['table'], expectation['key']),
+                              (expectation['table'], expectation['key']))
+        keys = list(unique.values())
+        batches = [keys[i:i + BATCH_GET_LIMIT] for i in range(0, len(keys), BATCH_GET_LIMIT)]
+
+        started = time.perf_counter()
+        found, unprocessed = {}, set()
+        if self.parallel > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+                outcomes = list(pool.map(self._fetch_batch, batches))
+        else:
+            outcomes = [self._fetch_batch(batch) for batch in batches]
+        for items, leftover in outcomes:
+            found.update(items)
+            unprocessed.update(leftover)
+        self.stats['keys'] += len(keys)
+        self.stats['batches'] += len(batches)
+        self.stats['seconds'] += time.perf_counter() - started
+
+        results = []
+        for expectation in expectations:
+            key_id = _key_id(expectation['table'], expectation['key'])
+            item = found.get(key_id)
+            result = {
+                'table': expectation['table'],
+                'key': expectation['key'],
+                'label': expectation['label'],
+                'found': item is not None,
+                'item': item,
+                'ok': True,
+                'problem': None,
+            }
+            if key_id in unprocessed:
+                result.update(ok=False, problem='still unprocessed after retries')
+            elif item is None and expectation['present']:
+                result.update(ok=False, problem='not found')
+            elif item is not None and not expectation['present']:
+                result.update(ok=False, problem='should not exist')
+            elif item is not None and expectation['check'] and not expectation['check'](item):
+                result.update(ok=False, problem='check failed')
+            results.append(result)
+        return results
+
+    def _fetch_batch(self, batch):
+        """One BatchGetItem (plus retries of its UnprocessedKeys); returns (items, leftover key ids)"""
+        request_items = {}
+        key_names = {}
+        for table, key in batch:
+            request_items.setdefault(table, {'Keys': [], 'ConsistentRead': self.consistent_read})['Keys'].append(key)
+            key_names[table] = tuple(key)
+        items = {}
+        attempt = 0
+        while request_items:
+            response = self.client.batch_get_item(RequestItems=request_items)
+            with self._stats_lock:
+                self.stats['calls'] += 1
+            for table, table_items in response.get('Responses', {}).items():
+                for item in table_items:
+                    key = {name: item[name] for name in key_names[table]}
+                    items[_key_id(table, key)] = item
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                break
+            if attempt >= self.max_retries:
+                leftover = {_key_id(table, key) for table, spec in request_items.items() for key in spec['Keys']}
+                return items, leftover
+            # Full jitter keeps parallel batches from retrying in lockstep
+            self.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+            attempt += 1
+            with self._stats_lock:
+                self.stats['retries'] += 1
+        return items, set()
+
+    def report(self, results):
+        """✅/❌ line per expectation plus a batching summary"""
+        lines = []
+        for result in results:
+            if result['ok']:
+                lines.append(f"✅ {result['table']}: {result['label']}")
+            else:
+                lines.append(f"❌ {result['table']}: {result['label']} ({result['problem']})")
+        stats = self.stats
+        lines.append(f"📊 {stats['keys']} keys in {stats['batches']} batch(es), {stats['calls']} call(s), "
+                     f"{stats['retries']} retr{'y' if stats['retries'] == 1 else 'ies'}, {stats['seconds']:.2f}s")
+        return '\n'.join(lines)
+
+
+class ConvergenceTracker:
+    """Records how long each awaited condition took to hold, per label"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, label, result):
+        with self.lock:
+            self.samples.setdefault(label, []).append(result)
+
+    def summary(self):
+        results = []
+        with self.lock:
+            for label, samples in sorted(self.samples.items()):
+                converged = sorted(s['seconds'] for s in samples if s['ok'])
+                results.append({
+                    'label': label,
+                    'waits': len(samples),
+                    'timedOut': len(samples) - len(converged),
+                    'medianSeconds': round(converged[len(converged) // 2], 3) if converged else None,
+                    'maxSeconds': round(converged[-1], 3) if converged else None,
+                    'maxAttempts': max(s['attempts'] for s in samples),
+                })
+        return results
+
+    def report(self):
+        lines = [f"{'condition':<32} {'waits':>5} {'median s':>9} {'max s':>7} {'attempts':>8} {'timeouts':>8}"]
+        for s in self.summary():
+            def show(value):
+                return f'{value:.3f}' if value is not None else '-'
+            lines.append(f"{s['label'][:32]:<32} {s['waits']:>5} {show(s['medianSeconds']):>9} "
+                         f"{show(s['maxSeconds']):>7} {s['maxAttempts']:>8} {s['timedOut']:>8}")
+        return '\n'.join(lines)
+
+
+def wait_until(fetch, predicate=None, timeout=10.0, initial_delay=0.05, max_delay=2.0, factor=2.0,
+               label=None, tracker=None, sleep=time.sleep):
+    """Poll fetch() until predicate(value) holds or `timeout` seconds pass
+
+    The default predicate is "value is not None". Delays start at
+    initial_delay and grow by `factor` up to max_delay, and the last delay
+    is trimmed so the wait never overshoots the timeout. Returns a dict with
+    ok, value (the last one fetched), attempts and seconds until the
+    condition was observed (within one poll delay of the real lag).
+    """
+    predicate = predicate or (lambda value: value is not None)
+    started = time.perf_counter()
+    deadline = started + timeout
+    delay = initial_delay
+    attempts = 0
+    while True:
+        value = fetch()
+        attempts += 1
+        ok = bool(predicate(value))
+        now = time.perf_counter()
+        if ok or now >= deadline:
+            break
+        sleep(min(delay, deadline - now))
+        delay = min(delay * factor, max_delay)
+    result = {'ok': ok, 'value': value, 'seconds': now - started, 'attempts': attempts}
+    if tracker is not None:
+        tracker.record(label or getattr(predicate, '__name__', 'condition'), result)
+    return result
+
+
+def wait_for_item(table, key, predicate=None, consistent_read=True, absent=False, label=None, **kwargs):
+    """wait_until for a DynamoDB item: present (and matching predicate), or gone with absent=True
+
+    `table` is a boto3 Table. Strongly consistent reads are the default so
+    the measured time is the write path's lag, not a lagging replica's.
+    """
+    def fetch():
+        return table.get_item(Key=key, ConsistentRead=consistent_read).get('Item')
+
+    if absent:
+        condition = lambda item: item is None
+    elif predicate:
+        condition = lambda item: item is not None and predicate(item)
+    else:
+        condition = None
+    return wait_until(fetch, condition, label=label or f'{table.name} item', **kwargs)
+
+
+def _prefix(key):
+    return key.rpartition('/')[0] + '/' if '/' in key else key
+
+
+class S3Verifier:
+    """Verifies expected S3 keys (and optionally sizes) with prefix listings
+
+    Keys are grouped by their "directory" prefix and every prefix is listed
+    once (paginated, prefixes in parallel). Keys a listing misses, and every
+    key when a listing is denied or exceeds max_list_keys, are checked with
+    head_object on a thread pool. boto3 clients are thread-safe.
+    """
+
+    def __init__(self, s3_client=None, bucket=PHOTOS_BUCKET, region_name=REGION, max_workers=8,
+                 max_list_keys=10000):
+        if s3_client is None:
+            import boto3
+            s3_client = boto3.client('s3', region_name=region_name)
+        self.client = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.max_list_keys = max_list_keys
+        self.stats = {'keys': 0, 'listCalls': 0, 'headCalls': 0, 'seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, field):
+        with self._stats_lock:
+            self.stats[field] += 1
+
+    def _list_prefix(self, prefix):
+        """{key: {size, etag}} under prefix, or None if the listing is unusable"""
+        objects = {}
+        kwargs = {'Bucket': self.bucket, 'Prefix': prefix}
+        try:
+            while True:
+                response = self.client.list_objects_v2(**kwargs)
+                self._count('listCalls')
+                for obj in response.get('Contents', []):
+                    objects[obj['Key']] = {'size': obj['Size'], 'etag': obj['ETag'].strip('"')}
+                if not response.get('IsTruncated') or len(objects) >= self.max_list_keys:
+                    break
+                kwargs['ContinuationToken'] = response['NextContinuationToken']
+        except self.client.exceptions.ClientError:
+            return None
+        if response.get('IsTruncated'):
+            return None
+        return objects
+
+    def _head(self, key):
+        self._count('headCalls')
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError:
+            return None
+        return {'size': response['ContentLength'], 'etag': response['ETag'].strip('"')}
+
+    def verify(self, expected):
+        """Check keys exist; `expected` is a list of keys or a {key: size or None} dict"""
+        if not isinstance(expected, dict):
+            expected = dict.fromkeys(expected)
+        started = time.perf_counter()
+        prefixes = sorted({_prefix(key) for key in expected})
+        found, sources = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            listings = dict(zip(prefixes, pool.map(self._list_prefix, prefixes)))
+            for key in expected:
+                listing = listings[_prefix(key)]
+                if listing is not None and key in listing:
+                    found[key], sources[key] = listing[key], 'list'
+            missing = [key for key in expected if key not in found]
+            for key, meta in zip(missing, pool.map(self._head, missing)):
+                if meta is not None:
+                    found[key], sources[key] = meta, 'head'
+        self.stats['keys'] += len(expected)
+        self.stats['seconds'] += time.perf_counter() - started
+
+        results = []
+        for key, size in expected.items():
+            meta = found.get(key)
+            result = {'key': key, 'found': meta is not None, 'size': meta and meta['size'],
+                      'etag': meta and meta['etag'], 'source': sources.get(key), 'ok': True, 'problem': None}
+            if meta is None:
+                result.update(ok=False, problem='not found')
+            elif size is not None and meta['size'] != size:
+                result.update(ok=False, problem=f"size {meta['size']} != expected {size}")
+            results.append(result)
+        return results
@@ -0,0 +1,119 @@
+"""
+Named request workloads for the load and latency tooling
+Each workload is fn(client, context) -> requests.Response, where context is
+a dict of test data (ZIP code, radius, session and trainer IDs, rng).
+Workloads that answer from a local cache may send no request at all.
+"""
+
+import random
+
+from .emulator import make_token
+from .searchcache import SearchCache, browse as browse_view
+
+
+def search(client, context):
+    """GET /classes/search around the context ZIP code"""
+    return client.search_classes(
+        context.get('zipCode', '75454'),
+        context.get('radiusMiles', '30'),
+        query=context.get('query'),
+        date=context.get('date'),
+    )
+
+
+def get_profile(client, context):
+    """GET /profile/me"""
+    return client.get_profile()
+
+
+def trainer_profile(client, context):
+    """GET /trainers/{trainerId}/profile for a random known trainer"""
+    return client.get_trainer_profile(context['rng'].choice(context['trainerIds']))
+
+
+def trainer_rating(client, context):
+    """GET /ratings?trainerId=&summary=true for a random known trainer"""
+    return client.get_trainer_rating(context['rng'].choice(context['trainerIds']))
+
+
+def enroll_cycle(client, context):
+    """POST then DELETE /classes/{sessionId}/enroll on a random session"""
+    session_id = context['rng'].choice(context['sessionIds'])
+    response = client.enroll(session_id)
+    if response.status_code != 200:
+        return response
+    return client.unenroll(session_id)
+
+
+def browse(client, context):
+    """A browsing student's screen view through the client's SearchCache (repeats are served locally)"""
+    return browse_view(SearchCache.for_client(client, ttl=context.get('cacheTtl', 30.0)), context, context['rng'])
+
+
+def presigned_url(client, context):
+    """POST /profile/presigned-url for one image"""
+    return client.get_presigned_urls(1)
+
+
+WORKLOADS = {
+    'search': search,
+    'profile': get_profile,
+    'trainer-profile': trainer_profile,
+    'trainer-rating': trainer_rating,
+    'enroll-cycle': enroll_cycle,
+    'presigned-url': presigned_url,
+    'browse': browse,
+}
+
+# Context keys a workload reads beyond the ZIP code and radius
+CONTEXT_KEYS = {
+    'trainer-profile': ('trainerIds',),
+    'trainer-rating': ('trainerIds',),
+    'enroll-cycle': ('sessionIds',),
+}
+
+# Workloads that change the caller's own enrollments, so concurrent users must not share a token
+STATEFUL_WORKLOADS = ('enroll-cycle', 'browse')
+
+CONTEXT_FLAGS = {'sessionIds': '--session-ids', 'trainerIds': '--trainer-ids'}
+
+
+def add_context_arguments(parser):
+    """Add the --session-ids/--trainer-ids flags live runs use to fill CONTEXT_KEYS"""
+    parser.add_argument('--session-ids', help='comma-separated session IDs for live enroll-cycle runs')
+    parser.add_argument('--trainer-ids', help='comma-separated trainer IDs for live trainer-* runs')
+
+
+def live_context(parser, args, workload, seed=42):
+    """Workload context for a live run; parser.error() if `workload` needs IDs that were not given"""
+    context = {'zipCode': args.zip, 'radiusMiles': '30', 'rng': random.Random(seed)}
+    if args.session_ids:
+        context['sessionIds'] = args.session_ids.split(',')
+    if args.trainer_ids:
+        context['trainerIds'] = args.trainer_ids.split(',')
+    missing = [CONTEXT_FLAGS[key] for key in CONTEXT_KEYS.get(workload, ()) if not context.get(key)]
+    if missing:
+        parser.error(f"live '{workload}' runs need {' and '.join(missing)}")
+    return context
+
+
+def emulator_context(emulator, trainers=20, sessions_per_trainer=5, zip_code='75454', capacity=None, seed=42):
+    """Seed an emulator and return a workload context describing the seeded data"""
+    session_ids = emulator.state.seed(trainers, sessions_per_trainer, zip_codes=(zip_code,),
+                                      rng=random.Random(seed))
+    if capacity:
+        for session_id in session_ids:
+            emulator.state.sessions[session_id]['capacity'] = capacity
+    trainer_ids = sorted({emulator.state.sessions[s]['trainerId'] for s in session_ids})
+    return {
+        'zipCode': zip_code,
+        'radiusMiles': '30',
+        'sessionIds': session_ids,
+        'trainerIds': trainer_ids,
+        'rng': random.Random(seed),
+    }
+
+
+def emulator_token(index, prefix='load-user'):
+    """ID token for the index-th simulated emulator user"""
+    return make_token(f'{prefix}-{index}')
@@ -9,6 +9,8 @@ import base64
 import boto3
 from botocore.exceptions import ClientError
 
+from gripped_sdk.verify import S3Verifier
+
 # BETA Configuration
 API_BASE = "https://5957u6zvu3.execute-api.us-east-1.amazonaws.com/prod"
 CLIENT_ID = "7l0ec3fthfc4nam0dopqa80dlt"
@@ -260,21 +262,16 @@ def verify_images_in_s3(images, id_image_key):
     # Extract bucket name from ARN: arn:aws:s3:::grippedstack-userphotosbucket4d5de39b-qd9yrcxkyoxm
     bucket_name = 'grippedstack-userphotosbucket4d5de39b-qd9yrcxkyoxm'
     
-    # Check profile images
-    for i, image in enumerate(images):
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=image['key'])
-            print(f"  ✅ [BETA] Profile image {i+1} found: {image['key']}")
-        except ClientError:
-            print(f"  ❌ [BETA] Profile image {i+1} not found: {image['key']}")
-    
-    # Check ID image
+    # One prefix listing covers every image; head_object only for keys it misses
+    labels = {image['key']: f"Profile image {i+1}" for i, image in enumerate(images)}
     if id_image_key:
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=id_image_key)
-            print(f"  ✅ [BETA] ID image found: {id_image_key}")
-        except ClientError:
-            print(f"  ❌ [BETA] ID image not found: {id_image_key}")
+        labels[id_image_key] = "ID image"
+    
+    for result in S3Verifier(s3_client, bucket_name).verify(list(labels)):
+        if result['found']:
+            print(f"  ✅ [BETA] {labels[result['key']]} found: {result['key']}")
+        else:
+            print(f"  ❌ [BETA] {labels[result['key']]} not found: {result['key']}")
 
 def delete_specific_image(id_token, image_id):
     """Delete a specific image from the profile"""
@@ -10,6 +10,10 @@ import boto3
 from botocore.exceptions import ClientError
 import time
 
+from gripped_sdk.recurrence import Recurrence
+from gripped_sdk.validation import format_errors, validate_class_payload
+from gripped_sdk.verify import BatchVerifier
+
 # BETA Environment Configuration
 API_BASE = "https://5957u6zvu3.execute-api.us-east-1.amazonaws.com/prod"
 CLIENT_ID = "7l0ec3fthfc4nam0dopqa80dlt"
@@ -120,30 +124,22 @@ def test_create_class_multiple_sessions(trainer_token, trainer_id):
         "productId": "prod_strength_beta_001",
         "priceId": "price_strength_beta_001",
         "classTags": ["strength", "bootcamp", "high-intensity"],
-        "sessions": [
-            {
-                "startDateTime": "2025-09-20T09:00:00Z",
-                "endDateTime": "2025-09-20T10:00:00Z",
-                "capacity": 15
-            },
-            {
-                "startDateTime": "2025-09-21T09:00:00Z",
-                "endDateTime": "2025-09-21T10:00:00Z",
-                "capacity": 15
-            },
-            {
-                "startDateTime": "2025-09-22T09:00:00Z",
-                "endDateTime": "2025-09-22T10:00:00Z",
-                "capacity": 12
-            }
-        ]
+        # Three daily 09:00 UTC sessions, the last one smaller
+        "sessions": list(Recurrence("2025-09-20T09:00", 60, freq="DAILY", count=3).sessions(capacity=15))
     }
+    class_data["sessions"][-1]["capacity"] = 12
     
     headers = {
         'Authorization': f'Bearer {trainer_token}',
         'Content-Type': 'application/json'
     }
     
+    # Catch every payload problem locally instead of one per round trip
+    errors = validate_class_payload(class_data)
+    if errors:
+        print(format_errors(errors))
+        return False
+    
     print(f"📡 [BETA] Making request to: {API_BASE}/classes")
     response = requests.post(f"{API_BASE}/classes", json=class_data, headers=headers)
     print(f"📱 Response status: {response.status_code}")
@@ -501,17 +497,18 @@ def verify_classes_in_dynamodb(sessions):
     print("🗃️  [BETA] Verifying classes in DynamoDB...")
     
     try:
-        table = dynamodb.Table(CLASS_TABLE)
+        verifier = BatchVerifier(dynamodb)
         for session in sessions:
-            response = table.get_item(Key={'sessionId': session['sessionId']})
-            if 'Item' in response:
-                class_item = response['Item']
+            verifier.expect(CLASS_TABLE, {'sessionId': session['sessionId']})
+        for result in verifier.verify():
+            if result['found']:
+                class_item = result['item']
                 print(f"✅ [BETA] Session found: {class_item['className']}")
                 print(f"  - Status: {class_item.get('status', 'UNKNOWN')}")
                 print(f"  - Capacity: {class_item.get('capacity', 'UNKNOWN')}")
                 print(f"  - Registered: {class_item.get('countRegistered', 0)}")
             else:
-                print(f"❌ [BETA] Session not found: {session['sessionId']}")
+                print(f"❌ [BETA] Session not found: {result['key']['sessionId']}")
                 
     except Exception as e:
         print(f"⚠️  [BETA] Could not verify classes in DynamoDB: {e}")
@@ -12,6 +12,10 @@ from botocore.exceptions import ClientError
 import time
 import uuid
 
+from gripped_sdk.recurrence import Recurrence
+from gripped_sdk.validation import format_errors, validate_class_payload
+from gripped_sdk.verify import BatchVerifier, ConvergenceTracker, wait_for_item
+
 # Configuration - Updated with actual deployment values
 API_BASE = "https://xsmi514ucd.execute-api.us-east-1.amazonaws.com/prod"
 CLIENT_ID = "5or7m2e6ovvr8jmk9pj07j7pjj"
@@ -33,6 +37,7 @@ dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
 
 # Global variables to store test data
 created_sessions = []
+convergence = ConvergenceTracker()
 enrolled_session_id = None
 
 def authenticate_user(email, role="trainer"):
@@ -125,24 +130,16 @@ def test_create_class_multiple_sessions(trainer_token, trainer_id):
         "productId": "prod_strength_001",
         "priceId": "price_strength_001",
         "classTags": ["strength", "bootcamp", "fitness"],
-        "sessions": [
-            {
-                "startDateTime": "2025-09-20T09:00:00Z",
-                "endDateTime": "2025-09-20T10:00:00Z",
-                "capacity": 15
-            },
-            {
-                "startDateTime": "2025-09-21T09:00:00Z",
-                "endDateTime": "2025-09-21T10:00:00Z",
-                "capacity": 15
-            },
-            {
-                "startDateTime": "2025-09-22T09:00:00Z",
-                "endDateTime": "2025-09-22T10:00:00Z",
-                "capacity": 12
-            }
-        ]
+        # Three daily 09:00 UTC sessions, the last one smaller
+        "sessions": list(Recurrence("2025-09-20T09:00", 60, freq="DAILY", count=3).sessions(capacity=15))
     }
+    payload["sessions"][-1]["capacity"] = 12
+    
+    # Catch every payload problem locally instead of one per round trip
+    errors = validate_class_payload(payload)
+    if errors:
+        print(format_errors(errors))
+        return False
     
     print(f"📡 Making request to: {API_BASE}/classes")
     response = requests.post(
@@ -539,13 +536,14 @@ def verify_classes_in_dynamodb():
     print("🗃️  Verifying classes in DynamoDB...")
     
     try:
-        table = dynamodb.Table(CLASS_TABLE)
-        
+        verifier = BatchVerifier(dynamodb)
         for session_id in created_sessions:
-            response = table.get_item(Key={'sessionId': session_id})
-            
-            if 'Item' in response:
-                item = response['Item']
+            verifier.expect(CLASS_TABLE, {'sessionId': session_id})
+        
+        for result in verifier.verify():
+            session_id = result['key']['sessionId']
+            if result['found']:
+                item = result['item']
                 print(f"✅ Session found: {item['className']}")
                 print(f"  - Status: {item['status']}")
                 print(f"  - Capacity: {item['capacity']}")
@@ -562,11 +560,12 @@ def verify_enrollment_in_dynamodb(student_id, session_id):
     
     try:
         table = dynamodb.Table(STUDENTS_TABLE)
-        response = table.get_item(Key={'studentId': student_id, 'sessionId': session_id})
+        result = wait_for_item(table, {'studentId': student_id, 'sessionId': session_id},
+                               label='enrollment created', tracker=convergence)
         
-        if 'Item' in response:
-            item = response['Item']
-            print(f"✅ Enrollment found in DynamoDB")
+        if result['ok']:
+            item = result['value']
+            print(f"✅ Enrollment found in DynamoDB after {result['seconds']:.2f}s")
             print(f"  - Status: {item['status']}")
             print(f"  - Created: {item['createdAt']}")
         else:
@@ -599,11 +598,11 @@ def verify_message_in_dynamodb(message_id, session_id):
     
     try:
         table = dynamodb.Table(MESSAGES_TABLE)
-        response = table.get_item(Key={'messageId': message_id})
+        result = wait_for_item(table, {'messageId': message_id}, label='message stored', tracker=convergence)
         
-        if 'Item' in response:
-            item = response['Item']
-            print(f"✅ Message found in DynamoDB")
+        if result['ok']:
+            item = result['value']
+            print(f"✅ Message found in DynamoDB after {result['seconds']:.2f}s")
             print(f"  - Session: {item['sessionId']}")
             print(f"  - Text: {item['messageText'][:30]}...")
             print(f"  - Created: {item['createdAt']}")
@@ -619,10 +618,12 @@ def verify_enrollment_cancelled_in_dynamodb(student_id, session_id):
     
     try:
         table = dynamodb.Table(STUDENTS_TABLE)
-        response = table.get_item(Key={'studentId': student_id, 'sessionId': session_id})
+        result = wait_for_item(table, {'studentId': student_id, 'sessionId': session_id},
+                               lambda item: item.get('status') == 'CANCELLED',
+                               label='enrollment cancelled', tracker=convergence)
         
-        if 'Item' in response:
-            enrollment = response['Item']
+        if result['value'] is not None:
+            enrollment = result['value']
             status = enrollment.get('status', 'UNKNOWN')
             if status == 'CANCELLED':
                 print(f"✅ Enrollment correctly marked as CANCELLED in DynamoDB")
@@ -658,10 +659,11 @@ def verify_session_cancelled_in_dynamodb(session_id):
     
     try:
         table = dynamodb.Table(CLASS_TABLE)
-        response = table.get_item(Key={'sessionId': session_id})
+        result = wait_for_item(table, {'sessionId': session_id}, lambda item: item['status'] == 'CANCELLED',
+                               label='session cancelled', tracker=convergence)
         
-        if 'Item' in response:
-            item = response['Item']
+        if result['value'] is not None:
+            item = result['value']
             status = item['status']
             print(f"✅ Session still exists in DynamoDB")
             print(f"  - Status: {status}")
@@ -739,6 +741,10 @@ def main():
     else:
         print(f"⚠️  Some tests failed. Check the logs above for details.")
     
+    if convergence.samples:
+        print(f"\n⏳ DynamoDB convergence after API writes:")
+        print(convergence.report())
+    
     print(f"\n📊 Created sessions for testing: {len(created_sessions)}")
     for session_id in created_sessions:
         print(f"  - {session_id}")
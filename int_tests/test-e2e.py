@@ -9,6 +9,10 @@ import base64
 import boto3
 from botocore.exceptions import ClientError
 
+from gripped_sdk.client import GrippedClient
+from gripped_sdk.uploads import UploadPipeline
+from gripped_sdk.verify import S3Verifier
+
 # Configuration
 API_BASE = "https://xsmi514ucd.execute-api.us-east-1.amazonaws.com/prod"
 CLIENT_ID = "5or7m2e6ovvr8jmk9pj07j7pjj"
@@ -115,66 +119,6 @@ def authenticate_user():
             print(f"❌ Authentication error: {e}")
             return None, None
 
-def get_presigned_urls(id_token, image_count=3):
-    """Get presigned URLs for uploading images"""
-    print(f"📸 Getting presigned URLs for {image_count} images...")
-    print(f"🔑 Using ID token: {id_token[:50]}...")
-    
-    headers = {
-        'Authorization': f'Bearer {id_token}',
-        'Content-Type': 'application/json'
-    }
-    
-    payload = {
-        'imageCount': image_count,
-        'contentType': 'image/jpeg'
-    }
-    
-    print(f"🌐 Making request to: {API_BASE}/profile/presigned-url")
-    response = requests.post(
-        f"{API_BASE}/profile/presigned-url",
-        headers=headers,
-        json=payload
-    )
-    
-    print(f"📱 Response status: {response.status_code}")
-    print(f"📱 Response headers: {dict(response.headers)}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"✅ Got {len(data['presignedUrls'])} presigned URLs")
-        return data['presignedUrls']
-    else:
-        print(f"❌ Error getting presigned URLs: {response.status_code} - {response.text}")
-        return None
-
-def upload_images_to_s3(presigned_urls):
-    """Upload dummy images to S3 using presigned URLs"""
-    print("📤 Uploading images to S3...")
-    
-    dummy_image = base64.b64decode(create_dummy_image_base64())
-    uploaded_images = []
-    
-    for i, url_info in enumerate(presigned_urls):
-        print(f"  Uploading image {i+1}: {url_info['imageId']}")
-        
-        response = requests.put(
-            url_info['uploadUrl'],
-            data=dummy_image,
-            headers={'Content-Type': 'image/jpeg'}
-        )
-        
-        if response.status_code == 200:
-            uploaded_images.append({
-                'imageId': url_info['imageId'],
-                'key': url_info['key']
-            })
-            print(f"  ✅ Uploaded {url_info['imageId']}")
-        else:
-            print(f"  ❌ Failed to upload {url_info['imageId']}: {response.status_code}")
-    
-    return uploaded_images
-
 def create_profile(id_token, images, id_image):
     """Create user profile with images"""
     print("👤 Creating user profile...")
@@ -279,21 +223,16 @@ def verify_images_in_s3(images, id_image_key):
     
     bucket_name = 'grippedstack-userphotosbucket4d5de39b-gvc8qfaefzit'
     
-    # Check profile images
-    for i, image in enumerate(images):
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=image['key'])
-            print(f"  ✅ Profile image {i+1} found: {image['key']}")
-        except ClientError:
-            print(f"  ❌ Profile image {i+1} not found: {image['key']}")
-    
-    # Check ID image
+    # One prefix listing covers every image; head_object only for keys it misses
+    labels = {image['key']: f"Profile image {i+1}" for i, image in enumerate(images)}
     if id_image_key:
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=id_image_key)
-            print(f"  ✅ ID image found: {id_image_key}")
-        except ClientError:
-            print(f"  ❌ ID image not found: {id_image_key}")
+        labels[id_image_key] = "ID image"
+    
+    for result in S3Verifier(s3_client, bucket_name).verify(list(labels)):
+        if result['found']:
+            print(f"  ✅ {labels[result['key']]} found: {result['key']}")
+        else:
+            print(f"  ❌ {labels[result['key']]} not found: {result['key']}")
 
 def delete_specific_image(id_token, image_id):
     """Delete a specific image from the profile"""
@@ -400,21 +339,20 @@ def main():
         print("❌ Authentication failed. Exiting.")
         return
     
-    # Step 2: Get presigned URLs for profile images
-    profile_presigned_urls = get_presigned_urls(id_token, 3)
-    if not profile_presigned_urls:
-        print("❌ Failed to get presigned URLs. Exiting.")
-        return
-    
-    # Step 3: Get presigned URL for ID image
-    id_presigned_urls = get_presigned_urls(id_token, 1)
-    if not id_presigned_urls:
-        print("❌ Failed to get presigned URL for ID image. Exiting.")
+    # Steps 2-4: One presigned-URL call for the profile and ID images, uploaded in parallel
+    print("📤 Uploading 3 profile images and 1 ID image to S3...")
+    dummy_image = base64.b64decode(create_dummy_image_base64())
+    try:
+        with GrippedClient(id_token, base_url=API_BASE) as client:
+            pipeline = UploadPipeline(client)
+            uploaded_images, id_image = pipeline.upload_profile_images([dummy_image] * 3, dummy_image)
+    except (requests.RequestException, RuntimeError) as e:
+        # RuntimeError: the presigned-URL call succeeded but returned no URLs
+        print(f"❌ Failed to get presigned URLs: {e}. Exiting.")
         return
-    
-    # Step 4: Upload images to S3
-    uploaded_images = upload_images_to_s3(profile_presigned_urls)
-    id_image = upload_images_to_s3(id_presigned_urls)[0] if id_presigned_urls else None
+    stats = pipeline.summary()
+    print(f"✅ Uploaded {stats['uploaded']}/{stats['files']} images in {stats['seconds']:.2f}s "
+          f"({stats['urlCalls']} presigned-URL call(s), {stats['retries']} retries)")
     
     if not uploaded_images or not id_image:
         print("❌ Failed to upload images. Exiting.")
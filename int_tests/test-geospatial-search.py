@@ -9,6 +9,9 @@ import boto3
 import json
 from botocore.exceptions import ClientError
 
+from gripped_sdk.geoverify import format_report, verify_search
+from gripped_sdk.models import SearchPage
+
 # Configuration
 API_BASE = "https://xsmi514ucd.execute-api.us-east-1.amazonaws.com/prod"
 COGNITO_REGION = "us-east-1"
@@ -37,6 +40,10 @@ def get_cognito_token():
         print(f"❌ Error getting Cognito token: {e}")
         return None
 
+def or_na(value):
+    """Print 'N/A' for a field the response left out"""
+    return 'N/A' if value is None else value
+
 def test_search_api(token, test_name, query_params):
     """Test the geospatial search API with given parameters"""
     print(f"\n🔍 Testing: {test_name}")
@@ -54,41 +61,44 @@ def test_search_api(token, test_name, query_params):
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            results = result.get('results', [])
-            total_found = result.get('totalFound', 0)
-            search_location = result.get('searchLocation', {})
-            radius = result.get('radiusMiles', 0)
+            page = SearchPage.from_json(response.content)
+            results = page.results
+            total_found = page.total_found or 0
+            search_location = page.search_location or {}
+            radius = page.radius_miles or 0
             
             print(f"✅ Success! Found {total_found} classes")
             print(f"Search location: {search_location.get('latitude', 'N/A')}, {search_location.get('longitude', 'N/A')}")
             print(f"Radius: {radius} miles")
             
             # Show date filter if applied
-            date_filter = result.get('dateFilter')
+            date_filter = page.date_filter
             if date_filter:
                 print(f"Date filter: {date_filter}")
             
+            # Recompute every distance and check the radius and ordering
+            print(format_report(verify_search(page)))
+            
             # Display first few results with distances
             for i, class_result in enumerate(results[:3]):  # Show first 3 results
-                distance = class_result.get('distanceMiles', 'N/A')
-                class_title = class_result.get('classTitle', 'N/A')
-                trainer_name = class_result.get('trainerName', 'N/A')
-                trainer_email = class_result.get('trainerEmail', 'N/A')
-                trainer_phone = class_result.get('trainerPhone', 'N/A')
-                trainer_bio = class_result.get('trainerBio', 'N/A')
-                trainer_specialty = class_result.get('trainerSpecialty', 'N/A')
-                trainer_certifications = class_result.get('trainerCertifications', [])
-                tags = class_result.get('tags', [])
-                address = class_result.get('address', 'N/A')
-                city = class_result.get('city', 'N/A')
-                state = class_result.get('state', 'N/A')
-                zip_code = class_result.get('zip', 'N/A')
-                price = class_result.get('price', 'N/A')
-                start_time = class_result.get('startDateTime', 'N/A')
-                end_time = class_result.get('endDateTime', 'N/A')
-                max_students = class_result.get('maxStudents', 'N/A')
-                current_students = class_result.get('currentStudents', 'N/A')
+                distance = or_na(class_result.distance_miles)
+                class_title = or_na(class_result.class_title)
+                trainer_name = or_na(class_result.trainer_name)
+                trainer_email = or_na(class_result.trainer_email)
+                trainer_phone = or_na(class_result.trainer_phone)
+                trainer_bio = or_na(class_result.trainer_bio)
+                trainer_specialty = or_na(class_result.trainer_specialty)
+                trainer_certifications = class_result.trainer_certifications
+                tags = class_result.tags
+                address = or_na(class_result.address)
+                city = or_na(class_result.city)
+                state = or_na(class_result.state)
+                zip_code = or_na(class_result.zip)
+                price = or_na(class_result.price)
+                start_time = or_na(class_result.start_date_time)
+                end_time = or_na(class_result.end_date_time)
+                max_students = or_na(class_result.max_students)
+                current_students = or_na(class_result.current_students)
                 print(f"  {i+1}. {class_title} - {distance} miles")
                 print(f"     Trainer: {trainer_name}")
                 if trainer_email != 'N/A' and trainer_email: